@@ -1,19 +1,25 @@
+import logging
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes as drf_permission_classes
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from socialdistribution.permissions import IsAuthenticatedNode, IsAuthenticatedNodeOrLocalUser, IsLocalUserOnly
-from socialdistribution.authentication import RemoteNodeBasicAuthentication  
+from socialdistribution.authentication import RemoteNodeBasicAuthentication, RemoteNodeSignatureAuthentication
 from django.urls import reverse
 import requests
-from requests.auth import HTTPBasicAuth
+import time
 from authors.models import Author, FollowRequest, FollowRequestStatus
 from authors.serializers import AuthorSerializer
 from django.conf import settings
 from urllib.parse import unquote, urlparse
 from entries.models import RemoteNode
+from entries import circuit_breaker, federation_client
+from entries.node_index import find_node
 from authors.serializers import AuthorSerializer, FollowAuthorRequestSerializer
 from drf_spectacular.utils import extend_schema
+from socialdistribution.log import truncated
+
+logger = logging.getLogger(__name__)
 
 
 class AuthorDetailView(generics.RetrieveAPIView):
@@ -30,7 +36,7 @@ class AuthorDetailView(generics.RetrieveAPIView):
     def retrieve(self, request, *args, **kwargs):
         # Log if accessed by remote node
         if hasattr(request.user, 'node'):
-            print(f"Remote node {request.user.node.name} accessing author detail")
+            logger.debug("Remote node %s accessing author detail", request.user.node)
         
         return super().retrieve(request, *args, **kwargs)
 
@@ -43,7 +49,7 @@ class AuthorListView(generics.ListAPIView):
     """
     serializer_class = AuthorSerializer
    
-    authentication_classes = [RemoteNodeBasicAuthentication]
+    authentication_classes = [RemoteNodeBasicAuthentication, RemoteNodeSignatureAuthentication]
     permission_classes = [IsAuthenticatedNodeOrLocalUser]  
     pagination_class = None  # Disable pagination for simplicity
     def get_queryset(self):
@@ -55,7 +61,7 @@ class AuthorListView(generics.ListAPIView):
     def list(self, request, *args, **kwargs):
         # Log if accessed by remote node
         if hasattr(request.user, 'node'):
-            print(f"Remote node {request.user.node.name} accessing authors list")
+            logger.debug("Remote node %s accessing authors list", request.user.node)
         
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
@@ -91,14 +97,25 @@ class ExploreAuthorsView(APIView):
         connected_nodes = RemoteNode.objects.filter(is_active=True)
         
         for node in connected_nodes:
+            # Don't wait on a timeout for a node that is known to be down
+            if not circuit_breaker.allow_request(node):
+                continue
+
+            started = time.monotonic()
             try:
                 node_base = node.base_url.rstrip('/')
 
-                response = requests.get(
+                response = federation_client.get(
+                    node,
                     f"{node_base}/api/authors/",
-                    auth=HTTPBasicAuth(node.username, node.password),
                     timeout=5
                 )
+                elapsed = time.monotonic() - started
+                circuit_breaker.record_outcome(
+                    node,
+                    circuit_breaker.is_node_failure(response.status_code, elapsed),
+                    elapsed,
+                )
                 
                 if not response.ok:
                     continue
@@ -148,9 +165,13 @@ class ExploreAuthorsView(APIView):
 
                 remote_authors.extend(filtered_authors)
 
+            except requests.RequestException as e:
+                circuit_breaker.record_outcome(node, True, time.monotonic() - started)
+                logger.warning("Error fetching authors from %s: %s", node.name, e)
+                continue
             except Exception as e:
                 # Log but don't fail if one node is down or misbehaving
-                print(f"Error fetching from {node.name}: {str(e)}")
+                logger.exception("Error reading authors from %s", node.name)
                 continue
         
         return Response({
@@ -202,8 +223,6 @@ def api_follow_author(request):
                 followee=target_author,
                 defaults={'status': FollowRequestStatus.PENDING}
             )
-            print(f"[FOLLOW] Using auth - username: {remote_node.username}, password: {remote_node.password}")
-            print(f"[FOLLOW] Remote node: {remote_node.name} at {remote_node.base_url}")
             return Response({
                 'detail': 'Follow request sent',
                 'created': created
@@ -243,7 +262,7 @@ def api_follow_author(request):
         # REMOTE AUTHOR - send to their inbox
         from entries.models import RemoteNode
         
-        print(f"[FOLLOW] Following remote author: {target_author_url}")
+        logger.debug("Following remote author %s", target_author_url)
         
         # Build current user's author URL
         current_user_url = request.build_absolute_uri(f'/api/authors/{request.user.id}/')
@@ -270,34 +289,25 @@ def api_follow_author(request):
         # Find the remote node
         inbox_url = f"{target_author_url}/inbox/"
         
-        remote_node = None
-        for node in RemoteNode.objects.filter(is_active=True):
-            if target_author_url.startswith(node.base_url.rstrip('/')):
-                remote_node = node
-                break
+        remote_node = find_node(target_author_url)
         
         if not remote_node:
-            print(f"[FOLLOW] No remote node configured for {target_author_url}")
+            logger.warning("No remote node configured for %s", target_author_url)
             return Response(
                 {'detail': 'Remote node not configured'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         try:
-            
-            auth = HTTPBasicAuth(remote_node.username, remote_node.password)
-            print(f"[FOLLOW] Using auth - username: {remote_node.username}, password: {remote_node.password}")
-            print(f"[FOLLOW] Remote node: {remote_node.name} at {remote_node.base_url}")
-            print(f"[FOLLOW] POSTing to {inbox_url}")
-            print(f"[FOLLOW] Payload: {follow_request_data}")
-            response = requests.post(
+            logger.debug("Sending follow to %s via %s: %s", inbox_url, remote_node.name, truncated(follow_request_data))
+            response = federation_client.post(
+                remote_node,
                 inbox_url,
                 json=follow_request_data,
-                auth=auth,
                 timeout=10
             )
             
-            print(f"[FOLLOW] Response: {response.status_code} - {response.text[:200]}")
+            logger.debug("Follow to %s answered %s: %s", inbox_url, response.status_code, truncated(response.text, 200))
 
             if response.ok:
                 # Extract UUID from the remote author URL
@@ -311,9 +321,9 @@ def api_follow_author(request):
                     }, status=status.HTTP_400_BAD_REQUEST)
                 
                 try:
-                    author_response = requests.get(
+                    author_response = federation_client.get(
+                        remote_node,
                         target_author_url,
-                        auth=HTTPBasicAuth(remote_node.username, remote_node.password),
                         timeout=5
                     )
                     if author_response.ok:
@@ -326,7 +336,7 @@ def api_follow_author(request):
                         github = ''
                         profile_image = ''
                 except Exception as e:
-                    print(f"[FOLLOW] Error fetching author info: {e}")
+                    logger.warning("Error fetching remote author %s: %s", target_author_url, e)
                     display_name = 'Remote Author'
                     github = ''
                     profile_image = ''
@@ -387,21 +397,20 @@ def check_follow_status(request, author_id):
     except Author.DoesNotExist:
         return Response({'status': 'not_following'}, status=status.HTTP_200_OK)
 
-    follow_req = FollowRequest.objects.filter(
-        follower=request.user,
-        followee=target_author
-    ).first()
-
     # Figure out if this author is remote
     current_host = request.build_absolute_uri('/').rstrip('/')
     author_host = (getattr(target_author, 'host', '') or '').rstrip('/')
 
     is_remote = bool(author_host and author_host != current_host)
 
-    if not follow_req:
-        status_value = 'not_following'
-    else:
-        if is_remote:
+    if is_remote:
+        follow_req = FollowRequest.objects.filter(
+            follower=request.user,
+            followee=target_author
+        ).first()
+        if not follow_req:
+            status_value = 'not_following'
+        else:
             # For remote authors: if we have a FollowRequest row at all,
             # treat as "following" (per spec: just show them as followed).
             if follow_req.status == FollowRequestStatus.PENDING:
@@ -409,14 +418,16 @@ def check_follow_status(request, author_id):
                 follow_req.status = FollowRequestStatus.APPROVED
                 follow_req.save(update_fields=['status'])
             status_value = 'following'
+    else:
+        # Local authors keep the normal pending/approved semantics. Indexed
+        # probes, not the follow graph cache, which may lag in other workers
+        follow_reqs = FollowRequest.objects.filter(follower=request.user, followee=target_author)
+        if follow_reqs.filter(status=FollowRequestStatus.APPROVED).exists():
+            status_value = 'following'
+        elif follow_reqs.filter(status=FollowRequestStatus.PENDING).exists():
+            status_value = 'pending'
         else:
-            # Local authors keep the normal pending/approved semantics
-            if follow_req.status == FollowRequestStatus.APPROVED:
-                status_value = 'following'
-            elif follow_req.status == FollowRequestStatus.PENDING:
-                status_value = 'pending'
-            else:
-                status_value = 'not_following'
+            status_value = 'not_following'
 
     return Response({'status': status_value})
 
@@ -538,16 +549,12 @@ def followers_detail_api(request, author_id, foreign_author_fqid):
         github = ''
         profile_image = ''
         try:
-            remote_node = None
-            for node in RemoteNode.objects.filter(is_active=True):
-                if foreign_fqid.startswith(node.base_url.rstrip('/')):
-                    remote_node = node
-                    break
+            remote_node = find_node(foreign_fqid)
 
             if remote_node:
-                resp = requests.get(
+                resp = federation_client.get(
+                    remote_node,
                     foreign_fqid,
-                    auth=HTTPBasicAuth(remote_node.username, remote_node.password),
                     timeout=5,
                 )
                 if resp.ok:
@@ -556,7 +563,7 @@ def followers_detail_api(request, author_id, foreign_author_fqid):
                     github = info.get('github', github)
                     profile_image = info.get('profileImage', profile_image)
         except Exception as e:
-            print(f"[FOLLOWERS API] error fetching remote author info: {e}")
+            logger.warning("Error fetching remote author %s: %s", foreign_fqid, e)
 
         # Derive host from FQID up to /api/
         host = None
@@ -0,0 +1,109 @@
+"""
+Keyset-paginated stream feed.
+
+The stream shows the same entries as
+Entry.objects.visible_to(viewer, listed=True), but it does not run that as
+one OR over the whole Entry table. It runs one query per branch, and each
+branch walks its own index newest first:
+
+- PUBLIC entries                      (visibility, -published)
+- the viewer's UNLISTED/FRIENDS ones  (author, visibility, -published)
+- UNLISTED from authors they follow   (author, visibility, -published)
+- FRIENDS from their friends          (author, visibility, -published)
+
+The followed and friend authors are indexed subqueries on FollowRequest
+and Friendship, not the cached follow graph, so a change made in another
+worker shows up on the next page. Each branch fetches at most one page past
+the cursor. heapq.merge then interleaves the branches by (published, id), so a
+page costs the same on the first visit and the thousandth.
+
+Cursors are opaque to clients: urlsafe base64 of "<published>|<id>" for the
+last entry shown. The next page continues strictly after that key.
+"""
+import base64
+import binascii
+import heapq
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+from entries.models import Entry, Visibility
+
+from .models import FollowRequest, FollowRequestStatus, Friendship
+
+
+@dataclass
+class FeedPage:
+    entries: list
+    next_cursor: str | None
+
+
+def encode_cursor(entry) -> str:
+    raw = f"{entry.published.isoformat()}|{entry.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(published, id) from a cursor; ValueError if it was not made by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        published, entry_id = raw.split("|")
+        return datetime.fromisoformat(published), uuid.UUID(entry_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid feed cursor") from exc
+
+
+def _branches(viewer) -> dict:
+    following = FollowRequest.objects.filter(
+        follower=viewer, status=FollowRequestStatus.APPROVED
+    ).values("followee")
+    return {
+        "public": Q(visibility=Visibility.PUBLIC),
+        "own": Q(author=viewer, visibility__in=[Visibility.UNLISTED, Visibility.FRIENDS]),
+        "following": Q(author__in=following, visibility=Visibility.UNLISTED),
+        "friends": Friendship.friends_q(viewer, "author") & Q(visibility=Visibility.FRIENDS),
+    }
+
+
+def branch_queries(viewer, cursor: str | None = None, size: int | None = None) -> dict:
+    """
+    The per-branch keyset queries behind one page, by branch name. Each
+    returns up to size + 1 entries after `cursor`, newest first.
+    """
+    size = size or getattr(settings, "STREAM_PAGE_SIZE", 20)
+    after = None
+    if cursor:
+        published, entry_id = decode_cursor(cursor)
+        after = Q(published__lt=published) | Q(published=published, id__lt=entry_id)
+
+    queries = {}
+    for name, branch in _branches(viewer).items():
+        queryset = Entry.objects.filter(branch)
+        if after is not None:
+            queryset = queryset.filter(after)
+        queries[name] = queryset.select_related("author").order_by("-published", "-id")[: size + 1]
+    return queries
+
+
+def stream_page(viewer, cursor: str | None = None, size: int | None = None) -> FeedPage:
+    """One page of `viewer`'s stream, newest first, after `cursor`."""
+    size = size or getattr(settings, "STREAM_PAGE_SIZE", 20)
+    queries = branch_queries(viewer, cursor, size).values()
+
+    merged = heapq.merge(*queries, key=lambda entry: (entry.published, entry.id), reverse=True)
+    entries = []
+    seen = set()
+    for entry in merged:
+        if entry.id in seen:
+            continue
+        seen.add(entry.id)
+        entries.append(entry)
+        if len(entries) > size:
+            break
+
+    has_more = len(entries) > size
+    entries = entries[:size]
+    return FeedPage(entries, encode_cursor(entries[-1]) if has_more else None)
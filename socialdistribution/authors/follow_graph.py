@@ -0,0 +1,98 @@
+"""
+Cached per-author follow adjacency.
+
+For one author, FollowGraph holds the ids of the authors they follow, the
+authors following them, their friends (mutual follows) and the authors with
+a pending request to them. All four come from a single FollowRequest query
+and are stored in the Django cache. Workers share them only when that cache
+is shared (e.g. Redis); with the default LocMemCache each process keeps its
+own copy, and a bump only reaches the process that saved the change, so
+other processes can be up to FOLLOW_GRAPH_CACHE_TTL behind. That setting
+is an hour with REDIS_URL and seconds without it.
+
+That is fine for counts and display, which is all the graph is for.
+Visibility checks, follow status, the stream (authors/feed.py) and
+federation fan-out read the Friendship and FollowRequest tables directly.
+
+Each author has a version number in the cache, and the sets are stored
+under a key that includes it. A FollowRequest save or delete bumps the
+version of both authors involved (authors/signals.py). The next read then
+misses and reloads; stale entries just expire. A hot author's followers
+are therefore loaded once per change, not on every page view.
+
+If the version key itself is evicted, it is re-created from the clock,
+so it can never come back as a version that still has sets cached.
+"""
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import FollowRequest, FollowRequestStatus
+
+
+@dataclass(frozen=True)
+class FollowGraph:
+    following: frozenset
+    followers: frozenset
+    friends: frozenset
+    pending_in: frozenset
+
+
+def _version_key(author_id) -> str:
+    return f"follow-graph:version:{author_id}"
+
+
+def _version(author_id) -> int:
+    key = _version_key(author_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump(*author_ids):
+    """Invalidate the cached graphs of `author_ids`."""
+    for author_id in author_ids:
+        key = _version_key(author_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never cached, or evicted: any fresh value is newer than what was stored
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def load(author_id) -> FollowGraph:
+    """Build the graph for `author_id` from the database."""
+    following, followers, pending_in = set(), set(), set()
+    rows = FollowRequest.objects.filter(
+        Q(follower_id=author_id) | Q(followee_id=author_id)
+    ).values_list("follower_id", "followee_id", "status")
+    for follower_id, followee_id, status in rows:
+        if str(follower_id) == str(author_id):
+            if status == FollowRequestStatus.APPROVED:
+                following.add(followee_id)
+        elif status == FollowRequestStatus.APPROVED:
+            followers.add(follower_id)
+        elif status == FollowRequestStatus.PENDING:
+            pending_in.add(follower_id)
+    return FollowGraph(
+        following=frozenset(following),
+        followers=frozenset(followers),
+        friends=frozenset(following & followers),
+        pending_in=frozenset(pending_in),
+    )
+
+
+def for_author(author) -> FollowGraph:
+    """The (possibly cached) graph for an author or author id."""
+    author_id = getattr(author, "pk", author)
+    key = f"follow-graph:{author_id}:{_version(author_id)}"
+    graph = cache.get(key)
+    if graph is None:
+        graph = load(author_id)
+        cache.set(key, graph, timeout=getattr(settings, "FOLLOW_GRAPH_CACHE_TTL", 30))
+    return graph
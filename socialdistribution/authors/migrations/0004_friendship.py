@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_friendships(apps, schema_editor):
+    # One row per mutual pair of approved follows, lower id first (see Friendship)
+    FollowRequest = apps.get_model('authors', 'FollowRequest')
+    Friendship = apps.get_model('authors', 'Friendship')
+    approved = set(
+        FollowRequest.objects.filter(status='APPROVED').values_list('follower_id', 'followee_id')
+    )
+    pairs = {
+        (min(a, b), max(a, b))
+        for a, b in approved
+        if a != b and (b, a) in approved
+    }
+    Friendship.objects.bulk_create(
+        [Friendship(author_low_id=low, author_high_id=high) for low, high in pairs],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0003_author_host'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Friendship',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('author_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('author_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('author_low', 'author_high'), name='unique_friendship'), models.CheckConstraint(condition=models.Q(('author_low__lt', models.F('author_high'))), name='friendship_ordered_pair')],
+            },
+        ),
+        migrations.RunPython(backfill_friendships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0004_friendship'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='followrequest',
+            index=models.Index(fields=['follower', 'status'], name='follow_follower_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='followrequest',
+            index=models.Index(fields=['followee', 'status'], name='follow_followee_status_idx'),
+        ),
+    ]
@@ -25,19 +25,7 @@ class Author(AbstractUser):
         return reverse("authors:profile_detail", args=[self.id])
     def get_friends_count(self):
         """Return the number of mutual approved follow relationships (friends)."""
-        from .models import FollowRequest, FollowRequestStatus
-
-        # Get all users this author follows (approved)
-        following_ids = FollowRequest.objects.filter(
-            follower=self, status=FollowRequestStatus.APPROVED
-        ).values_list("followee_id", flat=True)
-
-        # Count how many of those users also follow this author back (approved)
-        return FollowRequest.objects.filter(
-            follower_id__in=following_ids,
-            followee=self,
-            status=FollowRequestStatus.APPROVED,
-        ).distinct().count()
+        return Friendship.objects.filter(Friendship.involving(self)).count()
 
 
 class FollowRequestStatus(models.TextChoices):
@@ -81,6 +69,11 @@ class FollowRequest(models.Model):
                 name="prevent_self_follow",
             ),
         ]
+        indexes = [
+            # Followers / following lookups always filter on status too
+            models.Index(fields=["follower", "status"], name="follow_follower_status_idx"),
+            models.Index(fields=["followee", "status"], name="follow_followee_status_idx"),
+        ]
         ordering = ["-created_at"]
 
     def approve(self):
@@ -97,3 +90,85 @@ class FollowRequest(models.Model):
 
     def __str__(self):
         return f"{self.follower} → {self.followee} ({self.status})"
+
+
+class Friendship(models.Model):
+    """
+    One row per unordered pair of authors who follow each other with
+    approved FollowRequests. `author_low` is always the pair member with
+    the smaller id, so a pair has exactly one row and a friendship check
+    is a single probe of the unique index.
+
+    Maintained from FollowRequest save/delete by authors/signals.py;
+    never written directly.
+    """
+
+    author_low = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="+")
+    author_high = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="+")
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["author_low", "author_high"],
+                name="unique_friendship",
+            ),
+            models.CheckConstraint(
+                check=models.Q(author_low__lt=models.F("author_high")),
+                name="friendship_ordered_pair",
+            ),
+        ]
+
+    @staticmethod
+    def ordered(a_id, b_id):
+        a_id, b_id = uuid.UUID(str(a_id)), uuid.UUID(str(b_id))
+        return (a_id, b_id) if a_id < b_id else (b_id, a_id)
+
+    @classmethod
+    def are_friends(cls, a, b) -> bool:
+        a_id, b_id = getattr(a, "pk", a), getattr(b, "pk", b)
+        if a_id is None or b_id is None or str(a_id) == str(b_id):
+            return False
+        low, high = cls.ordered(a_id, b_id)
+        return cls.objects.filter(author_low_id=low, author_high_id=high).exists()
+
+    @staticmethod
+    def involving(author):
+        """Q for the friendships `author` is part of."""
+        return models.Q(author_low=author) | models.Q(author_high=author)
+
+    @classmethod
+    def friends_q(cls, author, field="pk"):
+        """
+        Q matching rows whose `field` holds the id of one of `author`'s
+        friends, as two indexed subqueries.
+        """
+        return (
+            models.Q(**{f"{field}__in": cls.objects.filter(author_low=author).values("author_high")})
+            | models.Q(**{f"{field}__in": cls.objects.filter(author_high=author).values("author_low")})
+        )
+
+    @classmethod
+    def friend_ids(cls, author) -> set:
+        ids = set()
+        for low, high in cls.objects.filter(cls.involving(author)).values_list("author_low_id", "author_high_id"):
+            ids.add(high if str(low) == str(author.pk) else low)
+        return ids
+
+    @classmethod
+    def sync(cls, a_id, b_id):
+        """Create or remove the row for a pair to match its FollowRequests."""
+        if str(a_id) == str(b_id):
+            return
+        low, high = cls.ordered(a_id, b_id)
+        approved = FollowRequest.objects.filter(
+            models.Q(follower_id=low, followee_id=high) | models.Q(follower_id=high, followee_id=low),
+            status=FollowRequestStatus.APPROVED,
+        ).count()
+        if approved == 2:
+            cls.objects.get_or_create(author_low_id=low, author_high_id=high)
+        else:
+            cls.objects.filter(author_low_id=low, author_high_id=high).delete()
+
+    def __str__(self):
+        return f"{self.author_low} ↔ {self.author_high}"
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import follow_graph
+from .models import FollowRequest, Friendship
+
+
+@receiver(post_save, sender=FollowRequest)
+@receiver(post_delete, sender=FollowRequest)
+def sync_friendship(sender, instance, **kwargs):
+    """Approving, rejecting or deleting either direction can make or break a friendship."""
+    Friendship.sync(instance.follower_id, instance.followee_id)
+
+
+@receiver(post_save, sender=FollowRequest)
+@receiver(post_delete, sender=FollowRequest)
+def bump_follow_graphs(sender, instance, **kwargs):
+    """Both ends of the request see a different adjacency now."""
+    follow_graph.bump(instance.follower_id, instance.followee_id)
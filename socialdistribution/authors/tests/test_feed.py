@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from authors import feed
+from authors.models import Author, FollowRequest, FollowRequestStatus
+from entries.models import Entry, Visibility
+
+
+class StreamFeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.viewer = Author.objects.create_user(username="feed_viewer", password="pw", display_name="viewer")
+        self.friend = Author.objects.create_user(username="feed_friend", password="pw", display_name="friend")
+        self.followed = Author.objects.create_user(username="feed_followed", password="pw", display_name="followed")
+        self.stranger = Author.objects.create_user(username="feed_stranger", password="pw", display_name="stranger")
+        for follower, followee in [
+            (self.viewer, self.friend),
+            (self.friend, self.viewer),
+            (self.viewer, self.followed),
+        ]:
+            FollowRequest.objects.create(follower=follower, followee=followee, status=FollowRequestStatus.APPROVED)
+
+        now = timezone.now()
+        authors = [self.viewer, self.friend, self.followed, self.stranger]
+        visibilities = [Visibility.PUBLIC, Visibility.UNLISTED, Visibility.FRIENDS, Visibility.DELETED]
+        for index in range(24):
+            entry = Entry.objects.create(
+                author=authors[index % 4],
+                title=f"entry {index}",
+                content="body",
+                visibility=visibilities[(index // 4) % 4],
+            )
+            # Pairs share a timestamp so the id tie-break is exercised
+            Entry.objects.filter(pk=entry.pk).update(published=now - timedelta(minutes=index // 2))
+
+    def test_pages_match_visible_to_in_order(self):
+        expected = list(
+            Entry.objects.visible_to(self.viewer, listed=True).order_by("-published", "-id")
+        )
+
+        seen = []
+        cursor = None
+        while True:
+            page = feed.stream_page(self.viewer, cursor, size=4)
+            seen.extend(page.entries)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual([entry.pk for entry in seen], [entry.pk for entry in expected])
+
+    def test_page_query_count_does_not_grow_with_depth(self):
+        first = feed.stream_page(self.viewer, size=3)
+
+        # One query per branch; follows and friends are subqueries
+        with self.assertNumQueries(4):
+            feed.stream_page(self.viewer, first.next_cursor, size=3)
+
+    def test_invalid_cursor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            feed.decode_cursor("not-a-cursor")
+
+    def test_stream_view_links_to_older_entries(self):
+        self.client.force_login(self.viewer)
+
+        with self.settings(STREAM_PAGE_SIZE=5):
+            response = self.client.get(reverse("stream"))
+            self.assertEqual(len(response.context["entries"]), 5)
+            self.assertContains(response, "Older entries")
+
+            older = self.client.get(reverse("stream"), {"cursor": response.context["next_cursor"]})
+            self.assertEqual(older.status_code, 200)
+            self.assertContains(older, "Newest entries")
+
+        self.assertEqual(self.client.get(reverse("stream"), {"cursor": "bogus"}).status_code, 400)
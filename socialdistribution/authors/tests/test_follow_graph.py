@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from authors import follow_graph
+from authors.models import Author, FollowRequest, FollowRequestStatus
+
+
+class FollowGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.alice = Author.objects.create_user(username="graph_alice", password="pw", display_name="alice")
+        self.bob = Author.objects.create_user(username="graph_bob", password="pw", display_name="bob")
+        self.carol = Author.objects.create_user(username="graph_carol", password="pw", display_name="carol")
+
+    def test_sets_are_built_from_follow_requests(self):
+        FollowRequest.objects.create(follower=self.alice, followee=self.bob, status=FollowRequestStatus.APPROVED)
+        FollowRequest.objects.create(follower=self.bob, followee=self.alice, status=FollowRequestStatus.APPROVED)
+        FollowRequest.objects.create(follower=self.carol, followee=self.alice, status=FollowRequestStatus.PENDING)
+
+        graph = follow_graph.for_author(self.alice)
+
+        self.assertEqual(graph.following, {self.bob.pk})
+        self.assertEqual(graph.followers, {self.bob.pk})
+        self.assertEqual(graph.friends, {self.bob.pk})
+        self.assertEqual(graph.pending_in, {self.carol.pk})
+
+    def test_cached_graph_runs_no_queries(self):
+        FollowRequest.objects.create(follower=self.bob, followee=self.alice, status=FollowRequestStatus.APPROVED)
+        follow_graph.for_author(self.alice)
+
+        with self.assertNumQueries(0):
+            graph = follow_graph.for_author(self.alice)
+        self.assertEqual(graph.followers, {self.bob.pk})
+
+    def test_follow_changes_bump_both_authors(self):
+        follow_graph.for_author(self.alice)
+        follow_graph.for_author(self.carol)
+
+        request = FollowRequest.objects.create(follower=self.carol, followee=self.alice)
+        self.assertEqual(follow_graph.for_author(self.alice).pending_in, {self.carol.pk})
+
+        request.approve()
+        self.assertEqual(follow_graph.for_author(self.alice).followers, {self.carol.pk})
+        self.assertEqual(follow_graph.for_author(self.carol).following, {self.alice.pk})
+
+        request.delete()
+        self.assertFalse(follow_graph.for_author(self.alice).followers)
+        self.assertFalse(follow_graph.for_author(self.carol).following)
+
+    def test_evicted_version_does_not_revive_stale_sets(self):
+        follow_graph.for_author(self.alice)
+        cache.delete(f"follow-graph:version:{self.alice.pk}")
+
+        FollowRequest.objects.create(follower=self.bob, followee=self.alice, status=FollowRequestStatus.APPROVED)
+
+        self.assertEqual(follow_graph.for_author(self.alice).followers, {self.bob.pk})
+
+    def test_follow_status_ignores_a_stale_cached_graph(self):
+        request = FollowRequest.objects.create(follower=self.alice, followee=self.bob, status=FollowRequestStatus.APPROVED)
+        self.assertIn(self.bob.pk, follow_graph.for_author(self.alice).following)
+        # Unfollowed through another worker: this process's cache never hears of it
+        with patch("authors.follow_graph.bump"):
+            request.delete()
+        self.client.force_login(self.alice)
+
+        response = self.client.get(reverse("authors_api:follow-status", args=[self.bob.pk]))
+
+        self.assertEqual(response.json(), {"status": "not_following"})
@@ -0,0 +1,70 @@
+from django.test import TestCase
+
+from authors.models import Author, FollowRequest, FollowRequestStatus, Friendship
+from entries.models import Entry, Visibility
+
+
+class FriendshipTests(TestCase):
+    def setUp(self):
+        self.alice = Author.objects.create_user(username="alice", password="pw", display_name="alice")
+        self.bob = Author.objects.create_user(username="bob", password="pw", display_name="bob")
+        self.carol = Author.objects.create_user(username="carol", password="pw", display_name="carol")
+
+    def _follow(self, follower, followee, status=FollowRequestStatus.APPROVED):
+        return FollowRequest.objects.create(follower=follower, followee=followee, status=status)
+
+    def test_one_way_follow_is_not_a_friendship(self):
+        self._follow(self.alice, self.bob)
+
+        self.assertFalse(Friendship.are_friends(self.alice, self.bob))
+        self.assertEqual(Friendship.objects.count(), 0)
+
+    def test_approving_the_second_direction_creates_one_row(self):
+        self._follow(self.alice, self.bob)
+        request = self._follow(self.bob, self.alice, status=FollowRequestStatus.PENDING)
+        self.assertFalse(Friendship.are_friends(self.alice, self.bob))
+
+        request.approve()
+
+        self.assertTrue(Friendship.are_friends(self.alice, self.bob))
+        self.assertTrue(Friendship.are_friends(self.bob, self.alice))
+        self.assertEqual(Friendship.objects.count(), 1)
+        self.assertEqual(self.alice.get_friends_count(), 1)
+        self.assertEqual(Friendship.friend_ids(self.bob), {self.alice.pk})
+
+    def test_reject_and_delete_remove_the_row(self):
+        self._follow(self.alice, self.bob)
+        back = self._follow(self.bob, self.alice)
+        self.assertTrue(Friendship.are_friends(self.alice, self.bob))
+
+        back.reject()
+        self.assertFalse(Friendship.are_friends(self.alice, self.bob))
+
+        back.approve()
+        self.assertTrue(Friendship.are_friends(self.alice, self.bob))
+
+        back.delete()
+        self.assertFalse(Friendship.are_friends(self.alice, self.bob))
+
+    def test_friends_q_selects_only_mutual_follows(self):
+        self._follow(self.alice, self.bob)
+        self._follow(self.bob, self.alice)
+        self._follow(self.alice, self.carol)
+
+        friends = Author.objects.filter(Friendship.friends_q(self.alice))
+
+        self.assertEqual(list(friends), [self.bob])
+
+    def test_friends_only_entry_check_is_one_query(self):
+        self._follow(self.alice, self.bob)
+        self._follow(self.bob, self.alice)
+        entry = Entry.objects.create(
+            author=self.bob,
+            title="Friends only",
+            content="hi",
+            visibility=Visibility.FRIENDS,
+        )
+
+        with self.assertNumQueries(1):
+            self.assertTrue(entry.can_view(self.alice))
+        self.assertFalse(entry.can_view(self.carol))
@@ -1,11 +1,11 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
-from django.http import HttpResponseNotAllowed, JsonResponse
+from django.http import HttpResponseBadRequest, HttpResponseNotAllowed, JsonResponse
 from django.urls import reverse, NoReverseMatch
-from .models import Author, FollowRequest, FollowRequestStatus
-from entries.models import Entry, Visibility
+from . import feed, follow_graph
+from .models import Author, FollowRequest, FollowRequestStatus, Friendship
+from entries.models import Entry
 from .forms import ProfileEditForm
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
@@ -101,40 +101,21 @@ def stream(request):
     - My own entries (all visibilities except deleted)
     """
     current_user = request.user
-    
-    # Get all authors the current user is following (approved follows)
-    following = FollowRequest.objects.filter(
-        follower=current_user,
-        status=FollowRequestStatus.APPROVED
-    ).values_list('followee', flat=True)
-    
-    # Get all authors who follow the current user back (friends)
-    followers = FollowRequest.objects.filter(
-        followee=current_user,
-        status=FollowRequestStatus.APPROVED
-    ).values_list('follower', flat=True)
-    
-    # Friends are mutual follows
-    friends = set(following) & set(followers)
-    
-    entries = Entry.objects.select_related('author').filter(
-        Q(visibility=Visibility.PUBLIC) |  # all public entries (local + remote)
-        Q(author=current_user, visibility__in=[Visibility.UNLISTED, Visibility.FRIENDS]) |  # my unlisted/friends-only
-        Q(author__in=following, visibility=Visibility.UNLISTED) |  # unlisted from people I follow
-        Q(author__in=friends, visibility=Visibility.FRIENDS)  # friends-only from mutual follows
-    ).exclude(
-        visibility=Visibility.DELETED
-    ).distinct().order_by('-published')
+    cursor = request.GET.get('cursor')
 
+    # One page at a time, continuing after the cursor (see authors/feed.py)
+    try:
+        page = feed.stream_page(current_user, cursor)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid cursor")
     
     # Get pending follow requests count for navbar
-    pending_follow_requests_count = FollowRequest.objects.filter(
-        followee=request.user,
-        status=FollowRequestStatus.PENDING
-    ).count()
+    pending_follow_requests_count = len(follow_graph.for_author(current_user).pending_in)
     
     context = {
-        'entries': entries,
+        'entries': page.entries,
+        'next_cursor': page.next_cursor,
+        'is_first_page': not cursor,
         'author': current_user,
         'pending_follow_requests_count': pending_follow_requests_count,
     }
@@ -145,7 +126,8 @@ def stream(request):
 def profile_detail(request, author_id):
     profile_author = get_object_or_404(Author, id=author_id)
     entries = (
-        profile_author.entries.filter(visibility=Visibility.PUBLIC)
+        Entry.objects.visible_to(request.user, listed=True)
+        .filter(author=profile_author)
         .select_related("author")
         .order_by("-published")
     )
@@ -163,19 +145,15 @@ def profile_detail(request, author_id):
             .select_related("follower", "followee")
             .first()
         )
-    friends_count = profile_author.get_friends_count()
+    graph = follow_graph.for_author(profile_author)
     context = {
         "profile_author": profile_author,
         "entries": entries,
         "return_url": return_url,
         "follow_relationship": follow_relationship,
-        "followers_count": profile_author.follow_requests_received.filter(
-            status=FollowRequestStatus.APPROVED
-        ).count(),
-        "following_count": profile_author.follow_requests_sent.filter(
-            status=FollowRequestStatus.APPROVED
-        ).count(),
-        "friends_count": friends_count,
+        "followers_count": len(graph.followers),
+        "following_count": len(graph.following),
+        "friends_count": len(graph.friends),
     }
     return render(request, "authors/profile_detail.html", context)
 
@@ -327,11 +305,7 @@ def friends_list(request, author_id):
     Creates a list of ussers friends (mutual following)
     """
     profile_author = get_object_or_404(Author, id=author_id)
-    users = Author.objects.filter(
-        follow_requests_sent__status=FollowRequestStatus.APPROVED,
-        follow_requests_sent__followee__follow_requests_sent__follower=profile_author,
-        follow_requests_sent__followee__follow_requests_sent__status=FollowRequestStatus.APPROVED,
-    ).distinct()
+    users = Author.objects.filter(Friendship.friends_q(profile_author))
     return render(request, "authors/friends_list.html", {
         "users": users,
         "profile_author": profile_author,
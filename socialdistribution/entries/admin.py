@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Entry, Comment, RemoteNode
+from django.utils import timezone
+from .circuit_breaker import reset as reset_circuit
+from .models import Entry, Comment, RemoteNode, OutboxDelivery, OutboxStatus, InboxItem, InboxItemStatus, ProcessedInboxObject
 
 @admin.register(Entry)
 class EntryAdmin(admin.ModelAdmin):
@@ -21,10 +23,11 @@ class CommentAdmin(admin.ModelAdmin):
     
 @admin.register(RemoteNode)
 class RemoteNodeAdmin(admin.ModelAdmin):
-    list_display = ('name', 'base_url', 'username', 'is_active', 'created_at')
-    list_filter = ('is_active', 'created_at')
+    list_display = ('name', 'base_url', 'username', 'is_active', 'circuit_state', 'consecutive_failures', 'avg_latency_ms', 'created_at')
+    list_filter = ('is_active', 'circuit_state', 'created_at')
     search_fields = ('name', 'base_url', 'username')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'circuit_state', 'consecutive_failures', 'circuit_opened_at', 'avg_latency_ms')
+    actions = ['reset_circuit_breaker']
     
     fieldsets = (
         ('Node Information', {
@@ -34,8 +37,76 @@ class RemoteNodeAdmin(admin.ModelAdmin):
             'fields': ('username', 'password'),
             'description': 'Credentials for HTTP Basic Auth. Remote node will use these to authenticate.'
         }),
+        ('Request Signing', {
+            'fields': ('signing_key_id', 'signing_secret'),
+            'description': 'Shared HMAC key. When both are set, requests to this node are signed instead of using Basic Auth, and signed requests from it are accepted.'
+        }),
+        ('Circuit Breaker', {
+            'fields': ('circuit_state', 'consecutive_failures', 'circuit_opened_at', 'avg_latency_ms'),
+            'description': 'Updated by the outbox worker. An open circuit defers deliveries to this node.'
+        }),
+        ('Rate Limits', {
+            'fields': ('inbox_rate_per_minute', 'inbox_burst', 'read_rate_per_minute', 'read_burst'),
+            'description': 'Token buckets for requests from this node. Leave blank for NODE_THROTTLE_DEFAULTS; a rate of 0 disables the limit.'
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
+
+    @admin.action(description='Reset circuit breaker')
+    def reset_circuit_breaker(self, request, queryset):
+        updated = reset_circuit(queryset)
+        self.message_user(request, f"{updated} circuit breakers closed.")
+
+
+@admin.register(OutboxDelivery)
+class OutboxDeliveryAdmin(admin.ModelAdmin):
+    list_display = ('object_type', 'inbox_url', 'node', 'status', 'attempts', 'last_status_code', 'next_attempt_at')
+    list_filter = ('status', 'object_type', 'node')
+    search_fields = ('inbox_url', 'last_error')
+    readonly_fields = ('created_at', 'updated_at', 'delivered_at')
+    raw_id_fields = ('payload',)
+    ordering = ('-created_at',)
+    actions = ['retry_deliveries']
+
+    @admin.action(description='Retry selected deliveries now')
+    def retry_deliveries(self, request, queryset):
+        updated = queryset.exclude(
+            status__in=[OutboxStatus.DELIVERED, OutboxStatus.SUPERSEDED],
+        ).update(
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} deliveries re-queued.")
+
+
+@admin.register(InboxItem)
+class InboxItemAdmin(admin.ModelAdmin):
+    list_display = ('object_type', 'recipient', 'node', 'status', 'attempts', 'result_status_code', 'received_at')
+    list_filter = ('status', 'object_type', 'node')
+    search_fields = ('recipient__username', 'result_detail')
+    readonly_fields = ('received_at', 'processed_at')
+    raw_id_fields = ('recipient',)
+    ordering = ('-received_at',)
+    actions = ['retry_items']
+
+    @admin.action(description='Retry selected items now')
+    def retry_items(self, request, queryset):
+        updated = queryset.exclude(status=InboxItemStatus.DONE).update(
+            status=InboxItemStatus.PENDING,
+            attempts=0,
+            available_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} inbox items re-queued.")
+
+
+@admin.register(ProcessedInboxObject)
+class ProcessedInboxObjectAdmin(admin.ModelAdmin):
+    list_display = ('object_type', 'sender', 'status_code', 'processed_at')
+    list_filter = ('object_type', 'status_code')
+    search_fields = ('sender', 'object_key')
+    readonly_fields = ('processed_at',)
+    ordering = ('-processed_at',)
@@ -18,6 +18,7 @@ from .api_views import (
     CommentLikeView,
     render_markdown_entry,
     InboxView,
+    FederationStatsView,
     AuthorEntryImageView,
     EntryFQIDImageView
 )
@@ -60,5 +61,7 @@ urlpatterns = [
     path("authors/<uuid:author_id>/inbox/", InboxView.as_view(), name="author-inbox"),
     path("authors/<uuid:author_id>/inbox", InboxView.as_view(), name="author-inbox-no-slash"),
 
+    path("federation/stats/", FederationStatsView.as_view(), name="federation-stats"),
+
 
 ]
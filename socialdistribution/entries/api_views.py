@@ -1,14 +1,20 @@
+import logging
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.parsers import FormParser, MultiPartParser
 import base64
 import binascii
+import uuid
+from collections import ChainMap
 from urllib.parse import unquote
 from django.shortcuts import get_object_or_404
 from django.http import Http404
+from django.db import transaction
 from django.db.models import Q
 from django.urls import reverse
-from .models import Entry, Visibility, Comment, RemoteNode
+from .models import Entry, Visibility, Comment, RemoteNode, InboxItem
 from authors.models import FollowRequest, FollowRequestStatus, Author
 from authors.serializers import AuthorSerializer
 from .serializers import EntrySerializer, CommentSerializer, InboxItemSerializer
@@ -18,20 +24,28 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework import status
 from django.utils import timezone
 from dateutil import parser as date_parser
-import requests
-from requests.auth import HTTPBasicAuth
-from socialdistribution.authentication import RemoteNodeBasicAuthentication
+from socialdistribution.authentication import RemoteNodeBasicAuthentication, RemoteNodeSignatureAuthentication
 from typing import Optional
 from socialdistribution.permissions import IsAuthenticatedNodeOrLocalUser
 from django.conf import settings
-import requests
-from requests.auth import HTTPBasicAuth
 from django.utils import timezone
-from authors.models import FollowRequest, FollowRequestStatus, Author
+from authors.models import FollowRequest, FollowRequestStatus, Friendship, Author
 from entries.models import Entry, Visibility, RemoteNode
+from entries.outbox import enqueue_deliveries, enqueue_delivery, entry_coalesce_key, prepare_payload
+from entries.node_index import find_node
+from entries.object_urls import ENTRY, classify_object_url
+from entries.inbox_parser import SPOOLED_CONTENT_KEY, InboxJSONParser
+from entries.author_cache import author_cache, cached_author, remember_author
+from entries import inbox_ledger
+from entries.telemetry import federation_stats
+from socialdistribution.log import truncated
 
 from drf_spectacular.utils import extend_schema
 
+logger = logging.getLogger(__name__)
+# High-volume per-request logging; sampled in settings.LOGGING
+inbox_logger = logging.getLogger("entries.inbox")
+
 def resolve_author_or_404(identifier: str) -> Author:
     decoded = unquote(identifier).strip()
     candidates = []
@@ -58,12 +72,15 @@ def resolve_author_or_404(identifier: str) -> Author:
     raise Http404("Author not found")
 
 
-def _resolve_remote_author_from_data(author_data: dict) -> Optional[Author]:
+def _resolve_remote_author_from_data(author_data: dict, known: Optional[dict] = None) -> Optional[Author]:
     """
     Given the 'author' object from a remote payload, return a local Author instance
     (create a local stub if needed). Returns None on invalid/missing id.
     This version uses the author's UUID to build a collision-resistant username and
     handles IntegrityError when creating the local Author.
+    `known` maps uuid strings to Authors already loaded (batch inbox requests);
+    it is consulted before querying and updated with stubs created here.
+    Repeat senders are answered from the in-process author_cache without a query.
     """
     if not isinstance(author_data, dict):
         return None
@@ -96,14 +113,23 @@ def _resolve_remote_author_from_data(author_data: dict) -> Optional[Author]:
     else:
         host = raw_host or None
 
+    remote_author = known.get(uuid_str) if known is not None else None
+    if remote_author is None:
+        remote_author = cached_author(full_id)
+        # A cached author without a host still needs the host backfilled below
+        if remote_author is not None and host and not remote_author.host:
+            remote_author = None
+
     # Try to get by id first (preferred). If not present, create safely.
     try:
-        remote_author = Author.objects.filter(id=uuid_str).first()
+        if remote_author is None:
+            remote_author = Author.objects.filter(id=uuid_str).first()
         if remote_author:
             # Ensure host is set if we have it
             if host and not getattr(remote_author, "host", None):
                 remote_author.host = host
                 remote_author.save(update_fields=["host"])
+            remember_author(full_id, remote_author)
             return remote_author
 
         # Create with collision-resistant username; catch IntegrityError and retry with suffix
@@ -122,6 +148,9 @@ def _resolve_remote_author_from_data(author_data: dict) -> Optional[Author]:
                         is_active=False,
                         host=host,
                     )
+                if known is not None:
+                    known[uuid_str] = remote_author
+                remember_author(full_id, remote_author)
                 return remote_author
             except IntegrityError:
                 # Username collision — try another suffix
@@ -224,6 +253,8 @@ class PublicEntriesListView(generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
+        # Public entries only, for every requester (see README); the stream
+        # is where friends-only and unlisted entries are listed
         return (
             Entry.objects.filter(visibility=Visibility.PUBLIC)
             .select_related("author")
@@ -275,10 +306,7 @@ class EntryDetailView(generics.RetrieveUpdateDestroyAPIView):
             not self.request.user.is_authenticated
             or (
                 entry.author != self.request.user
-                and not entry.author.follow_requests_sent.filter(
-                    followee=self.request.user,
-                    status=FollowRequestStatus.APPROVED,
-                ).exists()
+                and not Friendship.are_friends(entry.author_id, self.request.user)
             )
         ):
             raise Http404("Entry not found")
@@ -311,12 +339,7 @@ def send_comment_to_remote_followers(comment: Comment, request):
     ).select_related("follower")
 
     # For FRIENDS-only entries we need mutual follow (friends)
-    following_ids = set(
-        FollowRequest.objects.filter(
-            follower=author,
-            status=FollowRequestStatus.APPROVED,
-        ).values_list("followee_id", flat=True)
-    )
+    friend_ids = Friendship.friend_ids(author)
 
     entry_api_url = request.build_absolute_uri(
         reverse("api:entry-detail", args=[entry.id])
@@ -327,10 +350,14 @@ def send_comment_to_remote_followers(comment: Comment, request):
     commenter_api_url = request.build_absolute_uri(
         f"/api/authors/{commenter.id}/"
     )
+    local_api_host = request.build_absolute_uri("/api/")
+
+    # Built and encoded once on the first remote recipient, then shared by all
+    shared_payload = None
 
     for fr in followers_qs:
         follower: Author = fr.follower
-        is_friend = follower.id in following_ids
+        is_friend = follower.id in friend_ids
 
         # FRIENDS visibility → only mutuals
         if entry.visibility == Visibility.FRIENDS and not is_friend:
@@ -344,52 +371,37 @@ def send_comment_to_remote_followers(comment: Comment, request):
             continue
 
         # Find RemoteNode config for that host
-        remote_node = (
-            RemoteNode.objects
-            .filter(is_active=True)
-            .filter(base_url__startswith=follower_host)
-            .first()
-        )
+        remote_node = find_node(follower_host)
         if not remote_node:
             continue
 
         follower_author_url = f"{follower_host}/api/authors/{follower.id}"
         inbox_url = f"{follower_author_url}/inbox/"
 
-        comment_object = {
-            "type": "comment",
-            "id": comment_api_url,
-            "author": {
-                "type": "author",
-                "id": commenter_api_url,
-                "displayName": getattr(commenter, "display_name", None)
-                              or getattr(commenter, "username", ""),
-                "host": request.build_absolute_uri("/api/"),
-                "github": getattr(commenter, "github", "") or "",
-                "profileImage": getattr(commenter, "profile_image", "") or "",
-            },
-            "comment": comment.content,
-            "contentType": comment.content_type or "text/plain",
-            "published": (
-                comment.created_at.isoformat()
-                if comment.created_at else timezone.now().isoformat()
-            ),
-            "entry": entry_api_url,
-        }
-
-        try:
-            auth = HTTPBasicAuth(remote_node.username, remote_node.password)
-            print(f"[COMMENT→FOLLOWERS] POST -> {inbox_url}")
-            resp = requests.post(
-                inbox_url,
-                json=comment_object,
-                auth=auth,
-                timeout=10,
-            )
-            print(f"[COMMENT→FOLLOWERS] <- {resp.status_code} {resp.text[:200]}")
-        except requests.RequestException as e:
-            print(f"[COMMENT→FOLLOWERS] ERROR sending to {inbox_url}: {e}")
-            continue
+        if shared_payload is None:
+            shared_payload = prepare_payload("comment", {
+                "type": "comment",
+                "id": comment_api_url,
+                "author": {
+                    "type": "author",
+                    "id": commenter_api_url,
+                    "displayName": getattr(commenter, "display_name", None)
+                                  or getattr(commenter, "username", ""),
+                    "host": local_api_host,
+                    "github": getattr(commenter, "github", "") or "",
+                    "profileImage": getattr(commenter, "profile_image", "") or "",
+                },
+                "comment": comment.content,
+                "contentType": comment.content_type or "text/plain",
+                "published": (
+                    comment.created_at.isoformat()
+                    if comment.created_at else timezone.now().isoformat()
+                ),
+                "entry": entry_api_url,
+            })
+
+        logger.debug("Queued comment %s for follower inbox %s", comment.id, inbox_url)
+        enqueue_delivery(remote_node, inbox_url, "comment", shared_payload)
  
 def send_like_to_author_inbox(entry: Entry, liker: Author, request):
     """
@@ -401,20 +413,14 @@ def send_like_to_author_inbox(entry: Entry, liker: Author, request):
     
     # Only send if author is on a remote node
     if not author_host or author_host == current_host:
-        print(f"[LIKE] Author {author.id} is local, not sending to inbox Host = {author_host}")
+        logger.debug("Entry author %s is local (host=%r), not sending like", author.id, author_host)
         return
     
-    from entries.models import RemoteNode
-    
     # Find the remote node
-    remote_node = None
-    for node in RemoteNode.objects.filter(is_active=True):
-        if author_host.startswith(node.base_url.rstrip('/')):
-            remote_node = node
-            break
+    remote_node = find_node(author_host)
     
     if not remote_node:
-        print(f"[LIKE] No remote node configured for host {author_host}")
+        logger.warning("No remote node configured for host %s, dropping like", author_host)
         return
     
     # Local API root (your node)
@@ -448,22 +454,9 @@ def send_like_to_author_inbox(entry: Entry, liker: Author, request):
         "object": entry_url
     }
     
-    # Send to remote inbox
-    try:
-        auth = HTTPBasicAuth(remote_node.username, remote_node.password)
-        print(f"[LIKE] Sending like to {inbox_url}")
-        
-        response = requests.post(
-            inbox_url,
-            json=like_object,
-            auth=auth,
-            timeout=10
-        )
-        
-        print(f"[LIKE] Response: {response.status_code} - {response.text[:200]}")
-        
-    except requests.RequestException as e:
-        print(f"[LIKE] Error sending like to remote inbox: {e}")
+    # Queue for the outbox worker
+    logger.debug("Queued like for %s", inbox_url)
+    enqueue_delivery(remote_node, inbox_url, "like", like_object)
 
 def send_entry_to_remote_followers(entry: Entry, request):
     """
@@ -486,29 +479,26 @@ def send_entry_to_remote_followers(entry: Entry, request):
         status=FollowRequestStatus.APPROVED,
     ).select_related('follower')
 
-    # All authors this author is following (for mutual friend check)
-    following_ids = set(
-        FollowRequest.objects.filter(
-            follower=author,
-            status=FollowRequestStatus.APPROVED,
-        ).values_list('followee_id', flat=True)
-    )
+    # Mutual follows of this author, for FRIENDS-only entries
+    friend_ids = Friendship.friend_ids(author)
 
-    print(f"[send_entry_to_remote_followers] author={author.id} vis={entry.visibility} followers={followers_qs.count()}")
+    logger.debug("Fanning out entry %s (author=%s, visibility=%s)", entry.id, author.id, entry.visibility)
     api_root = request.build_absolute_uri('/api/').rstrip('/')
     entry_api_url = f"{api_root}/authors/{author.id}/entries/{entry.id}/"
     author_api_url = request.build_absolute_uri(f"/api/authors/{author.id}/")
 
+    recipients = []
+
     for fr in followers_qs:
         follower: Author = fr.follower
 
         # Determine if this follower is a "friend" (mutual follow)
-        is_friend = follower.id in following_ids
+        is_friend = follower.id in friend_ids
 
         # Visibility-based filtering:
         if entry.visibility == Visibility.FRIENDS and not is_friend:
             # friends-only: skip non-mutuals
-            print(f"[send_entry_to_remote_followers] skip {follower.id}: not a friend")
+            logger.debug("Skipping follower %s: not a friend", follower.id)
             continue
         # For PUBLIC and UNLISTED: any follower is OK, nothing extra to check
 
@@ -517,53 +507,64 @@ def send_entry_to_remote_followers(entry: Entry, request):
 
         # Only send to remote followers (host set and not this node)
         if not follower_host or follower_host == current_host:
-            print(f"[send_entry_to_remote_followers] skip {follower.id}: local or missing host")
+            logger.debug("Skipping follower %s: local or missing host", follower.id)
             continue
 
         follower_author_url = f"{follower_host}/api/authors/{follower.id}"
         inbox_url = f"{follower_author_url}/inbox/"
 
-        remote_node = (
-            RemoteNode.objects
-            .filter(is_active=True)
-            .filter(base_url__startswith=follower_host)
-            .first()
-        )
+        remote_node = find_node(follower_host)
 
         if not remote_node:
-            print(f"[send_entry_to_remote_followers] no RemoteNode for host={follower_host}")
+            logger.warning("No remote node configured for follower host %s", follower_host)
             continue
 
-        auth = HTTPBasicAuth(remote_node.username, remote_node.password)
-
-        payload = {
-            "type": "entry",
-            "id": entry_api_url,
-            "title": entry.title,
-            "source": entry_api_url,
-            "origin": entry_api_url,
-            "contentType": entry.content_type,
-            "content": entry.content,
-            "description": entry.description,
-            "visibility": (entry.visibility or "").upper(),
-            "published": (entry.published or timezone.now()).isoformat(),
-            "author": {
-                "type": "author",
-                "id": author_api_url,
-                "displayName": getattr(author, "display_name", None) or getattr(author, "username", ""),
-                "github": getattr(author, "github", "") or "",
-                "profileImage": getattr(author, "profile_image", "") or "",
-                "host": request.build_absolute_uri('/api/'),
-            },
-        }
+        logger.debug("Queued entry %s for %s", entry.id, inbox_url)
+        recipients.append((remote_node, inbox_url))
+
+    if not recipients:
+        return
 
+    # Built and encoded once, shared by every recipient. Coalescing replaces
+    # any older version of this entry that hasn't gone out yet.
+    payload = prepare_payload("entry", {
+        "type": "entry",
+        "id": entry_api_url,
+        "title": entry.title,
+        "source": entry_api_url,
+        "origin": entry_api_url,
+        "contentType": entry.content_type,
+        "content": entry.content,
+        "description": entry.description,
+        "visibility": (entry.visibility or "").upper(),
+        "published": (entry.published or timezone.now()).isoformat(),
+        "author": {
+            "type": "author",
+            "id": author_api_url,
+            "displayName": getattr(author, "display_name", None) or getattr(author, "username", ""),
+            "github": getattr(author, "github", "") or "",
+            "profileImage": getattr(author, "profile_image", "") or "",
+            "host": f"{api_root}/",
+        },
+    })
+    enqueue_deliveries(recipients, "entry", payload, coalesce_key=entry_coalesce_key(entry.id))
+
+def _image_response(entry: Entry, content_type: str):
+    """Stream a stored image file, or decode the base64 kept in Entry.content."""
+    from django.http import FileResponse, HttpResponse
+
+    if entry.content_file:
         try:
-            print(f"[send_entry_to_remote_followers] POST -> {inbox_url}")
-            resp = requests.post(inbox_url, json=payload, auth=auth, timeout=10)
-            print(f"[send_entry_to_remote_followers] <- {resp.status_code} {resp.text[:200]}")
-        except requests.RequestException as e:
-            print(f"[send_entry_to_remote_followers] ERROR sending to {inbox_url}: {e}")
-            continue
+            return FileResponse(entry.content_file.open("rb"), content_type=content_type)
+        except FileNotFoundError:
+            raise Http404("Image file is missing")
+
+    try:
+        binary = entry.image_bytes()
+    except (binascii.Error, ValueError):
+        raise Http404("Invalid image data")
+    return HttpResponse(binary, content_type=content_type)
+
 
 class AuthorEntryImageView(APIView):
     """
@@ -572,7 +573,8 @@ class AuthorEntryImageView(APIView):
 
     - Only PUBLIC entries are served.
     - Entry.content_type must start with 'image/'.
-    - Entry.content is expected to be base64-encoded.
+    - Entry.content is expected to be base64-encoded, unless the image was
+      stored to Entry.content_file by the inbox.
     """
     permission_classes = [permissions.AllowAny]
 
@@ -590,24 +592,7 @@ class AuthorEntryImageView(APIView):
             # Not an image entry
             raise Http404("Entry is not an image")
 
-        raw_content = entry.content or ""
-        # Some implementations may store "data:<ct>;base64,<data>"
-        if raw_content.startswith("data:"):
-            try:
-                header, b64_data = raw_content.split(",", 1)
-            except ValueError:
-                raise Http404("Invalid image data")
-        else:
-            b64_data = raw_content
-
-        try:
-            binary = base64.b64decode(b64_data, validate=True)
-        except (binascii.Error, ValueError):
-            raise Http404("Invalid image data")
-
-        from django.http import HttpResponse
-
-        response = HttpResponse(binary, content_type=content_type)
+        response = _image_response(entry, content_type)
         # Optional: basic cache headers (can be tuned or removed)
         response["Cache-Control"] = "public, max-age=3600"
         return response
@@ -621,7 +606,8 @@ class EntryFQIDImageView(APIView):
     - FQID is a full URL; we extract the final path segment as the UUID.
     - Only PUBLIC entries are served.
     - Entry.content_type must start with 'image/'.
-    - Entry.content is expected to be base64-encoded.
+    - Entry.content is expected to be base64-encoded, unless the image was
+      stored to Entry.content_file by the inbox.
     """
     permission_classes = [permissions.AllowAny]
 
@@ -646,23 +632,7 @@ class EntryFQIDImageView(APIView):
         if not content_type.startswith("image/"):
             raise Http404("Entry is not an image")
 
-        raw_content = entry.content or ""
-        if raw_content.startswith("data:"):
-            try:
-                header, b64_data = raw_content.split(",", 1)
-            except ValueError:
-                raise Http404("Invalid image data")
-        else:
-            b64_data = raw_content
-
-        try:
-            binary = base64.b64decode(b64_data, validate=True)
-        except (binascii.Error, ValueError):
-            raise Http404("Invalid image data")
-
-        from django.http import HttpResponse
-
-        response = HttpResponse(binary, content_type=content_type)
+        response = _image_response(entry, content_type)
         response["Cache-Control"] = "public, max-age=3600"
         return response
 
@@ -677,7 +647,7 @@ class MyEntriesListView(generics.ListCreateAPIView):
     def get_queryset(self):
         return (
             Entry.objects.filter(author=self.request.user)
-            .exclude(visibility="DELETED")
+            .exclude(visibility__in=[Visibility.DELETED, "DELETED"])
             .order_by("-published")
         )
 
@@ -741,22 +711,6 @@ class EntryLikeView(APIView):
                 )
             raise Http404("Entry not found")
 
-        if entry.visibility == Visibility.FRIENDS and request.user != entry.author:
-            is_mutual = FollowRequest.objects.filter(
-                follower=request.user,
-                followee=entry.author,
-                status=FollowRequestStatus.APPROVED,
-            ).exists() and FollowRequest.objects.filter(
-                follower=entry.author,
-                followee=request.user,
-                status=FollowRequestStatus.APPROVED,
-            ).exists()
-            if not is_mutual:
-                return Response(
-                    {"detail": "Mutual follow required."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-
         # Add the like locally
         entry.liked_by.add(request.user)
         likes_count = entry.liked_by.count()
@@ -914,13 +868,15 @@ class AuthorLikedListView(LikeSerializerMixin, APIView):
         start = (page - 1) * size
         end = start + size
 
+        # Only likes on entries the requester may see
+        visible_entries = Entry.objects.visible_to(request.user)
         entry_likes = (
-            Entry.objects.filter(liked_by=liker)
+            visible_entries.filter(liked_by=liker)
             .select_related("author")
             .order_by("-published")
         )
         comment_likes = (
-            Comment.objects.filter(liked_by=liker)
+            Comment.objects.filter(liked_by=liker, entry__in=visible_entries)
             .select_related("entry", "entry__author")
             .order_by("-created_at")
         )
@@ -982,21 +938,14 @@ def send_comment_to_author_inbox(comment: Comment, request):
     
     # Only send if author is on a remote node
     if not author_host or author_host == current_host:
-        print(f"[COMMENT] Author {author.id} is local, not sending to inbox")
+        logger.debug("Entry author %s is local, not sending comment", author.id)
         return
     
-    from entries.models import RemoteNode
-    
     # Find the remote node
-    remote_node = (
-        RemoteNode.objects
-        .filter(is_active=True)
-        .filter(base_url__startswith=author_host)
-        .first()
-    )
+    remote_node = find_node(author_host)
     
     if not remote_node:
-        print(f"[COMMENT] No remote node configured for host {author_host}")
+        logger.warning("No remote node configured for host %s, dropping comment", author_host)
         return
     
     # Build URLs
@@ -1028,25 +977,9 @@ def send_comment_to_author_inbox(comment: Comment, request):
         "entry": entry_url
     }
     
-    # Send to remote inbox
-    try:
-        auth = HTTPBasicAuth(remote_node.username, remote_node.password)
-        print(f"[COMMENT DEBUG] Comment refers to entry: {comment_object.get('entry')}")
-        print(f"[COMMENT DEBUG] Payload comment id: {comment_object.get('id')}")
-        print(f"[COMMENT DEBUG] Full payload: {comment_object}")
-        print(f"[COMMENT] Sending comment to {inbox_url}")
-                
-        response = requests.post(
-            inbox_url,
-            json=comment_object,
-            auth=auth,
-            timeout=10
-        )
-        
-        print(f"[COMMENT] Response: {response.status_code} - {response.text[:200]}")
-        
-    except requests.RequestException as e:
-        print(f"[COMMENT] Error sending comment to remote inbox: {e}")
+    # Queue for the outbox worker
+    logger.debug("Queued comment %s on entry %s for %s", comment_url, entry_url, inbox_url)
+    enqueue_delivery(remote_node, inbox_url, "comment", comment_object)
 
 class LikeDetailView(LikeSerializerMixin, APIView):
     '''
@@ -1070,9 +1003,9 @@ class EntryCommentsListCreateView(generics.ListCreateAPIView):
     def get_entry(self):
         if self._entry is not None:
             return self._entry
-        entry = get_object_or_404(Entry, id=self.kwargs["entry_id"])
-        if not entry.can_view(self.request.user):
-            raise Http404("Entry not found")
+        entry = get_object_or_404(
+            Entry.objects.visible_to(self.request.user), id=self.kwargs["entry_id"]
+        )
         self._entry = entry
         return entry
 
@@ -1109,10 +1042,6 @@ class EntryCommentsListCreateView(generics.ListCreateAPIView):
         # 2) Notify remote followers of this local author (if any)
         send_comment_to_remote_followers(comment, self.request)
 
-
-        
-        send_comment_to_author_inbox(comment, self.request)
-
 class CommentDetailView(generics.RetrieveAPIView):
     """
     GET /api/comments/<comment_id>/
@@ -1148,14 +1077,7 @@ def send_comment_like_to_author_inbox(comment: Comment, liker: Author, request):
     if not author_host or author_host == current_host:
         return
     
-    from entries.models import RemoteNode
-    
-    remote_node = (
-        RemoteNode.objects
-        .filter(is_active=True)
-        .filter(base_url__startswith=author_host)
-        .first()
-    )
+    remote_node = find_node(author_host)
     
     if not remote_node:
         return
@@ -1183,12 +1105,8 @@ def send_comment_like_to_author_inbox(comment: Comment, liker: Author, request):
         "object": comment_url
     }
     
-    try:
-        auth = HTTPBasicAuth(remote_node.username, remote_node.password)
-        response = requests.post(inbox_url, json=like_object, auth=auth, timeout=10)
-        print(f"[COMMENT_LIKE] Sent to {inbox_url}: {response.status_code} - {response.text[:200]}")    
-    except requests.RequestException as e:
-        print(f"[COMMENT_LIKE] Error: {e}")
+    logger.debug("Queued comment like for %s", inbox_url)
+    enqueue_delivery(remote_node, inbox_url, "like", like_object)
 
 class CommentLikeView(APIView):
     """
@@ -1231,37 +1149,133 @@ def render_markdown_entry(request, entry_id):
 
     # Return the rendered content as JSON
     return JsonResponse({"rendered_content": rendered_content})
+class FederationStatsView(APIView):
+    """
+    GET /api/federation/stats/
+    Staff-only federation health report per RemoteNode: delivery latency
+    percentiles, success ratio and backlog, throttle bucket levels, plus this
+    process's request histograms. Optional ?window=<seconds> (default FEDERATION_STATS_WINDOW_SECONDS).
+    """
+    # Session only: node credentials authenticate a NodeUser, which has no is_staff
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        window = request.query_params.get("window")
+        try:
+            window_seconds = int(window) if window else None
+        except ValueError:
+            return Response({"detail": "window must be an integer number of seconds"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "type": "federation-stats",
+            "nodes": federation_stats(window_seconds),
+        })
+
+
+INBOX_TYPES = {"post", "entry", "like", "comment", "follow"}
+
+
+def _batch_max_items() -> int:
+    return getattr(settings, "INBOX_BATCH_MAX_ITEMS", 100)
+
+
+def _last_uuid_segment(url) -> Optional[str]:
+    if not isinstance(url, str):
+        return None
+    parts = [p for p in url.rstrip("/").split("/") if p]
+    if not parts:
+        return None
+    try:
+        return str(uuid.UUID(parts[-1]))
+    except ValueError:
+        return None
+
+
+def _prefetch_inbox_targets(items: list) -> dict:
+    """
+    Load every author, entry and comment a batch refers to with one query per
+    model, keyed by uuid string, so the handlers don't query per item.
+    """
+    author_ids, entry_ids, comment_ids = set(), set(), set()
+    for data in items:
+        if not isinstance(data, dict):
+            continue
+        obj_type = (data.get("type") or "").lower()
+        sender = data.get("actor" if obj_type == "follow" else "author")
+        # Authors already in the resolution cache need no query at all
+        if isinstance(sender, dict) and author_cache.get(sender.get("id")) is None:
+            author_ids.add(_last_uuid_segment(sender.get("id")))
+        if obj_type == "like":
+            target = classify_object_url(data.get("object"))
+            if target is not None:
+                object_type, target_id = target
+                (entry_ids if object_type == ENTRY else comment_ids).add(target_id)
+        elif obj_type == "comment":
+            entry_ids.add(_last_uuid_segment(data.get("entry") or data.get("object")))
+
+    def load(model, ids):
+        ids.discard(None)
+        return {str(pk): obj for pk, obj in model.objects.in_bulk(ids).items()} if ids else {}
+
+    return {
+        "authors": load(Author, author_ids),
+        Entry: load(Entry, entry_ids),
+        Comment: load(Comment, comment_ids),
+    }
+
+
 class InboxView(APIView):
     """
     POST /api/authors/{AUTHOR_ID}/inbox/
     Receives posts/entries, likes, comments, and follow requests from remote nodes.
+
+    With INBOX_ASYNC on, the envelope is validated, stored as an InboxItem and
+    answered with 202; `python manage.py process_inbox` runs the handlers.
+
+    The body may also be a JSON array of up to INBOX_BATCH_MAX_ITEMS objects.
+    They are handled in one transaction (a savepoint per item) with authors,
+    entries and comments loaded up front, and the response lists a result per
+    item. Every inbox response advertises the limit in X-Inbox-Batch-Max-Items.
     """
-    authentication_classes = [RemoteNodeBasicAuthentication]
+    authentication_classes = [RemoteNodeBasicAuthentication, RemoteNodeSignatureAuthentication]
+    # Size limit (413) and streamed image content; see entries/inbox_parser.py
+    parser_classes = [InboxJSONParser, FormParser, MultiPartParser]
     # RemoteNodeBasicAuthentication will 401 bad/unknown/inactive nodes.
     permission_classes = [permissions.AllowAny]
+    # Token bucket used by RemoteNodeRateThrottle
+    node_throttle_scope = "inbox"
+
+    # Rows loaded up front for a batch request: {"authors": {...}, Entry: {...}, Comment: {...}}
+    _prefetched = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        response["X-Inbox-Batch-Max-Items"] = str(_batch_max_items())
+        return response
     
     @extend_schema(
         request=InboxItemSerializer,
         responses={
             201: {"type": "object", "properties": {"detail": {"type": "string"}}},
             200: {"type": "object", "properties": {"detail": {"type": "string"}}},
+            202: {"type": "object", "properties": {"detail": {"type": "string"}, "id": {"type": "string"}}},
             400: {"type": "object", "properties": {"detail": {"type": "string"}}},
             404: {"type": "object", "properties": {"detail": {"type": "string"}}},
         },
     )
-
     def post(self, request, author_id):
         # Recipient is the local author who owns this inbox
-        print(f"\n{'='*60}")
-        print(f"[INBOX] ===== INCOMING REQUEST =====")
-        print(f"[INBOX] Author ID (recipient): {author_id}")
-        print(f"[INBOX] Request method: {request.method}")
-        print(f"[INBOX] Content-Type: {request.content_type}")
-        print(f"[INBOX] Auth header present: {'Authorization' in request.headers}")
-        print(f"[INBOX] Remote user: {getattr(request, 'user', 'N/A')}")
-        print(f"[INBOX] Raw data type: {type(request.data)}")
-        print(f"[INBOX] Raw data: {request.data}")
-        print(f"{'='*60}\n")
+        inbox_logger.info(
+            "Inbox POST for %s from %s (%s): %s",
+            author_id,
+            getattr(request, "user", None),
+            request.content_type,
+            truncated(request.data),
+        )
+        # Picked up by InboxRecorderMiddleware when INBOX_RECORD_PATH is set
+        request._request.inbox_payload = request.data
+        request._request.inbox_node = getattr(request.user, "node", None)
         try:
             recipient = Author.objects.get(id=author_id)
         except Author.DoesNotExist:
@@ -1270,7 +1284,137 @@ class InboxView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        data = request.data
+        if isinstance(request.data, list):
+            return self._post_batch(request, recipient, request.data)
+        if getattr(settings, "INBOX_ASYNC", False):
+            return self._accept(request, recipient, request.data)
+        return self._dispatch(recipient, request.data, getattr(request.user, "node", None))
+
+    def _post_batch(self, request, recipient: Author, items: list):
+        if not items:
+            return Response({"detail": "Empty batch"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > _batch_max_items():
+            return Response(
+                {"detail": f"Batch exceeds {_batch_max_items()} items"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        if getattr(settings, "INBOX_ASYNC", False):
+            return self._accept_batch(request, recipient, items)
+
+        self._prefetched = _prefetch_inbox_targets(items)
+        known_authors = self._prefetched["authors"]
+        results = []
+        with transaction.atomic():
+            for index, data in enumerate(items):
+                # Author stubs created by this item are kept apart until its
+                # savepoint commits; a rolled-back row must not be reused
+                self._prefetched["authors"] = ChainMap({}, known_authors)
+                # A savepoint per item: one bad item doesn't undo the others
+                with transaction.atomic():
+                    response = self._dispatch(recipient, data, getattr(request.user, "node", None))
+                    failed = response.status_code >= 500
+                    if failed:
+                        transaction.set_rollback(True)
+                if not failed:
+                    known_authors.update(self._prefetched["authors"].maps[0])
+                results.append({"index": index, "status": response.status_code, **(response.data or {})})
+        self._prefetched = None
+
+        return Response({"type": "inbox-batch", "results": results}, status=status.HTTP_200_OK)
+
+    def _accept_batch(self, request, recipient: Author, items: list):
+        node = getattr(request.user, "node", None)
+        results = []
+        queued = []
+        for index, data in enumerate(items):
+            error = self._validate_envelope(data)
+            if error:
+                results.append({"index": index, "status": status.HTTP_400_BAD_REQUEST, "detail": error})
+                continue
+            item = InboxItem(
+                recipient=recipient,
+                node=node,
+                object_type=data["type"].lower(),
+                payload=data,
+            )
+            queued.append(item)
+            results.append({
+                "index": index,
+                "status": status.HTTP_202_ACCEPTED,
+                "detail": "Accepted for processing",
+                "id": str(item.id),
+            })
+        InboxItem.objects.bulk_create(queued)
+
+        return Response({"type": "inbox-batch", "results": results}, status=status.HTTP_202_ACCEPTED)
+
+    def _resolve_author(self, author_data) -> Optional[Author]:
+        known = self._prefetched["authors"] if self._prefetched is not None else None
+        return _resolve_remote_author_from_data(author_data, known)
+
+    def _get(self, model, object_id):
+        """model.objects.get(id=...), served from the batch prefetch when possible."""
+        if self._prefetched is not None:
+            found = self._prefetched[model].get(str(object_id))
+            if found is not None:
+                return found
+        return model.objects.get(id=object_id)
+
+    def _validate_envelope(self, data) -> Optional[str]:
+        """Cheap shape checks done before queueing; returns an error detail or None."""
+        if not isinstance(data, dict):
+            return "Inbox item must be a JSON object"
+
+        obj_type = (data.get("type") or "").lower()
+        if obj_type not in INBOX_TYPES:
+            return f"Unsupported type: {obj_type}"
+
+        sender_field = "actor" if obj_type == "follow" else "author"
+        if not isinstance(data.get(sender_field), dict):
+            return f"Missing or invalid {sender_field}"
+        return None
+
+    def _accept(self, request, recipient: Author, data):
+        """Store the raw item for `process_inbox` and return 202 right away."""
+        error = self._validate_envelope(data)
+        if error:
+            return Response({"detail": error}, status=status.HTTP_400_BAD_REQUEST)
+
+        item = InboxItem.objects.create(
+            recipient=recipient,
+            node=getattr(request.user, "node", None),
+            object_type=data["type"].lower(),
+            payload=data,
+        )
+        return Response(
+            {"detail": "Accepted for processing", "id": str(item.id)},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    def _dispatch(self, recipient: Author, data, node=None):
+        """
+        Run the handler for one inbox object and return its Response.
+        Exact replays from the same sending `node` are answered from the
+        idempotency ledger without running the handler again.
+        """
+        if not isinstance(data, dict):
+            return Response(
+                {"detail": "Inbox item must be a JSON object"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        key = inbox_ledger.ledger_key(node, data) if getattr(settings, "INBOX_LEDGER_ENABLED", True) else None
+        row = inbox_ledger.lookup(key) if key else None
+        if inbox_ledger.is_replay(key, row):
+            return Response(row.response, status=row.status_code)
+
+        response = self._run_handler(recipient, data)
+        if key and status.is_success(response.status_code):
+            inbox_ledger.record(key, row, response.status_code, response.data)
+        return response
+
+    def _run_handler(self, recipient: Author, data: dict):
         obj_type = (data.get("type") or "").lower()
 
         try:
@@ -1303,7 +1447,7 @@ class InboxView(APIView):
         has 'id', 'title', 'contentType', 'content', 'visibility', 'author' object, etc.
         """
         author_data = data.get("author") or {}
-        remote_author = _resolve_remote_author_from_data(author_data)
+        remote_author = self._resolve_author(author_data)
         if not remote_author:
             return Response(
                 {"detail": "Missing or invalid author"},
@@ -1366,6 +1510,8 @@ class InboxView(APIView):
                 "title": data.get("title", ""),
                 "description": data.get("description", ""),
                 "content": data.get("content", ""),
+                # Set by InboxJSONParser for large images; inline content clears it
+                "content_file": data.get(SPOOLED_CONTENT_KEY, ""),
                 "content_type": data.get("contentType", "text/plain"),
                 "visibility": visibility,
                 "published": published,
@@ -1388,7 +1534,7 @@ class InboxView(APIView):
           - object: URL of entry or comment being liked
         """
         author_data = data.get("author") or {}
-        remote_author = _resolve_remote_author_from_data(author_data)
+        remote_author = self._resolve_author(author_data)
         object_url = (data.get("object") or "").rstrip("/")
 
         if not remote_author or not object_url:
@@ -1397,35 +1543,32 @@ class InboxView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        parts = [p for p in object_url.split("/") if p]
-        target_id = parts[-1]
-
-        try:
-            entry = Entry.objects.get(id=target_id)
-            entry.liked_by.add(remote_author)
+        target = classify_object_url(object_url)
+        if target is None:
             return Response(
-                {"detail": "Like added to entry"},
-                status=status.HTTP_200_OK,
+                {"detail": "Unrecognized object URL"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        except Entry.DoesNotExist:
-            pass
 
+        object_type, target_id = target
+        model = Entry if object_type == ENTRY else Comment
         try:
-            comment = Comment.objects.get(id=target_id)
-            comment.liked_by.add(remote_author)
-            return Response(
-                {"detail": "Like added to comment"},
-                status=status.HTTP_200_OK,
-            )
-        except Comment.DoesNotExist:
+            obj = self._get(model, target_id)
+        except model.DoesNotExist:
             return Response(
                 {"detail": "Object not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        obj.liked_by.add(remote_author)
+        return Response(
+            {"detail": f"Like added to {object_type}"},
+            status=status.HTTP_200_OK,
+        )
+
     def _handle_comment(self, recipient: Author, data: dict):
         author_data = data.get("author") or {}
-        remote_author = _resolve_remote_author_from_data(author_data)
+        remote_author = self._resolve_author(author_data)
         entry_url = (data.get("entry") or data.get("object") or "").rstrip("/")
         comment_full_id = (data.get("id") or "").rstrip("/")
 
@@ -1439,7 +1582,7 @@ class InboxView(APIView):
         entry_id = parts[-1]
 
         try:
-            entry = Entry.objects.get(id=entry_id)
+            entry = self._get(Entry, entry_id)
         except Entry.DoesNotExist:
             return Response(
                 {"detail": "Entry not found"},
@@ -1449,12 +1592,15 @@ class InboxView(APIView):
         comment_id = comment_full_id.split("/")[-1]
 
         # --- DEDUP GUARD ---
+        # One probe on comment_dedup_idx instead of comparing full comment text
         existing = Comment.objects.filter(
             entry=entry,
             author=remote_author,
-            content=data.get("comment", ""),
-            content_type=data.get("contentType", "text/plain"),
-        ).first()
+            content_hash=Comment.compute_content_hash(
+                data.get("comment", ""),
+                data.get("contentType", "text/plain"),
+            ),
+        ).exists()
 
         if existing:
             return Response(
@@ -1493,30 +1639,25 @@ class InboxView(APIView):
         """
         Handle incoming follow request.
         """
-        print(f"[INBOX FOLLOW] Received data: {data}")
-        
         actor_data = data.get("actor") or {}
-        print(f"[INBOX FOLLOW] Actor data: {actor_data}")
-        
-        remote_author = _resolve_remote_author_from_data(actor_data)
-        print(f"[INBOX FOLLOW] Resolved remote author: {remote_author}")
+        remote_author = self._resolve_author(actor_data)
 
         if not remote_author:
-            print(f"[INBOX FOLLOW] Failed to resolve remote author!")
+            inbox_logger.warning("Follow with unresolvable actor: %s", truncated(actor_data))
             return Response(
                 {"detail": "Missing or invalid actor"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        print(f"[INBOX FOLLOW] Creating FollowRequest: follower={remote_author.id}, followee={recipient.id}")
-        
         fr, created = FollowRequest.objects.get_or_create(
             follower=remote_author,
             followee=recipient,
             defaults={"status": FollowRequestStatus.PENDING},
         )
         
-        print(f"[INBOX FOLLOW] FollowRequest created={created}, status={fr.status}")
+        inbox_logger.debug(
+            "Follow %s -> %s: created=%s status=%s", remote_author.id, recipient.id, created, fr.status
+        )
 
         return Response(
             {"detail": "Follow request received"},
@@ -0,0 +1,111 @@
+"""
+Bounded in-process cache for remote author resolution in the inbox path.
+
+A busy peer keeps sending the same few authors. The cache maps an author's
+FQID (its `id` URL) to the local Author pk and normalized host, so a repeat
+sender resolves without touching the database. Entries expire after
+REMOTE_AUTHOR_CACHE_TTL seconds, the least recently used entry is evicted
+beyond REMOTE_AUTHOR_CACHE_SIZE, and Author post_save/post_delete drop the
+author's entries (see entries/signals.py).
+
+Authors are remembered only once the surrounding transaction commits: a stub
+author created inside a batch savepoint or an inbox item's atomic block that
+later rolls back must not be served from the cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from authors.models import Author
+
+
+def normalize_fqid(fqid) -> str:
+    return (fqid or "").strip().rstrip("/")
+
+
+class AuthorResolutionCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()  # fqid -> (pk, host, expires_at)
+        self._fqids_by_pk: dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fqid: str):
+        """(pk, host) for a cached FQID, or None."""
+        key = normalize_fqid(fqid)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            pk, host, expires_at = cached
+            if time.monotonic() >= expires_at:
+                self._drop(key, pk)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pk, host
+
+    def put(self, fqid: str, pk, host):
+        key = normalize_fqid(fqid)
+        if not key:
+            return
+        ttl = getattr(settings, "REMOTE_AUTHOR_CACHE_TTL", 300)
+        max_size = getattr(settings, "REMOTE_AUTHOR_CACHE_SIZE", 1024)
+        with self._lock:
+            self._entries[key] = (pk, host, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            self._fqids_by_pk.setdefault(pk, set()).add(key)
+            while len(self._entries) > max_size:
+                old_key, (old_pk, _, _) = self._entries.popitem(last=False)
+                self._forget_key(old_key, old_pk)
+
+    def invalidate_pk(self, pk):
+        with self._lock:
+            for key in self._fqids_by_pk.pop(pk, set()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._fqids_by_pk.clear()
+
+    def _drop(self, key, pk):
+        self._entries.pop(key, None)
+        self._forget_key(key, pk)
+
+    def _forget_key(self, key, pk):
+        keys = self._fqids_by_pk.get(pk)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._fqids_by_pk[pk]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+author_cache = AuthorResolutionCache()
+
+
+def cached_author(fqid: str):
+    """
+    A deferred Author instance (only id and host loaded) for a cached FQID,
+    built without a query, or None on a miss.
+    """
+    cached = author_cache.get(fqid)
+    if cached is None:
+        return None
+    pk, host = cached
+    return Author.from_db(DEFAULT_DB_ALIAS, ["id", "host"], [pk, host])
+
+
+def remember_author(fqid: str, author: Author):
+    pk, host = author.pk, getattr(author, "host", None)
+    # Runs at once outside a transaction; dropped if the transaction rolls back
+    transaction.on_commit(lambda: author_cache.put(fqid, pk, host))
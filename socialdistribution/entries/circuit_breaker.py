@@ -0,0 +1,114 @@
+"""
+Per-RemoteNode circuit breaker.
+
+CLOSED     requests flow normally; consecutive failures are counted.
+OPEN       after CIRCUIT_FAILURE_THRESHOLD failures in a row nothing is sent to
+           the node until CIRCUIT_COOLDOWN_SECONDS have passed.
+HALF_OPEN  after the cooldown one probe request is let through. Success closes
+           the circuit, failure opens it again for another cooldown.
+
+Network errors, 5xx and 429 responses and calls slower than
+CIRCUIT_SLOW_CALL_SECONDS count as failures. 4xx responses are the remote
+refusing one object, not the node being unhealthy, so they do not.
+
+State is written with queryset.update() so saving it neither fires the
+RemoteNode signals nor bumps updated_at.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import CircuitState, RemoteNode
+
+# Weight of the newest sample in the latency moving average
+LATENCY_ALPHA = 0.2
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def is_node_failure(status_code, elapsed: float = 0.0) -> bool:
+    """Whether an outcome says something about the node's health."""
+    if elapsed > _setting("CIRCUIT_SLOW_CALL_SECONDS", 5):
+        return True
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+def reopens_at(node):
+    """When an open circuit will let a probe through."""
+    opened_at = node.circuit_opened_at or timezone.now()
+    return opened_at + timedelta(seconds=_setting("CIRCUIT_COOLDOWN_SECONDS", 60))
+
+
+def allow_request(node) -> bool:
+    """
+    Whether a request to `node` may be attempted now. An open circuit whose
+    cooldown has passed moves to HALF_OPEN; callers should then send a single
+    probe until its outcome is recorded.
+    """
+    if node.circuit_state == CircuitState.CLOSED:
+        return True
+
+    if node.circuit_state == CircuitState.OPEN:
+        if timezone.now() < reopens_at(node):
+            return False
+        node.circuit_state = CircuitState.HALF_OPEN
+        RemoteNode.objects.filter(pk=node.pk, circuit_state=CircuitState.OPEN).update(
+            circuit_state=CircuitState.HALF_OPEN,
+        )
+
+    return True
+
+
+def _apply(node, failed: bool, elapsed: float, now):
+    elapsed_ms = elapsed * 1000
+    if node.avg_latency_ms is None:
+        node.avg_latency_ms = elapsed_ms
+    else:
+        node.avg_latency_ms += LATENCY_ALPHA * (elapsed_ms - node.avg_latency_ms)
+
+    if not failed:
+        node.consecutive_failures = 0
+        node.circuit_state = CircuitState.CLOSED
+        node.circuit_opened_at = None
+        return
+
+    node.consecutive_failures += 1
+    if (
+        node.circuit_state == CircuitState.HALF_OPEN
+        or node.consecutive_failures >= _setting("CIRCUIT_FAILURE_THRESHOLD", 5)
+    ):
+        node.circuit_state = CircuitState.OPEN
+        node.circuit_opened_at = now
+
+
+def record_outcomes(node, outcomes):
+    """
+    Apply (failed, elapsed_seconds) outcomes in order and persist the
+    resulting state with a single UPDATE.
+    """
+    now = timezone.now()
+    for failed, elapsed in outcomes:
+        _apply(node, failed, elapsed, now)
+
+    RemoteNode.objects.filter(pk=node.pk).update(
+        circuit_state=node.circuit_state,
+        consecutive_failures=node.consecutive_failures,
+        circuit_opened_at=node.circuit_opened_at,
+        avg_latency_ms=node.avg_latency_ms,
+    )
+
+
+def record_outcome(node, failed: bool, elapsed: float = 0.0):
+    record_outcomes(node, [(failed, elapsed)])
+
+
+def reset(queryset):
+    """Close the circuit for every node in `queryset`."""
+    return queryset.update(
+        circuit_state=CircuitState.CLOSED,
+        consecutive_failures=0,
+        circuit_opened_at=None,
+    )
@@ -0,0 +1,135 @@
+"""
+Concurrent, bounded fan-out for federation deliveries.
+
+A thread pool sends to many recipients at once. It is capped globally by the
+pool size and per remote host by a semaphore, so one author with thousands of
+followers on one node neither serializes thousands of round trips nor floods
+that node. Workers only do HTTP. Callers apply results to the database
+afterwards on their own thread.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
+
+import requests
+
+
+@dataclass
+class RecipientResult:
+    """Outcome of one send. `key` is whatever item the caller fanned out."""
+
+    key: Any
+    url: str
+    ok: bool
+    status_code: int | None = None
+    error: str = ""
+    elapsed: float = 0.0
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc.lower()
+
+
+@dataclass
+class FanOutSummary:
+    """
+    Per-recipient results, in the same order as the input items.
+    `deferred` holds items the caller chose not to attempt this time.
+    """
+
+    results: list[RecipientResult] = field(default_factory=list)
+    deferred: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    @property
+    def delivered(self) -> list[RecipientResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> list[RecipientResult]:
+        return [r for r in self.results if not r.ok]
+
+    def by_host(self) -> dict:
+        hosts: dict = {}
+        for result in self.results:
+            counts = hosts.setdefault(result.host, {"delivered": 0, "failed": 0})
+            counts["delivered" if result.ok else "failed"] += 1
+        return hosts
+
+
+class _HostLimiter:
+    """Lazily created semaphore per host."""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: dict = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+
+def fan_out(
+    items: Iterable,
+    send: Callable[[Any], requests.Response],
+    *,
+    url: Callable[[Any], str],
+    max_workers: int = 16,
+    per_host: int = 4,
+) -> FanOutSummary:
+    """
+    Call `send(item)` for every item concurrently and collect a summary.
+
+    - `url(item)` gives the target URL, used for the per-host cap.
+    - `send` returns a requests.Response. Network errors are recorded on the
+      result instead of propagating.
+    """
+    items = list(items)
+    if not items:
+        return FanOutSummary()
+
+    limiter = _HostLimiter(max(1, per_host))
+
+    def run(item) -> RecipientResult:
+        target = url(item)
+        with limiter.for_url(target):
+            started = time.monotonic()
+            try:
+                response = send(item)
+            except requests.RequestException as e:
+                return RecipientResult(
+                    key=item,
+                    url=target,
+                    ok=False,
+                    error=str(e),
+                    elapsed=time.monotonic() - started,
+                )
+
+        return RecipientResult(
+            key=item,
+            url=target,
+            ok=response.ok,
+            status_code=response.status_code,
+            error="" if response.ok else (response.text or "")[:200],
+            elapsed=time.monotonic() - started,
+        )
+
+    workers = max(1, min(max_workers, len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fanout") as executor:
+        results = list(executor.map(run, items))
+
+    return FanOutSummary(results=results)
@@ -0,0 +1,162 @@
+"""
+Pooled keep-alive HTTP sessions for talking to remote nodes.
+
+Every outbound federation call goes through one requests.Session per
+RemoteNode. Auth is set once on the session (HMAC signatures when the node
+has a signing key, see entries/request_signing.py; Basic otherwise) and the
+urllib3 pool behind it is bounded, so a fan-out to hundreds of inboxes on the
+same node reuses a handful of sockets instead of paying a TCP/TLS handshake
+per request.
+
+Each request is timed into entries.telemetry under its object type (the
+`object_type` keyword, or the lower-cased HTTP method).
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from django.conf import settings
+
+from . import telemetry
+from .request_signing import HmacSignatureAuth
+
+
+class _NodeSession:
+    """A session plus the bookkeeping needed to report on it."""
+
+    def __init__(self, node, pool_maxsize: int):
+        self.fingerprint = _fingerprint(node)
+        self.node_name = node.name
+        self.requests = 0
+        self.errors = 0
+        self.counter_lock = threading.Lock()
+
+        self.session = requests.Session()
+        if node.signing_key_id and node.signing_secret:
+            self.session.auth = HmacSignatureAuth(node.signing_key_id, node.signing_secret)
+        else:
+            self.session.auth = HTTPBasicAuth(node.username, node.password)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        })
+        # pool_block keeps the number of open sockets per host at pool_maxsize
+        self.adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def stats(self) -> dict:
+        connections_opened = 0
+        pool_requests = 0
+        idle_connections = 0
+        poolmanager = getattr(self.adapter, "poolmanager", None)
+        if poolmanager is not None:
+            for key in list(poolmanager.pools.keys()):
+                pool = poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                connections_opened += pool.num_connections
+                pool_requests += pool.num_requests
+                # The queue is pre-filled with None placeholders up to maxsize
+                if pool.pool is not None:
+                    idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+
+        return {
+            "node": self.node_name,
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections_opened": connections_opened,
+            "idle_connections": idle_connections,
+            "connection_reuse": (
+                round(1 - connections_opened / pool_requests, 3) if pool_requests else None
+            ),
+        }
+
+    def close(self):
+        self.session.close()
+
+
+def _fingerprint(node) -> tuple:
+    # A credential or URL change must not keep using the stale session
+    return (node.base_url, node.username, node.password, node.signing_key_id, node.signing_secret)
+
+
+class NodeSessionPool:
+    """Process-wide registry of one keep-alive session per RemoteNode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions: dict = {}
+
+    def _entry_for(self, node) -> _NodeSession:
+        with self._lock:
+            entry = self._sessions.get(node.pk)
+            if entry is None or entry.fingerprint != _fingerprint(node):
+                if entry is not None:
+                    entry.close()
+                entry = _NodeSession(
+                    node,
+                    pool_maxsize=getattr(settings, "FEDERATION_POOL_MAXSIZE", 10),
+                )
+                self._sessions[node.pk] = entry
+            return entry
+
+    def session_for(self, node) -> requests.Session:
+        return self._entry_for(node).session
+
+    def request(self, node, method: str, url: str, object_type: str = "", **kwargs) -> requests.Response:
+        entry = self._entry_for(node)
+        with entry.counter_lock:
+            entry.requests += 1
+        label = object_type or method.lower()
+        started = time.monotonic()
+        try:
+            response = entry.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            with entry.counter_lock:
+                entry.errors += 1
+            telemetry.record_request(node, label, time.monotonic() - started, error=type(e).__name__)
+            raise
+        telemetry.record_request(node, label, time.monotonic() - started, status_code=response.status_code)
+        return response
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            entries = list(self._sessions.values())
+        return [entry.stats() for entry in entries]
+
+    def close(self):
+        with self._lock:
+            for entry in self._sessions.values():
+                entry.close()
+            self._sessions.clear()
+
+
+_pool = NodeSessionPool()
+
+
+def get(node, url: str, **kwargs) -> requests.Response:
+    return _pool.request(node, "GET", url, **kwargs)
+
+
+def post(node, url: str, **kwargs) -> requests.Response:
+    return _pool.request(node, "POST", url, **kwargs)
+
+
+def session_for(node) -> requests.Session:
+    return _pool.session_for(node)
+
+
+def pool_stats() -> list[dict]:
+    """Per-node request, error and connection-reuse counters for this process."""
+    return _pool.stats()
+
+
+def close_sessions():
+    _pool.close()
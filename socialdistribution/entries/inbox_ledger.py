@@ -0,0 +1,113 @@
+"""
+Idempotency ledger for inbox objects.
+
+Peers retry deliveries. Without a ledger every retry re-resolves the author
+and re-runs update_or_create or liked_by.add. ProcessedInboxObject remembers,
+per sending node, which objects were applied and what the handler answered:
+
+- likes are identified by (liker, liked object); any replay matches.
+- entries and comments are identified by their FQID. A replay matches only
+  when the payload is byte-for-byte the one applied last, so edits (and
+  reverting to an earlier version) are still processed.
+- follows are not recorded: re-sending a follow after a rejection must reach
+  the handler.
+
+Only successful (2xx) outcomes are recorded. `compact_inbox_ledger` deletes old
+rows.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import ProcessedInboxObject
+
+SHARED_SENDER = "shared"
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _norm(url) -> str:
+    return (url or "").strip().rstrip("/") if isinstance(url, str) else ""
+
+
+def ledger_key(node, data: dict):
+    """
+    (sender, object_type, object_key, payload_digest) for a ledgered object,
+    or None when the object is not tracked.
+    """
+    obj_type = (data.get("type") or "").lower()
+    sender = str(node.pk) if node is not None else SHARED_SENDER
+
+    if obj_type == "like":
+        author = data.get("author") if isinstance(data.get("author"), dict) else {}
+        liker, target = _norm(author.get("id")), _norm(data.get("object"))
+        if not liker or not target:
+            return None
+        return sender, obj_type, _sha256(f"like|{liker}|{target}"), ""
+
+    if obj_type in ("post", "entry", "comment"):
+        fqid = _norm(data.get("id"))
+        if not fqid:
+            return None
+        kind = "comment" if obj_type == "comment" else "entry"
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return sender, kind, _sha256(f"{kind}|{fqid}"), _sha256(canonical)
+
+    return None
+
+
+def lookup(key):
+    """The ledger row for `key` (even if its payload differs), or None."""
+    sender, _, object_key, _ = key
+    return ProcessedInboxObject.objects.filter(sender=sender, object_key=object_key).first()
+
+
+def is_replay(key, row) -> bool:
+    return row is not None and row.payload_digest == key[3]
+
+
+def record(key, row, status_code: int, response_data):
+    """Remember a successful outcome for `key`. `row` is what lookup() returned."""
+    sender, object_type, object_key, payload_digest = key
+    response_data = response_data if isinstance(response_data, dict) else {}
+
+    if row is not None:
+        row.payload_digest = payload_digest
+        row.status_code = status_code
+        row.response = response_data
+        row.save(update_fields=["payload_digest", "status_code", "response", "processed_at"])
+        return
+
+    try:
+        with transaction.atomic():
+            ProcessedInboxObject.objects.create(
+                sender=sender,
+                object_type=object_type,
+                object_key=object_key,
+                payload_digest=payload_digest,
+                status_code=status_code,
+                response=response_data,
+            )
+    except IntegrityError:
+        # A concurrent delivery of the same object recorded it first
+        pass
+
+
+def compact(older_than_seconds: int, batch_size: int = 1000) -> int:
+    """Delete ledger rows not touched for `older_than_seconds`; returns rows deleted."""
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    deleted = 0
+    while True:
+        ids = list(
+            ProcessedInboxObject.objects
+            .filter(processed_at__lt=cutoff)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += ProcessedInboxObject.objects.filter(pk__in=ids).delete()[0]
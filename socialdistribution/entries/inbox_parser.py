@@ -0,0 +1,329 @@
+"""
+Size-aware JSON parser for the inbox.
+
+Remote image entries carry the whole picture as base64 in `content`. Parsed
+naively, the body sits in memory as bytes, then as a str inside the parsed
+dict, then again in the Entry row. This parser bounds that:
+
+- Bodies over INBOX_MAX_BODY_SIZE bytes are refused with 413, by
+  Content-Length up front or by counting while reading chunked uploads.
+- Bodies of INBOX_STREAM_THRESHOLD bytes or more are spooled to a temporary
+  file instead of read into memory. The top-level `content` string is then
+  cut out of the JSON without loading it. For image entries its base64 is
+  decoded in chunks straight into default_storage under a content-addressed
+  name, and the parsed data carries that storage name in SPOOLED_CONTENT_KEY
+  in place of the content. Other content types are read back as text.
+
+JSON arrays (batch requests) and small bodies are parsed as usual. A body
+already spooled to check a request signature (spool_request_body) is parsed
+from that file rather than read again.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import mimetypes
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import JSONParser
+
+# Key under which a stored image's name is handed to InboxView._handle_entry.
+# Never accepted from the wire: the parser drops it from every request body.
+SPOOLED_CONTENT_KEY = "_spooledContent"
+
+CONTENT_UPLOAD_TO = "entry_content"
+
+CHUNK_SIZE = 64 * 1024
+
+_QUOTE, _BACKSLASH = ord('"'), ord("\\")
+_OPEN, _CLOSE = (ord("{"), ord("[")), (ord("}"), ord("]"))
+_COLON, _COMMA = ord(":"), ord(",")
+_STRUCTURAL = re.compile(rb'["{}\[\]:,]')
+# Below the top level only strings and nesting matter
+_NESTED = re.compile(rb'["{}\[\]]')
+# Runs of string bytes and complete escapes; stops at the closing quote,
+# the chunk end, or a backslash whose escaped byte is past the chunk end
+_STRING_BODY = re.compile(rb'[^"\\]*+(?:\\.[^"\\]*+)*+', re.DOTALL)
+
+
+class RequestTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Request body too large."
+    default_code = "request_too_large"
+
+
+def max_body_size() -> int:
+    return getattr(settings, "INBOX_MAX_BODY_SIZE", 20 * 1024 * 1024)
+
+
+def _spool(stream, limit: int, digest=None):
+    """
+    Copy the request stream into a temporary file, refusing more than `limit`
+    bytes. `digest`, a hashlib object, is updated with the bytes on the way.
+    """
+    threshold = getattr(settings, "INBOX_STREAM_THRESHOLD", 256 * 1024)
+    body = tempfile.SpooledTemporaryFile(max_size=threshold)
+    size = 0
+    while chunk := stream.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            body.close()
+            raise RequestTooLarge()
+        if digest is not None:
+            digest.update(chunk)
+        body.write(chunk)
+    body.seek(0)
+    return body
+
+
+def spool_request_body(django_request, digest=None):
+    """
+    Read the body of a Django request into a spooled file once, for callers
+    that need the raw bytes before parsing (signature digests). The file is
+    kept on the request, and InboxJSONParser parses it instead of reading
+    the body a second time.
+    """
+    body = _spool(django_request, max_body_size(), digest)
+    django_request.spooled_body = body
+    # Other parsers read the same file through HttpRequest.read()
+    django_request._stream = body
+    django_request._read_started = False
+    return body
+
+
+def _find_content_value(body):
+    """
+    Offset just past the opening quote of the top-level "content" string,
+    or None when the body is not an object or has no such string.
+
+    The scan jumps between structural bytes and across whole strings with
+    compiled regexes, so long values cost C speed rather than a Python step
+    per byte.
+    """
+    body.seek(0)
+    offset = 0
+    depth = 0
+    in_string = escape = collecting_key = False
+    key = bytearray()
+    last_key = None
+    last_token = None  # last ':' / ',' / '{' seen at depth 1
+
+    while chunk := body.read(CHUNK_SIZE):
+        index, end = 0, len(chunk)
+        while index < end:
+            if in_string:
+                if escape:
+                    escape = False
+                    if collecting_key:
+                        key.append(chunk[index])
+                    index += 1
+                    continue
+                stop = _STRING_BODY.match(chunk, index).end()
+                if collecting_key:
+                    key += chunk[index:stop]
+                index = stop + 1
+                if stop == end:
+                    break
+                if chunk[stop] == _BACKSLASH:
+                    # The escaped byte is in the next chunk
+                    escape = True
+                    if collecting_key:
+                        key.append(_BACKSLASH)
+                else:
+                    in_string = False
+                    if collecting_key:
+                        last_key, collecting_key = bytes(key), False
+                continue
+
+            match = (_STRUCTURAL if depth <= 1 else _NESTED).search(chunk, index)
+            if match is None:
+                break
+            position = match.start()
+            byte = chunk[position]
+            index = position + 1
+
+            if byte == _QUOTE:
+                if depth == 1 and last_token == _COLON and last_key == b"content":
+                    return offset + position + 1
+                in_string = True
+                if depth == 1 and last_token != _COLON:
+                    collecting_key = True
+                    key.clear()
+            elif byte in _OPEN:
+                if depth == 0 and byte != _OPEN[0]:
+                    return None
+                depth += 1
+                if depth == 1:
+                    last_token = byte
+            elif byte in _CLOSE:
+                depth -= 1
+                if depth <= 0:
+                    return None
+            elif depth == 1:
+                last_token = byte
+        offset += len(chunk)
+    return None
+
+
+def _copy_string(body, start: int, sink) -> int:
+    """Copy the raw (still escaped) JSON string starting at `start` into `sink`; return the closing quote's offset."""
+    body.seek(start)
+    offset = start
+    escape = False
+    while chunk := body.read(CHUNK_SIZE):
+        if not escape and _BACKSLASH not in chunk:
+            end = chunk.find(b'"')
+            if end != -1:
+                sink.write(chunk[:end])
+                return offset + end
+            sink.write(chunk)
+        else:
+            for index, byte in enumerate(chunk):
+                if escape:
+                    escape = False
+                elif byte == _BACKSLASH:
+                    escape = True
+                elif byte == _QUOTE:
+                    sink.write(chunk[:index])
+                    return offset + index
+            sink.write(chunk)
+        offset += len(chunk)
+    raise ParseError("JSON parse error - unterminated content string")
+
+
+def _decoded_chunks(raw):
+    """Decode base64 held as a raw JSON string in `raw`, one chunk at a time."""
+    raw.seek(0)
+    carry = b""
+    held = b""
+    first = True
+    while chunk := raw.read(CHUNK_SIZE):
+        chunk = held + chunk
+        held = b""
+        # Don't split an escape sequence across chunks
+        if chunk.endswith(b"\\"):
+            chunk, held = chunk[:-1], b"\\"
+        chunk = (
+            chunk.replace(b"\\/", b"/")
+            .replace(b"\\n", b"")
+            .replace(b"\\r", b"")
+            .translate(None, b" \t\r\n")
+        )
+        if first and chunk:
+            first = False
+            # "data:image/png;base64,...." as some nodes send it
+            if chunk.startswith(b"data:"):
+                _, _, chunk = chunk.partition(b",")
+        data = carry + chunk
+        cut = len(data) - len(data) % 4
+        carry = data[cut:]
+        if cut:
+            yield base64.b64decode(data[:cut], validate=True)
+    if held:
+        raise binascii.Error("dangling escape")
+    if carry:
+        yield base64.b64decode(carry + b"=" * (-len(carry) % 4), validate=True)
+
+
+def store_image(raw, content_type: str) -> str:
+    """Decode base64 from `raw` into default_storage; returns the stored name."""
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as decoded:
+        try:
+            for piece in _decoded_chunks(raw):
+                digest.update(piece)
+                decoded.write(piece)
+        except (binascii.Error, ValueError):
+            raise ParseError("Invalid base64 image content")
+
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ""
+        name = f"{CONTENT_UPLOAD_TO}/{digest.hexdigest()}{extension}"
+        # Content-addressed: a replay or a repeat image reuses the stored file
+        if not default_storage.exists(name):
+            decoded.seek(0)
+            name = default_storage.save(name, File(decoded))
+    return name
+
+
+def _parse_spooled(body):
+    value_start = _find_content_value(body)
+    if value_start is None:
+        body.seek(0)
+        if not body.read(1):
+            return {}
+        body.seek(0)
+        return _drop_reserved(json.load(body))
+
+    with tempfile.TemporaryFile() as raw:
+        value_end = _copy_string(body, value_start, raw)
+        body.seek(0)
+        head = body.read(value_start)
+        body.seek(value_end)
+        data = _drop_reserved(json.loads(head + body.read()))
+
+        content_type = str(data.get("contentType") or data.get("content_type") or "")
+        if content_type.lower().startswith("image/"):
+            data["content"] = ""
+            data[SPOOLED_CONTENT_KEY] = store_image(raw, content_type)
+        else:
+            raw.seek(0)
+            data["content"] = json.loads(b'"' + raw.read() + b'"')
+    return data
+
+
+def _drop_reserved(data):
+    if isinstance(data, dict):
+        data.pop(SPOOLED_CONTENT_KEY, None)
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                item.pop(SPOOLED_CONTENT_KEY, None)
+    return data
+
+
+class InboxJSONParser(JSONParser):
+    """JSONParser with a body size limit and streaming extraction of large `content`."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context.get("request")
+        limit = max_body_size()
+        threshold = getattr(settings, "INBOX_STREAM_THRESHOLD", 256 * 1024)
+
+        try:
+            declared = int(request.META.get("CONTENT_LENGTH") or 0) if request is not None else 0
+        except ValueError:
+            declared = 0
+        if declared > limit:
+            raise RequestTooLarge()
+
+        # Already read and size-checked while verifying a signature
+        spooled = getattr(request, "spooled_body", None) if request is not None else None
+        if spooled is not None:
+            spooled.seek(0)
+            try:
+                return _parse_spooled(spooled)
+            except (ValueError, UnicodeDecodeError) as exc:
+                raise ParseError(f"JSON parse error - {exc}")
+
+        if stream is None:
+            return {}
+
+        try:
+            if 0 < declared < threshold:
+                body = stream.read(limit + 1)
+                if len(body) > limit:
+                    raise RequestTooLarge()
+                return _drop_reserved(json.loads(body))
+
+            with _spool(stream, limit) as body:
+                return _parse_spooled(body)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
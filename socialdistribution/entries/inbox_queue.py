@@ -0,0 +1,95 @@
+"""
+Asynchronous inbox processing.
+
+With INBOX_ASYNC on, InboxView only validates the envelope and stores an
+InboxItem. The `process_inbox` management command claims items in batches
+and runs them through the same InboxView handlers, recording each item's
+outcome:
+
+- 2xx        -> DONE
+- 4xx        -> FAILED (the item itself is bad; retrying won't help)
+- 5xx/error  -> retried up to INBOX_MAX_ATTEMPTS times, then FAILED
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .api_views import InboxView
+from .models import InboxItem, InboxItemStatus
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def claim_inbox_items(batch_size: int = 50) -> list[InboxItem]:
+    """
+    Lock and lease up to `batch_size` due items, oldest first so an entry is
+    handled before comments or likes on it that arrived later.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=_setting("INBOX_LEASE_SECONDS", 120))
+
+    with transaction.atomic():
+        due = list(
+            InboxItem.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("recipient", "node")
+            .filter(
+                status__in=[InboxItemStatus.PENDING, InboxItemStatus.PROCESSING],
+                available_at__lte=now,
+            )
+            .order_by("received_at")[:batch_size]
+        )
+        InboxItem.objects.filter(pk__in=[item.pk for item in due]).update(
+            status=InboxItemStatus.PROCESSING,
+            available_at=lease_until,
+        )
+    return due
+
+
+def process_item(item: InboxItem, view: InboxView | None = None) -> InboxItem:
+    """Run one item through the inbox handlers in its own transaction."""
+    view = view or InboxView()
+    item.attempts += 1
+
+    with transaction.atomic():
+        response = view._dispatch(item.recipient, item.payload, item.node)
+        if response.status_code >= 500:
+            transaction.set_rollback(True)
+
+    item.result_status_code = response.status_code
+    item.result_detail = str((response.data or {}).get("detail", ""))[:1000]
+    item.processed_at = timezone.now()
+
+    if response.status_code < 400:
+        item.status = InboxItemStatus.DONE
+    elif response.status_code < 500 or item.attempts >= _setting("INBOX_MAX_ATTEMPTS", 5):
+        item.status = InboxItemStatus.FAILED
+    else:
+        item.status = InboxItemStatus.PENDING
+        item.available_at = timezone.now() + timedelta(
+            seconds=_setting("INBOX_RETRY_DELAY_SECONDS", 30) * item.attempts
+        )
+
+    item.save(update_fields=[
+        "status", "attempts", "result_status_code", "result_detail", "processed_at", "available_at",
+    ])
+    return item
+
+
+def process_inbox(batch_size: int = 50) -> dict:
+    """Claim and process one batch; returns done / retrying / failed counts."""
+    counts = {"done": 0, "retrying": 0, "failed": 0}
+    view = InboxView()
+    for item in claim_inbox_items(batch_size):
+        process_item(item, view)
+        if item.status == InboxItemStatus.DONE:
+            counts["done"] += 1
+        elif item.status == InboxItemStatus.FAILED:
+            counts["failed"] += 1
+        else:
+            counts["retrying"] += 1
+    return counts
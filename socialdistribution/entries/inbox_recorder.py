@@ -0,0 +1,154 @@
+"""
+Inbox traffic recorder for load testing.
+
+With INBOX_RECORD_PATH set, InboxRecorderMiddleware appends one NDJSON line
+per inbox POST:
+
+    {"ts": 1760000000.12, "recipient": "<uuid>", "node": "Team Blue",
+     "size": 1834, "status": 201, "duration_ms": 41.7,
+     "items": [{"type": "like", "author": "<fqid>", "target": "<url>"}],
+     "body": <sanitized payload>}
+
+The body keeps the structure and ids needed to replay the request, but
+free-text fields are replaced by {"$redacted": <length>} and profile fields
+are dropped. Credentials are never recorded. `python manage.py replay_inbox`
+expands the placeholders to filler of the same length and re-sends the
+recording.
+
+Without INBOX_RECORD_PATH the middleware removes itself at startup.
+"""
+import json
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.storage import default_storage
+
+from .inbox_parser import SPOOLED_CONTENT_KEY
+
+logger = logging.getLogger(__name__)
+
+INBOX_PATH = re.compile(r"^/api/authors/(?P<recipient>[0-9a-fA-F-]{36})/inbox/?$")
+
+REDACTED = "$redacted"
+REDACTED_FIELDS = {"content", "comment", "description", "title", "summary"}
+PROFILE_FIELDS = {"displayName", "display_name", "github", "profileImage", "profile_image"}
+
+_write_lock = threading.Lock()
+
+
+def _spooled_length(name: str) -> int:
+    """Length of the base64 the peer sent for an image the parser stored."""
+    try:
+        size = default_storage.size(name)
+    except (OSError, NotImplementedError):
+        return 0
+    return 4 * -(-size // 3)
+
+
+def sanitize(value):
+    """Copy of an inbox payload with free text replaced by its length and profiles stripped."""
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    clean = {}
+    for key, item in value.items():
+        if key in PROFILE_FIELDS or key == SPOOLED_CONTENT_KEY:
+            continue
+        if key in REDACTED_FIELDS and isinstance(item, str):
+            length = len(item)
+            if key == "content" and not item and value.get(SPOOLED_CONTENT_KEY):
+                length = _spooled_length(value[SPOOLED_CONTENT_KEY])
+            clean[key] = {REDACTED: length}
+        else:
+            clean[key] = sanitize(item)
+    return clean
+
+
+def restore(value, filler: str = "A"):
+    """Inverse of sanitize(): placeholders become filler text of the recorded length."""
+    if isinstance(value, list):
+        return [restore(item, filler) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if set(value) == {REDACTED}:
+        return filler * int(value[REDACTED])
+    return {key: restore(item, filler) for key, item in value.items()}
+
+
+def describe(payload) -> list[dict]:
+    """(type, author, target) for each inbox object in a payload."""
+    items = payload if isinstance(payload, list) else [payload]
+    described = []
+    for data in items:
+        if not isinstance(data, dict):
+            described.append({"type": "invalid", "author": None, "target": None})
+            continue
+        object_type = (data.get("type") or "").lower()
+        sender = data.get("actor" if object_type == "follow" else "author")
+        if object_type in ("entry", "post"):
+            target = data.get("id")
+        elif object_type == "comment":
+            target = data.get("entry")
+        else:
+            target = data.get("object")
+        if isinstance(target, dict):
+            target = target.get("id")
+        described.append({
+            "type": object_type or "unknown",
+            "author": sender.get("id") if isinstance(sender, dict) else None,
+            "target": target,
+        })
+    return described
+
+
+def write_record(path: str, record: dict):
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        with open(path, "a", encoding="utf-8") as recording:
+            recording.write(line)
+
+
+class InboxRecorderMiddleware:
+    def __init__(self, get_response):
+        self.path = getattr(settings, "INBOX_RECORD_PATH", "")
+        if not self.path:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        match = INBOX_PATH.match(request.path_info) if request.method == "POST" else None
+        if match is None:
+            return self.get_response(request)
+
+        started = time.time()
+        response = self.get_response(request)
+        elapsed = time.time() - started
+
+        # Set by InboxView once the body has been parsed
+        payload = getattr(request, "inbox_payload", None)
+        node = getattr(getattr(request, "inbox_node", None), "name", None)
+        try:
+            size = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            size = 0
+
+        try:
+            write_record(self.path, {
+                "ts": round(started, 3),
+                "recipient": match.group("recipient"),
+                "node": node,
+                "size": size,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 1),
+                "items": describe(payload) if payload is not None else [],
+                "body": sanitize(payload),
+            })
+        except OSError:
+            logger.exception("Could not write inbox recording to %s", self.path)
+        return response
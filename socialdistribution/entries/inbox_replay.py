@@ -0,0 +1,215 @@
+"""
+Re-drive an inbox recording (see entries/inbox_recorder.py) for load testing.
+
+Records are sent in recorded order, at up to `rate` requests per second over
+`concurrency` threads, either over HTTP to a running instance or in process
+through the Django test client. The in-process client runs against the
+configured database and also counts the queries each request made.
+
+The report groups requests by inbox object type ("batch" for arrays) with
+count, latency percentiles, status codes and mean query count, plus overall
+throughput.
+
+Replayed requests go through the same checks as live ones. Objects the
+idempotency ledger has already seen are answered from it without running
+the handlers, and the node's token bucket applies. For an in-process replay
+of traffic that was already applied, wrap it in bypass_guards() so every
+record reaches the handlers.
+"""
+import base64
+import json
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .inbox_recorder import restore
+from .telemetry import LatencyHistogram
+
+
+@dataclass
+class ReplayResult:
+    object_type: str
+    status_code: int | None
+    elapsed: float
+    queries: int | None = None
+    error: str = ""
+
+
+def load_recording(path: str, limit: int | None = None) -> list[dict]:
+    records = []
+    with open(path, encoding="utf-8") as recording:
+        for line in recording:
+            line = line.strip()
+            if not line:
+                continue
+            records.append(json.loads(line))
+            if limit and len(records) >= limit:
+                break
+    return records
+
+
+def record_type(record: dict) -> str:
+    items = record.get("items") or []
+    if isinstance(record.get("body"), list):
+        return "batch"
+    return items[0]["type"] if items else "unknown"
+
+
+def bypass_guards():
+    """
+    Settings that turn off the idempotency ledger and node throttle for the
+    current process only, so an in-process replay is neither deduplicated
+    nor rate limited. Never affects a running instance.
+    """
+    return override_settings(INBOX_LEDGER_ENABLED=False, NODE_THROTTLE_ENABLED=False)
+
+
+def default_host() -> str:
+    """A Host header ALLOWED_HOSTS accepts, for requests made in process."""
+    for host in settings.ALLOWED_HOSTS:
+        if host and host != "*":
+            return host.lstrip(".")
+    return "testserver"
+
+
+def _basic_auth(username: str, password: str) -> str:
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+class HttpSender:
+    """POST records to a running instance; one keep-alive session per thread."""
+
+    def __init__(self, base_url: str, username: str, password: str, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.auth = (username, password)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def __call__(self, recipient: str, body) -> tuple[int, int | None]:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.post(
+            f"{self.base_url}/api/authors/{recipient}/inbox/",
+            json=body,
+            auth=self.auth,
+            timeout=self.timeout,
+        )
+        return response.status_code, None
+
+
+class ClientSender:
+    """POST records through the Django test client and count their queries."""
+
+    def __init__(self, username: str, password: str, host: str | None = None):
+        self.authorization = _basic_auth(username, password)
+        self.host = host or default_host()
+        self._local = threading.local()
+
+    def __call__(self, recipient: str, body) -> tuple[int, int | None]:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = Client(HTTP_HOST=self.host)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(
+                f"/api/authors/{recipient}/inbox/",
+                json.dumps(body),
+                content_type="application/json",
+                HTTP_AUTHORIZATION=self.authorization,
+            )
+        return response.status_code, len(queries.captured_queries)
+
+
+def replay(records: list[dict], send, rate: float = 0.0, concurrency: int = 1, recipient: str | None = None) -> dict:
+    """
+    Send every record through `send(recipient, body)` and summarize.
+    `rate` 0 means as fast as the workers go; `recipient` redirects every
+    record to one local author. With concurrency 1 everything runs on the
+    calling thread.
+    """
+    results: list[ReplayResult] = []
+    lock = threading.Lock()
+    pending = iter(enumerate(records))
+    started = time.monotonic()
+
+    def send_one(index: int, record: dict):
+        if rate > 0:
+            delay = started + index / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        object_type = record_type(record)
+        body = restore(record.get("body"))
+        sent_at = time.monotonic()
+        try:
+            status_code, queries = send(recipient or record["recipient"], body)
+            result = ReplayResult(object_type, status_code, time.monotonic() - sent_at, queries)
+        except Exception as exc:
+            result = ReplayResult(object_type, None, time.monotonic() - sent_at, error=type(exc).__name__)
+        with lock:
+            results.append(result)
+
+    def worker():
+        try:
+            while True:
+                with lock:
+                    item = next(pending, None)
+                if item is None:
+                    return
+                send_one(*item)
+        finally:
+            # Each worker thread has its own database connection
+            connection.close()
+
+    if concurrency <= 1:
+        for index, record in pending:
+            send_one(index, record)
+    else:
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return summarize(results, time.monotonic() - started)
+
+
+def summarize(results: list[ReplayResult], elapsed: float) -> dict:
+    by_type: dict = {}
+    for result in results:
+        stats = by_type.setdefault(result.object_type, {
+            "histogram": LatencyHistogram(),
+            "statuses": {},
+            "errors": {},
+            "queries": [],
+        })
+        stats["histogram"].observe(result.elapsed * 1000)
+        if result.status_code is not None:
+            key = str(result.status_code)
+            stats["statuses"][key] = stats["statuses"].get(key, 0) + 1
+        if result.error:
+            stats["errors"][result.error] = stats["errors"].get(result.error, 0) + 1
+        if result.queries is not None:
+            stats["queries"].append(result.queries)
+
+    types = {}
+    for object_type, stats in sorted(by_type.items()):
+        queries = stats["queries"]
+        types[object_type] = {
+            **stats["histogram"].snapshot(),
+            "statuses": stats["statuses"],
+            "errors": stats["errors"],
+            "mean_queries": round(sum(queries) / len(queries), 1) if queries else None,
+        }
+
+    return {
+        "requests": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+        "types": types,
+    }
@@ -0,0 +1,31 @@
+# entries/management/commands/compact_inbox_ledger.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from entries.inbox_ledger import compact
+
+
+class Command(BaseCommand):
+    '''Expire old rows from the inbox idempotency ledger'''
+    help = 'Delete ProcessedInboxObject rows older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=None,
+            help='Age in seconds (default INBOX_LEDGER_RETENTION_SECONDS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows deleted per query',
+        )
+
+    def handle(self, *args, **options):
+        older_than = options['older_than']
+        if older_than is None:
+            older_than = getattr(settings, 'INBOX_LEDGER_RETENTION_SECONDS', 7 * 24 * 3600)
+
+        deleted = compact(older_than, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} inbox ledger rows'))
@@ -0,0 +1,89 @@
+# entries/management/commands/deliver_outbox.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from entries.federation_client import pool_stats
+from entries.outbox import outcome_counts, process_outbox, purge_finished
+
+
+class Command(BaseCommand):
+    '''Worker that drains queued federation deliveries to remote inboxes'''
+    help = 'Send queued OutboxDelivery rows to remote inboxes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the currently due deliveries and exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of deliveries claimed per batch',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep when the queue is empty',
+        )
+        parser.add_argument(
+            '--no-purge',
+            action='store_true',
+            help='Do not delete old delivered/superseded rows and unused payloads',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        purge_interval = getattr(settings, 'OUTBOX_PURGE_INTERVAL_SECONDS', 3600)
+        last_purge = None
+
+        while True:
+            summary = process_outbox(batch_size=batch_size)
+            counts = outcome_counts(summary)
+            processed = len(summary) + len(summary.deferred)
+
+            if processed:
+                self.stdout.write(
+                    f"delivered={counts['delivered']} "
+                    f"retrying={counts['retrying']} "
+                    f"failed={counts['failed']} "
+                    f"deferred={counts['deferred']}"
+                )
+                if options['verbosity'] >= 2:
+                    for result in summary.failed:
+                        self.stdout.write(f"  ✗ {result.url}: {result.error}")
+
+            if options['once']:
+                # Keep going until nothing due is left in the queue
+                if processed:
+                    continue
+                self._purge(options)
+                break
+
+            if not processed:
+                # Retention runs while idle so it never delays a backlog
+                if last_purge is None or time.monotonic() - last_purge >= purge_interval:
+                    self._purge(options)
+                    last_purge = time.monotonic()
+                time.sleep(options['interval'])
+
+        if options['verbosity'] >= 2:
+            for stats in pool_stats():
+                self.stdout.write(
+                    f"  {stats['node']}: requests={stats['requests']} "
+                    f"errors={stats['errors']} "
+                    f"connections_opened={stats['connections_opened']} "
+                    f"reuse={stats['connection_reuse']}"
+                )
+        self.stdout.write(self.style.SUCCESS('Outbox drained'))
+
+    def _purge(self, options):
+        if options['no_purge']:
+            return
+        retention = getattr(settings, 'OUTBOX_RETENTION_SECONDS', 7 * 24 * 3600)
+        deliveries, payloads = purge_finished(retention)
+        if deliveries or payloads:
+            self.stdout.write(f"purged deliveries={deliveries} payloads={payloads}")
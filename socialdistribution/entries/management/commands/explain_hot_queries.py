@@ -0,0 +1,96 @@
+# entries/management/commands/explain_hot_queries.py
+import uuid
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from authors import feed
+from authors.models import Author, FollowRequest, FollowRequestStatus
+from entries.models import Comment, Entry
+
+# Plan fragments that mean a whole table is read
+FULL_SCAN_MARKERS = {
+    'sqlite': ('SCAN ',),
+    'postgresql': ('Seq Scan',),
+    'mysql': ('type: ALL',),
+}
+
+
+class Command(BaseCommand):
+    '''Print EXPLAIN plans for the stream branches, public list, follower and comment queries'''
+    help = 'Show the database plans for the hot read paths and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--author',
+            default=None,
+            help='Username or id of the author to explain the queries for (default: any author)',
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=10,
+            help='Rows per page for the list queries',
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error if any plan reads a whole table',
+        )
+
+    def handle(self, *args, **options):
+        author = self._author(options['author'])
+        size = options['page_size']
+        author_id = author.pk if author else uuid.uuid4()
+        entry_id = (
+            Entry.objects.filter(author_id=author_id).values_list('id', flat=True).first()
+            or uuid.uuid4()
+        )
+
+        # The stream runs one keyset query per branch (authors/feed.py)
+        viewer = author or Author(pk=author_id)
+        queries = {
+            f'stream: {branch}': queryset
+            for branch, queryset in feed.branch_queries(viewer, size=size).items()
+        }
+        queries.update({
+            'public list': Entry.objects.visible_to(AnonymousUser(), listed=True).order_by('-published')[:size],
+            'profile': Entry.objects.visible_to(AnonymousUser(), listed=True).filter(author_id=author_id).order_by('-published')[:size],
+            'followers': FollowRequest.objects.filter(followee_id=author_id, status=FollowRequestStatus.APPROVED),
+            'following': FollowRequest.objects.filter(follower_id=author_id, status=FollowRequestStatus.APPROVED),
+            'comments': Comment.objects.filter(entry_id=entry_id).order_by('created_at'),
+        })
+
+        markers = FULL_SCAN_MARKERS.get(connection.vendor, ())
+        scans = []
+        self.stdout.write(f"Backend: {connection.vendor}; author: {author or 'none (placeholder id)'}")
+        for name, queryset in queries.items():
+            plan = queryset.explain()
+            self.stdout.write(f"\n== {name} ==")
+            for line in plan.splitlines():
+                # A SQLite "SCAN t USING INDEX" walks an index, not the table
+                full_scan = any(marker in line for marker in markers) and 'USING' not in line
+                if full_scan:
+                    scans.append(name)
+                self.stdout.write(f"{'!! ' if full_scan else '   '}{line}")
+
+        if scans:
+            message = f"Full table scans in: {', '.join(sorted(set(scans)))}"
+            if options['strict']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(f"\n{message}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('\nNo full table scans'))
+
+    def _author(self, identifier):
+        if identifier is None:
+            return Author.objects.order_by('date_joined').first()
+        try:
+            return Author.objects.get(pk=uuid.UUID(identifier))
+        except (ValueError, Author.DoesNotExist):
+            pass
+        try:
+            return Author.objects.get(username=identifier)
+        except Author.DoesNotExist:
+            raise CommandError(f"No author {identifier!r}")
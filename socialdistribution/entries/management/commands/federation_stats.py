@@ -0,0 +1,64 @@
+# entries/management/commands/federation_stats.py
+import json
+
+from django.core.management.base import BaseCommand
+from entries.telemetry import federation_stats
+
+
+class Command(BaseCommand):
+    '''Report delivery latency, success ratio, backlog and throttle levels per remote node'''
+    help = 'Show federation latency percentiles, success ratio and backlog per RemoteNode'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=None,
+            help='Look back this many seconds (default FEDERATION_STATS_WINDOW_SECONDS)',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the raw report as JSON',
+        )
+
+    def handle(self, *args, **options):
+        report = federation_stats(options['window'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        if not report:
+            self.stdout.write('No remote nodes configured')
+            return
+
+        for node in report:
+            deliveries = node['deliveries']
+            ratio = deliveries['success_ratio']
+            self.stdout.write(
+                f"{node['node']} [{node['circuit_state']}] "
+                f"backlog={node['backlog']} "
+                f"attempted={deliveries['attempted']} "
+                f"success={'-' if ratio is None else f'{ratio:.1%}'} "
+                f"p50={self._ms(deliveries['p50_ms'])} "
+                f"p95={self._ms(deliveries['p95_ms'])} "
+                f"p99={self._ms(deliveries['p99_ms'])}"
+            )
+            for object_type, stats in sorted(node['requests'].items()):
+                self.stdout.write(
+                    f"  {object_type}: count={stats['count']} "
+                    f"p50={self._ms(stats['p50_ms'])} "
+                    f"p95={self._ms(stats['p95_ms'])} "
+                    f"p99={self._ms(stats['p99_ms'])} "
+                    f"statuses={stats['statuses']} errors={stats['errors']}"
+                )
+            for scope, bucket in sorted(node['throttle'].items()):
+                self.stdout.write(
+                    f"  throttle {scope}: tokens={bucket['tokens']:g}/{bucket['burst']} "
+                    f"rate={bucket['rate_per_minute']}/min"
+                )
+
+    @staticmethod
+    def _ms(value):
+        return '-' if value is None else f"{value:.0f}ms"
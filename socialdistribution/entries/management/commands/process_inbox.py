@@ -0,0 +1,51 @@
+# entries/management/commands/process_inbox.py
+import time
+
+from django.core.management.base import BaseCommand
+from entries.inbox_queue import process_inbox
+
+
+class Command(BaseCommand):
+    '''Worker that applies inbox items accepted while INBOX_ASYNC is on'''
+    help = 'Process queued InboxItem rows with the inbox handlers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the currently due items and exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Number of items claimed per batch',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the queue is empty',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            counts = process_inbox(batch_size=options['batch_size'])
+            processed = sum(counts.values())
+
+            if processed:
+                self.stdout.write(
+                    f"done={counts['done']} "
+                    f"retrying={counts['retrying']} "
+                    f"failed={counts['failed']}"
+                )
+
+            if options['once']:
+                if processed:
+                    continue
+                break
+
+            if not processed:
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Inbox drained'))
@@ -0,0 +1,108 @@
+# entries/management/commands/replay_inbox.py
+import json
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from entries.inbox_replay import ClientSender, HttpSender, bypass_guards, load_recording, replay
+from entries.models import RemoteNode
+
+
+class Command(BaseCommand):
+    '''Load-test the inbox by re-sending an INBOX_RECORD_PATH recording'''
+    help = (
+        'Replay an NDJSON inbox recording against a running instance (--target) '
+        'or in process through the Django test client, which writes to the '
+        'configured database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('recording', help='NDJSON file written by InboxRecorderMiddleware')
+        parser.add_argument(
+            '--target',
+            default='',
+            help='Base URL of a running instance, e.g. http://localhost:8000 (default: in-process test client)',
+        )
+        parser.add_argument('--node', default='', help='Authenticate with this RemoteNode\'s credentials')
+        parser.add_argument('--username', default='', help='Basic auth username (instead of --node)')
+        parser.add_argument('--password', default='', help='Basic auth password (instead of --node)')
+        parser.add_argument(
+            '--recipient',
+            default='',
+            help='Send every request to this local author id instead of the recorded one',
+        )
+        parser.add_argument('--rate', type=float, default=0.0, help='Requests per second (default: unthrottled)')
+        parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight at once')
+        parser.add_argument('--limit', type=int, default=None, help='Replay at most this many records')
+        parser.add_argument(
+            '--fresh',
+            action='store_true',
+            help=(
+                'In process only: skip the idempotency ledger and node throttle so records '
+                'that were already applied run the handlers again (by default they are deduplicated)'
+            ),
+        )
+        parser.add_argument(
+            '--host',
+            default='',
+            help='Host header for in-process requests (default: the first entry of ALLOWED_HOSTS)',
+        )
+        parser.add_argument('--json', action='store_true', help='Print the raw report as JSON')
+
+    def handle(self, *args, **options):
+        username, password = options['username'], options['password']
+        if options['node']:
+            try:
+                node = RemoteNode.objects.get(name=options['node'])
+            except RemoteNode.DoesNotExist:
+                raise CommandError(f"No RemoteNode named {options['node']!r}")
+            username, password = node.username, node.password
+        if not username:
+            raise CommandError('Pass --node or --username/--password to authenticate the replayed requests')
+
+        try:
+            records = load_recording(options['recording'], options['limit'])
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read recording: {exc}")
+        if not records:
+            self.stdout.write('Recording is empty')
+            return
+
+        if options['target']:
+            if options['fresh'] or options['host']:
+                raise CommandError('--fresh and --host only apply to in-process replays')
+            send = HttpSender(options['target'], username, password)
+        else:
+            send = ClientSender(username, password, host=options['host'] or None)
+
+        with bypass_guards() if options['fresh'] else nullcontext():
+            report = replay(
+                records,
+                send,
+                rate=options['rate'],
+                concurrency=options['concurrency'],
+                recipient=options['recipient'] or None,
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"requests={report['requests']} "
+            f"elapsed={report['elapsed_seconds']}s "
+            f"throughput={report['throughput_rps']}/s"
+        )
+        for object_type, stats in report['types'].items():
+            queries = stats['mean_queries']
+            self.stdout.write(
+                f"  {object_type}: count={stats['count']} "
+                f"p50={self._ms(stats['p50_ms'])} "
+                f"p95={self._ms(stats['p95_ms'])} "
+                f"p99={self._ms(stats['p99_ms'])} "
+                f"queries={'-' if queries is None else queries} "
+                f"statuses={stats['statuses']} errors={stats['errors']}"
+            )
+
+    @staticmethod
+    def _ms(value):
+        return '-' if value is None else f"{value:.0f}ms"
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:12
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0016_outboxdelivery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxPayload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('object_type', models.CharField(max_length=20)),
+                ('body', models.BinaryField(help_text='UTF-8 encoded JSON sent as the request body')),
+                ('digest', models.CharField(help_text='sha256 of body', max_length=64, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Outbox Payload',
+                'verbose_name_plural': 'Outbox Payloads',
+            },
+        ),
+        migrations.RenameField(
+            model_name='outboxdelivery',
+            old_name='payload',
+            new_name='legacy_payload',
+        ),
+        migrations.AddField(
+            model_name='outboxdelivery',
+            name='payload',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='deliveries', to='entries.outboxpayload'),
+        ),
+    ]
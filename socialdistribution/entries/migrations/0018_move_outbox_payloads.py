@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:12
+
+import hashlib
+import json
+
+from django.db import migrations
+
+
+def move_payloads(apps, schema_editor):
+    OutboxDelivery = apps.get_model('entries', 'OutboxDelivery')
+    OutboxPayload = apps.get_model('entries', 'OutboxPayload')
+
+    for delivery in OutboxDelivery.objects.all().iterator():
+        body = json.dumps(delivery.legacy_payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        payload, _ = OutboxPayload.objects.get_or_create(
+            digest=hashlib.sha256(body).hexdigest(),
+            defaults={'object_type': delivery.object_type, 'body': body},
+        )
+        delivery.payload = payload
+        delivery.save(update_fields=['payload'])
+
+
+class Migration(migrations.Migration):
+    # Data only: PostgreSQL refuses ALTER TABLE while the FK updates made
+    # here still have pending trigger events in the same transaction
+
+    dependencies = [
+        ('entries', '0017_outboxpayload'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_payloads, migrations.RunPython.noop),
+    ]
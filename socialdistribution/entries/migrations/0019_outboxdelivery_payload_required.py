@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0018_move_outbox_payloads'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='outboxdelivery',
+            name='legacy_payload',
+        ),
+        migrations.AlterField(
+            model_name='outboxdelivery',
+            name='payload',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='deliveries', to='entries.outboxpayload'),
+        ),
+    ]
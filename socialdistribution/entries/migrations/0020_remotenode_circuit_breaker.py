@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0019_outboxdelivery_payload_required'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotenode',
+            name='avg_latency_ms',
+            field=models.FloatField(blank=True, help_text='Moving average of request latency', null=True),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='circuit_opened_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='circuit_state',
+            field=models.CharField(choices=[('CLOSED', 'Closed'), ('OPEN', 'Open'), ('HALF_OPEN', 'Half-open')], default='CLOSED', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='consecutive_failures',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
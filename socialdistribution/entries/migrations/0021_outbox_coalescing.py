@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0020_remotenode_circuit_breaker'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxdelivery',
+            name='coalesce_key',
+            field=models.CharField(blank=True, default='', help_text='Pending deliveries with the same key and inbox are replaced by newer ones', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='outboxdelivery',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('SENDING', 'Sending'), ('DELIVERED', 'Delivered'), ('FAILED', 'Failed'), ('SUPERSEDED', 'Superseded')], default='PENDING', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='outboxdelivery',
+            index=models.Index(fields=['coalesce_key', 'status'], name='outbox_coalesce_idx'),
+        ),
+    ]
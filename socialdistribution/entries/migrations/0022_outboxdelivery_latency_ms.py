@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0021_outbox_coalescing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxdelivery',
+            name='latency_ms',
+            field=models.FloatField(blank=True, help_text='Duration of the last attempt', null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:44
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0022_outboxdelivery_latency_ms'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('object_type', models.CharField(max_length=20)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('result_status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('result_detail', models.TextField(blank=True, default='')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('node', models.ForeignKey(blank=True, help_text='Sending node, empty for the shared node credentials', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='inbox_items', to='entries.remotenode')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_items', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Inbox Item',
+                'verbose_name_plural': 'Inbox Items',
+                'ordering': ['received_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='inbox_status_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:51
+
+import hashlib
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_content_hash(apps, schema_editor):
+    # Same formula as Comment.compute_content_hash (historical models lack it)
+    Comment = apps.get_model('entries', 'Comment')
+    batch = []
+    for comment in Comment.objects.only('id', 'content', 'content_type').iterator(chunk_size=500):
+        comment.content_hash = hashlib.sha256(
+            f"{comment.content_type or ''}\n{comment.content or ''}".encode('utf-8')
+        ).hexdigest()
+        batch.append(comment)
+        if len(batch) >= 500:
+            Comment.objects.bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0023_inboxitem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['entry', 'author', 'content_hash'], name='comment_dedup_idx'),
+        ),
+    ]
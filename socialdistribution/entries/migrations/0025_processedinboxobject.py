@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:54
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0024_comment_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessedInboxObject',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('sender', models.CharField(help_text="RemoteNode pk, or 'shared' for the node-wide credentials", max_length=64)),
+                ('object_key', models.CharField(help_text="sha256 of the object's identity", max_length=64)),
+                ('payload_digest', models.CharField(blank=True, default='', help_text='sha256 of the last payload applied; empty when any replay matches (likes)', max_length=64)),
+                ('object_type', models.CharField(max_length=20)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('response', models.JSONField(default=dict)),
+                ('processed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Processed Inbox Object',
+                'verbose_name_plural': 'Processed Inbox Objects',
+                'indexes': [models.Index(fields=['processed_at'], name='inbox_ledger_processed_idx')],
+                'constraints': [models.UniqueConstraint(fields=('sender', 'object_key'), name='inbox_ledger_unique_object')],
+            },
+        ),
+    ]
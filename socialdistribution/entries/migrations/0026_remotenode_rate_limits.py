@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0025_processedinboxobject'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotenode',
+            name='inbox_burst',
+            field=models.PositiveIntegerField(blank=True, help_text='Inbox requests allowed back to back', null=True),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='inbox_rate_per_minute',
+            field=models.PositiveIntegerField(blank=True, help_text='Inbox requests refilled per minute', null=True),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='read_burst',
+            field=models.PositiveIntegerField(blank=True, help_text='Other API requests allowed back to back', null=True),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='read_rate_per_minute',
+            field=models.PositiveIntegerField(blank=True, help_text='Other API requests refilled per minute', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0026_remotenode_rate_limits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='content_file',
+            field=models.FileField(blank=True, default='', upload_to='entry_content/'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:13
+
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_password_hash(apps, schema_editor):
+    # Same formula as RemoteNode.hash_secret (historical models lack it)
+    RemoteNode = apps.get_model('entries', 'RemoteNode')
+    key = settings.SECRET_KEY.encode('utf-8')
+    for node in RemoteNode.objects.exclude(password=''):
+        RemoteNode.objects.filter(pk=node.pk).update(
+            password_hash=hmac.new(key, node.password.encode('utf-8'), hashlib.sha256).hexdigest(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0027_entry_content_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotenode',
+            name='password_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='remotenode',
+            name='username',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Username they gave us', max_length=100),
+        ),
+        migrations.RunPython(backfill_password_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0028_remotenode_password_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotenode',
+            name='signing_key_id',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='keyId in the Signature header', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='remotenode',
+            name='signing_secret',
+            field=models.CharField(blank=True, default='', help_text='Secret shared with this node for request signatures', max_length=200),
+        ),
+    ]
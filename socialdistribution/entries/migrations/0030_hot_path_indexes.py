@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0029_remotenode_signing_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['entry', 'created_at'], name='comment_entry_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['visibility', '-published'], name='entry_vis_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['author', 'visibility', '-published'], name='entry_author_vis_pub_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(condition=models.Q(('visibility', 'DELTED'), _negated=True), fields=['-published'], name='entry_live_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(condition=models.Q(('visibility', 'DELTED'), _negated=True), fields=['author', '-published'], name='entry_author_live_pub_idx'),
+        ),
+    ]
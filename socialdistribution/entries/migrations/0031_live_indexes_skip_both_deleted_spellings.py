@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0030_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='entry',
+            name='entry_live_published_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='entry',
+            name='entry_author_live_pub_idx',
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(condition=models.Q(('visibility__in', ['DELTED', 'DELETED']), _negated=True), fields=['-published'], name='entry_live_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(condition=models.Q(('visibility__in', ['DELTED', 'DELETED']), _negated=True), fields=['author', '-published'], name='entry_author_live_pub_idx'),
+        ),
+    ]
@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from authors.models import Author, FollowRequest, FollowRequestStatus
+from authors.models import Author, FollowRequest, FollowRequestStatus, Friendship
+import base64
+import hashlib
+import hmac
 import uuid
 
 User = get_user_model()
@@ -12,6 +17,44 @@ class Visibility(models.TextChoices):
     DELETED = "DELTED", "Deleted"
     UNLISTED = "UNLISTED", "Unlisted"
 
+class EntryQuerySet(models.QuerySet):
+    def visible_to(self, viewer, listed=False):
+        """
+        Entries `viewer` may see, as a single filter: the queryset form of
+        Entry.can_view, with the follow and friendship checks as correlated
+        EXISTS subqueries.
+
+        UNLISTED entries are visible to anyone with the link; with
+        `listed=True` (feeds, profile pages, list endpoints) they only show
+        up for the author and approved followers. Anonymous users and
+        remote nodes (NodeUser) are not authors, so they only get PUBLIC
+        (and by-link UNLISTED) entries.
+        """
+        visible = models.Q(visibility=Visibility.PUBLIC)
+        if not listed:
+            visible |= models.Q(visibility=Visibility.UNLISTED)
+
+        if isinstance(viewer, Author) and viewer.is_authenticated:
+            is_friend = models.Exists(
+                Friendship.objects.filter(author_low=models.OuterRef("author"), author_high=viewer)
+            ) | models.Exists(
+                Friendship.objects.filter(author_low=viewer, author_high=models.OuterRef("author"))
+            )
+            visible |= models.Q(author=viewer, visibility__in=[Visibility.UNLISTED, Visibility.FRIENDS])
+            visible |= models.Q(visibility=Visibility.FRIENDS) & is_friend
+            if listed:
+                follows = models.Exists(
+                    FollowRequest.objects.filter(
+                        follower=viewer,
+                        followee=models.OuterRef("author"),
+                        status=FollowRequestStatus.APPROVED,
+                    )
+                )
+                visible |= models.Q(visibility=Visibility.UNLISTED) & follows
+
+        return self.filter(visible)
+
+
 class Entry(models.Model):
     """Model for blog entries/posts"""
     
@@ -36,12 +79,17 @@ class Entry(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, help_text="Brief description of the entry")
     content = models.TextField(help_text="Main content of the entry")
+    # Decoded image bytes for large remote image entries (entries/inbox_parser.py);
+    # `content` is left empty when this is set
+    content_file = models.FileField(upload_to="entry_content/", blank=True, default="")
     content_type = models.CharField(
         max_length=50, 
         choices=CONTENT_TYPE_CHOICES, 
         default='text/plain'
     )
     liked_by = models.ManyToManyField(User, related_name='liked_entries', blank=True)
+
+    objects = EntryQuerySet.as_manager()
     
     @property
     def likes_count(self):
@@ -64,11 +112,22 @@ class Entry(models.Model):
     unique=True,
 )
 
+    def image_bytes(self) -> bytes:
+        """Decoded image data, from content_file or the base64 in content."""
+        if self.content_file:
+            with self.content_file.open("rb") as image:
+                return image.read()
+        raw_content = self.content or ""
+        # Some implementations may store "data:<ct>;base64,<data>"
+        if raw_content.startswith("data:"):
+            raw_content = raw_content.split(",", 1)[-1]
+        return base64.b64decode(raw_content, validate=True)
+
     def can_view(self, user) -> bool:
         """
         Returns True if the given user can view this entry.
         Anyone can view public, no one can view deleted, friends only means both follow eachother
-        TODO: Utilize more in next iteration
+        For lists of entries use Entry.objects.visible_to(user) instead.
         """
         if self.visibility == Visibility.PUBLIC:
             return True
@@ -80,7 +139,8 @@ class Entry(models.Model):
         if self.visibility == Visibility.UNLISTED:
             return True
         
-        if not user or not user.is_authenticated:
+        # Remote nodes (NodeUser) are not authors and have no friends
+        if not user or not user.is_authenticated or not isinstance(user, Author):
             return False
 
         if user == self.author:
@@ -88,17 +148,7 @@ class Entry(models.Model):
 
         # Mutual following for FRIENDS
         if self.visibility == Visibility.FRIENDS:
-            viewer_follows_author = FollowRequest.objects.filter(
-                follower=user,
-                followee=self.author,
-                status=FollowRequestStatus.APPROVED
-            ).exists()
-            author_follows_viewer = FollowRequest.objects.filter(
-                follower=self.author,
-                followee=user,
-                status=FollowRequestStatus.APPROVED
-            ).exists()
-            return viewer_follows_author and author_follows_viewer
+            return Friendship.are_friends(user, self.author_id)
 
         # Followers-only for UNLISTED
         if self.visibility == Visibility.UNLISTED:
@@ -118,6 +168,23 @@ class Entry(models.Model):
     class Meta:
         ordering = ['-published']  # Most recent first
         verbose_name_plural = 'Entries'
+        indexes = [
+            # Public list / stream and profile pages, newest first
+            models.Index(fields=['visibility', '-published'], name='entry_vis_published_idx'),
+            models.Index(fields=['author', 'visibility', '-published'], name='entry_author_vis_pub_idx'),
+            # Partial indexes without DELETED rows; only built where the
+            # backend supports conditions (PostgreSQL, SQLite)
+            models.Index(
+                fields=['-published'],
+                name='entry_live_published_idx',
+                condition=~models.Q(visibility__in=[Visibility.DELETED, "DELETED"]),
+            ),
+            models.Index(
+                fields=['author', '-published'],
+                name='entry_author_live_pub_idx',
+                condition=~models.Q(visibility__in=[Visibility.DELETED, "DELETED"]),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.author.display_name}"
@@ -144,6 +211,10 @@ class Comment(models.Model):
     default="text/plain",
     )
 
+    # sha256 of content_type + content, kept in sync by save(); lets the inbox
+    # de-duplicate with an index probe instead of comparing full text
+    content_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     liked_by = models.ManyToManyField(
         User,
@@ -155,25 +226,258 @@ class Comment(models.Model):
     def likes_count(self):
         return self.liked_by.count()
 
+    @staticmethod
+    def compute_content_hash(content: str, content_type: str) -> str:
+        return hashlib.sha256(f"{content_type or ''}\n{content or ''}".encode("utf-8")).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.content_hash = self.compute_content_hash(self.content, self.content_type)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"content", "content_type"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"content_hash"}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["entry", "author", "content_hash"], name="comment_dedup_idx"),
+            models.Index(fields=["entry", "created_at"], name="comment_entry_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.entry}"
 
+class CircuitState(models.TextChoices):
+    """Circuit breaker states for a remote node (see entries/circuit_breaker.py)."""
+
+    CLOSED = "CLOSED", "Closed"
+    OPEN = "OPEN", "Open"
+    HALF_OPEN = "HALF_OPEN", "Half-open"
+
+
 class RemoteNode(models.Model):
     """Stores credentials for connecting to other team's nodes"""
     name = models.CharField(max_length=100, unique=True)  # "Team Blue"
     base_url = models.URLField(help_text="e.g., https://team-dodgerblue.herokuapp.com") # Host URL
-    username = models.CharField(max_length=100, blank=True, default='', help_text="Username they gave us")
+    username = models.CharField(max_length=100, blank=True, default='', db_index=True, help_text="Username they gave us")
+    # Kept in plaintext because federation_client sends it to the peer;
+    # inbound requests are checked against password_hash only
     password = models.CharField(max_length=100, blank=True, default='', help_text="Password they gave us")
+    password_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    # Circuit breaker, maintained by entries/circuit_breaker.py
+    circuit_state = models.CharField(
+        max_length=10,
+        choices=CircuitState.choices,
+        default=CircuitState.CLOSED,
+    )
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    circuit_opened_at = models.DateTimeField(null=True, blank=True)
+    avg_latency_ms = models.FloatField(null=True, blank=True, help_text="Moving average of request latency")
+
+    # Token buckets for requests from this node (socialdistribution/throttling.py);
+    # blank falls back to NODE_THROTTLE_DEFAULTS, a rate of 0 disables the limit
+    inbox_rate_per_minute = models.PositiveIntegerField(null=True, blank=True, help_text="Inbox requests refilled per minute")
+    inbox_burst = models.PositiveIntegerField(null=True, blank=True, help_text="Inbox requests allowed back to back")
+    read_rate_per_minute = models.PositiveIntegerField(null=True, blank=True, help_text="Other API requests refilled per minute")
+    read_burst = models.PositiveIntegerField(null=True, blank=True, help_text="Other API requests allowed back to back")
+
+    # Shared HMAC key (entries/request_signing.py); when set, requests to and
+    # from this node are signed instead of carrying Basic credentials
+    signing_key_id = models.CharField(max_length=100, blank=True, default='', db_index=True, help_text="keyId in the Signature header")
+    signing_secret = models.CharField(max_length=200, blank=True, default='', help_text="Secret shared with this node for request signatures")
+
     def __str__(self):
         return f"{self.name} ({self.base_url})"
+
+    @staticmethod
+    def hash_secret(secret: str) -> str:
+        """Keyed SHA-256 of a node password; fast enough to check on every request."""
+        return hmac.new(settings.SECRET_KEY.encode("utf-8"), (secret or "").encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.password_hash = self.hash_secret(self.password) if self.password else ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "password" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"password_hash"}
+        super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = "Remote Node"
-        verbose_name_plural = "Remote Nodes"
\ No newline at end of file
+        verbose_name_plural = "Remote Nodes"
+
+class OutboxStatus(models.TextChoices):
+    """Discrete states for a queued federation delivery."""
+
+    PENDING = "PENDING", "Pending"
+    SENDING = "SENDING", "Sending"
+    DELIVERED = "DELIVERED", "Delivered"
+    FAILED = "FAILED", "Failed"
+    SUPERSEDED = "SUPERSEDED", "Superseded"
+
+
+class OutboxPayload(models.Model):
+    """
+    A federation object encoded once to JSON bytes.
+    Every delivery of the same entry/comment/like points at one row, so a
+    large image entry is serialized and stored once per fan-out, not once per
+    recipient.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    object_type = models.CharField(max_length=20)
+    body = models.BinaryField(help_text="UTF-8 encoded JSON sent as the request body")
+    digest = models.CharField(max_length=64, unique=True, help_text="sha256 of body")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Outbox Payload"
+        verbose_name_plural = "Outbox Payloads"
+
+    def __str__(self):
+        return f"{self.object_type} payload {self.digest[:12]}"
+
+
+class OutboxDelivery(models.Model):
+    """
+    One outbound POST to a remote author's inbox.
+    Views only enqueue these rows; the `deliver_outbox` command sends them.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    node = models.ForeignKey(
+        RemoteNode,
+        on_delete=models.CASCADE,
+        related_name="outbox_deliveries",
+    )
+    inbox_url = models.URLField(max_length=500)
+    object_type = models.CharField(max_length=20, help_text="entry, comment or like")
+    payload = models.ForeignKey(
+        OutboxPayload,
+        on_delete=models.PROTECT,
+        related_name="deliveries",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    latency_ms = models.FloatField(null=True, blank=True, help_text="Duration of the last attempt")
+    coalesce_key = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Pending deliveries with the same key and inbox are replaced by newer ones",
+    )
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_due_idx"),
+            models.Index(fields=["coalesce_key", "status"], name="outbox_coalesce_idx"),
+        ]
+        verbose_name = "Outbox Delivery"
+        verbose_name_plural = "Outbox Deliveries"
+
+    def __str__(self):
+        return f"{self.object_type} → {self.inbox_url} ({self.status})"
+
+
+class InboxItemStatus(models.TextChoices):
+    """Discrete states for an inbox item accepted for asynchronous processing."""
+
+    PENDING = "PENDING", "Pending"
+    PROCESSING = "PROCESSING", "Processing"
+    DONE = "DONE", "Done"
+    FAILED = "FAILED", "Failed"
+
+
+class InboxItem(models.Model):
+    """
+    A raw object POSTed to a local author's inbox, stored for the
+    `process_inbox` command when INBOX_ASYNC is enabled.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    recipient = models.ForeignKey(
+        Author,
+        on_delete=models.CASCADE,
+        related_name="inbox_items",
+    )
+    node = models.ForeignKey(
+        RemoteNode,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="inbox_items",
+        help_text="Sending node, empty for the shared node credentials",
+    )
+    object_type = models.CharField(max_length=20)
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=10,
+        choices=InboxItemStatus.choices,
+        default=InboxItemStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    result_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    result_detail = models.TextField(blank=True, default="")
+    available_at = models.DateTimeField(default=timezone.now)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["received_at"]
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="inbox_status_due_idx"),
+        ]
+        verbose_name = "Inbox Item"
+        verbose_name_plural = "Inbox Items"
+
+    def __str__(self):
+        return f"{self.object_type} → {self.recipient_id} ({self.status})"
+
+
+class ProcessedInboxObject(models.Model):
+    """
+    Idempotency ledger for the inbox (see entries/inbox_ledger.py).
+    One row per (sending node, object identity) remembering the response the
+    handler gave, so an exact replay is answered with a single lookup.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sender = models.CharField(max_length=64, help_text="RemoteNode pk, or 'shared' for the node-wide credentials")
+    object_key = models.CharField(max_length=64, help_text="sha256 of the object's identity")
+    payload_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="sha256 of the last payload applied; empty when any replay matches (likes)",
+    )
+    object_type = models.CharField(max_length=20)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField(default=dict)
+    processed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["sender", "object_key"], name="inbox_ledger_unique_object"),
+        ]
+        indexes = [
+            models.Index(fields=["processed_at"], name="inbox_ledger_processed_idx"),
+        ]
+        verbose_name = "Processed Inbox Object"
+        verbose_name_plural = "Processed Inbox Objects"
+
+    def __str__(self):
+        return f"{self.object_type} from {self.sender} ({self.status_code})"
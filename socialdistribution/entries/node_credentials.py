@@ -0,0 +1,71 @@
+"""
+In-process cache of inbound node credentials for RemoteNodeBasicAuthentication.
+
+Maps a Basic-auth username to the (password_hash, RemoteNode) pairs of the
+active nodes using it, so a warm peer authenticates without a query. Only
+usernames that belong to a node are cached. The secret is compared as a
+keyed hash with hmac.compare_digest. The stored hash is re-derived from the
+plaintext column on load, so rotating SECRET_KEY does not lock peers out.
+RemoteNode post_save / post_delete drop the cache (see entries/signals.py);
+other processes refresh after REMOTE_NODE_CREDENTIAL_TTL seconds.
+"""
+import hmac
+import threading
+import time
+
+from django.conf import settings
+
+from .models import RemoteNode
+
+
+class NodeCredentialCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict = {}  # username -> (expires_at, [(password_hash, node), ...])
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, username: str) -> list:
+        candidates = []
+        for node in RemoteNode.objects.filter(username=username, is_active=True).order_by("pk"):
+            expected = RemoteNode.hash_secret(node.password) if node.password else ""
+            if node.password_hash != expected:
+                # Rows written around save() (e.g. queryset.update()), or
+                # hashed under a SECRET_KEY that has since been rotated
+                node.password_hash = expected
+                RemoteNode.objects.filter(pk=node.pk).update(password_hash=expected)
+            candidates.append((node.password_hash, node))
+        return candidates
+
+    def candidates(self, username: str) -> list:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(username)
+            if cached is not None and now < cached[0]:
+                return cached[1]
+
+        candidates = self._load(username)
+        if not candidates:
+            # Unknown usernames are not cached, so clients cannot grow the dict
+            return candidates
+        ttl = getattr(settings, "REMOTE_NODE_CREDENTIAL_TTL", 300)
+        with self._lock:
+            self._entries[username] = (now + ttl, candidates)
+        return candidates
+
+    def verify(self, username: str, password: str):
+        """The active RemoteNode with these credentials, or None."""
+        if not username or not password:
+            return None
+        presented = RemoteNode.hash_secret(password)
+        match = None
+        # Compare against every candidate so timing doesn't reveal which one matched
+        for password_hash, node in self.candidates(username):
+            if password_hash and hmac.compare_digest(presented, password_hash) and match is None:
+                match = node
+        return match
+
+
+node_credentials = NodeCredentialCache()
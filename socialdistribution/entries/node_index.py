@@ -0,0 +1,116 @@
+"""
+Process-wide longest-prefix index of active RemoteNodes.
+
+Resolving which node a follower/author URL belongs to used to cost one query
+per recipient (or a Python scan over every node). The index is a trie keyed on
+the normalized origin (scheme://host[:port]) followed by the path segments of
+each node's base_url, so a lookup walks at most len(url) segments and never
+touches the database once built.
+
+post_save / post_delete on RemoteNode (see entries/signals.py) invalidate the
+index; other processes pick changes up after REMOTE_NODE_INDEX_TTL seconds.
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def url_key(url: str) -> list[str]:
+    """
+    Normalize a URL into trie segments: origin first, then non-empty path parts.
+    `https://Node.example.com:443/api/authors/` -> ["https://node.example.com", "api", "authors"]
+    """
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if not scheme or not host:
+        return []
+
+    origin = f"{scheme}://{host}"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        origin = f"{origin}:{port}"
+
+    return [origin] + [segment for segment in parts.path.split("/") if segment]
+
+
+def node_key(base_url: str) -> list[str]:
+    """Trie key for a node: its base_url without a trailing /api segment."""
+    key = url_key(base_url)
+    if len(key) > 1 and key[-1].lower() == "api":
+        key = key[:-1]
+    return key
+
+
+class _TrieNode:
+    __slots__ = ("children", "value")
+
+    def __init__(self):
+        self.children = {}
+        self.value = None
+
+
+class RemoteNodeIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._root = _TrieNode()
+        self._built_at = None
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def _is_fresh(self) -> bool:
+        if self._built_at is None:
+            return False
+        ttl = getattr(settings, "REMOTE_NODE_INDEX_TTL", 300)
+        return (time.monotonic() - self._built_at) < ttl
+
+    def rebuild(self):
+        from .models import RemoteNode
+
+        root = _TrieNode()
+        for node in RemoteNode.objects.filter(is_active=True).order_by("pk"):
+            key = node_key(node.base_url)
+            if not key:
+                continue
+            cursor = root
+            for segment in key:
+                cursor = cursor.children.setdefault(segment, _TrieNode())
+            # First (oldest) node wins when two share a prefix, like .first() did
+            if cursor.value is None:
+                cursor.value = node
+
+        with self._lock:
+            self._root = root
+            self._built_at = time.monotonic()
+
+    def lookup(self, url: str):
+        """Return the active RemoteNode with the longest matching prefix, or None."""
+        if not self._is_fresh():
+            self.rebuild()
+
+        cursor = self._root
+        match = None
+        for segment in url_key(url):
+            cursor = cursor.children.get(segment)
+            if cursor is None:
+                break
+            if cursor.value is not None:
+                match = cursor.value
+        return match
+
+
+node_index = RemoteNodeIndex()
+
+
+def find_node(url: str):
+    """Resolve the RemoteNode that hosts `url` (an author, entry or host URL)."""
+    return node_index.lookup(url)
@@ -0,0 +1,49 @@
+"""
+Classify the object URL of an inbox like without touching the database.
+
+Likes carry the liked object only as a URL. The shapes we recognize are the
+ones our own routes emit and the common peer variants:
+
+    .../entries/<uuid>                            entry (api + web routes)
+    .../authors/<uuid>/entries/<uuid>             entry
+    .../posts/<uuid>                              entry (older spec wording)
+    .../comments/<uuid>                           comment
+    .../entries/<uuid>/comments/<uuid>            comment
+    .../authors/<uuid>/commented/<uuid>           comment
+
+The type comes from the collection segment right before the trailing UUID,
+so the host and any API prefix do not matter.
+"""
+import uuid
+from urllib.parse import unquote, urlsplit
+
+ENTRY = "entry"
+COMMENT = "comment"
+
+_COLLECTIONS = {
+    "entries": ENTRY,
+    "posts": ENTRY,
+    "comments": COMMENT,
+    "commented": COMMENT,
+}
+
+
+def classify_object_url(url) -> tuple[str, str] | None:
+    """(ENTRY | COMMENT, uuid string) for a recognized object URL, else None."""
+    if not isinstance(url, str) or not url.strip():
+        return None
+
+    path = urlsplit(unquote(url.strip())).path
+    segments = [segment for segment in path.split("/") if segment]
+    if len(segments) < 2:
+        return None
+
+    object_type = _COLLECTIONS.get(segments[-2].lower())
+    if object_type is None:
+        return None
+
+    try:
+        object_id = uuid.UUID(segments[-1])
+    except ValueError:
+        return None
+    return object_type, str(object_id)
@@ -0,0 +1,354 @@
+"""
+Durable outbox for federation deliveries.
+
+The send_* helpers in api_views only enqueue an OutboxDelivery row per remote
+inbox; the `deliver_outbox` management command drains the queue. Everything the
+worker needs (payload, attempt count, last error) lives in the database, so a
+restart of gunicorn or the worker never drops a delivery.
+
+Payloads are encoded to JSON bytes once (OutboxPayload) and shared by every
+delivery of the same object, so the worker sends them without re-serializing.
+
+Entry deliveries are coalesced per (entry, inbox): a new version supersedes
+any still-pending delivery of an older one, and waits OUTBOX_COALESCE_WINDOW_SECONDS
+so a burst of edits goes out once.
+
+Failed deliveries are retried with exponential backoff and jitter. Deliveries
+to a node whose circuit breaker is open are deferred without spending an
+attempt (see circuit_breaker.py).
+
+DELIVERED and SUPERSEDED rows older than OUTBOX_RETENTION_SECONDS are purged
+by purge_finished() (run by the worker when idle), together with payloads no
+delivery refers to any more. FAILED rows are kept for inspection.
+"""
+import hashlib
+import json
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from . import circuit_breaker, federation_client
+from .fanout import FanOutSummary, RecipientResult, fan_out
+from .models import CircuitState, OutboxDelivery, OutboxPayload, OutboxStatus
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def encode_payload(payload: dict) -> bytes:
+    """Compact UTF-8 JSON, the exact bytes sent to every recipient."""
+    return json.dumps(
+        payload,
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def prepare_payload(object_type: str, payload: dict) -> OutboxPayload:
+    """
+    Encode `payload` once and store it for sharing across deliveries.
+    Identical bodies map to the same row.
+    """
+    body = encode_payload(payload)
+    prepared, _ = OutboxPayload.objects.get_or_create(
+        digest=hashlib.sha256(body).hexdigest(),
+        defaults={"object_type": object_type, "body": body},
+    )
+    return prepared
+
+
+def entry_coalesce_key(entry_id) -> str:
+    return f"entry:{entry_id}"
+
+
+def enqueue_deliveries(recipients, object_type: str, payload, coalesce_key: str = "") -> list[OutboxDelivery]:
+    """
+    Queue one payload for every (node, inbox_url) in `recipients`.
+
+    `payload` is a dict or an OutboxPayload from prepare_payload(). With a
+    `coalesce_key`, pending deliveries with that key to the same inboxes are
+    marked SUPERSEDED, and the new ones are held for the coalescing window.
+    """
+    recipients = list(recipients)
+    if not recipients:
+        return []
+    if not isinstance(payload, OutboxPayload):
+        payload = prepare_payload(object_type, payload)
+
+    now = timezone.now()
+    next_attempt_at = now
+    if coalesce_key:
+        next_attempt_at = now + timedelta(seconds=_setting("OUTBOX_COALESCE_WINDOW_SECONDS", 15))
+
+    with transaction.atomic():
+        if coalesce_key:
+            inboxes = {inbox_url for _, inbox_url in recipients}
+            # Rows already claimed (SENDING) are in flight and can't be recalled
+            stale = [
+                pk for pk, inbox_url in
+                OutboxDelivery.objects
+                .filter(coalesce_key=coalesce_key, status=OutboxStatus.PENDING)
+                .values_list("pk", "inbox_url")
+                if inbox_url in inboxes
+            ]
+            if stale:
+                OutboxDelivery.objects.filter(
+                    pk__in=stale, status=OutboxStatus.PENDING,
+                ).update(status=OutboxStatus.SUPERSEDED, updated_at=now)
+
+        return OutboxDelivery.objects.bulk_create([
+            OutboxDelivery(
+                node=node,
+                inbox_url=inbox_url,
+                object_type=object_type,
+                payload=payload,
+                coalesce_key=coalesce_key,
+                next_attempt_at=next_attempt_at,
+            )
+            for node, inbox_url in recipients
+        ])
+
+
+def enqueue_delivery(node, inbox_url: str, object_type: str, payload, coalesce_key: str = "") -> OutboxDelivery:
+    """Queue a payload for delivery to `inbox_url` on `node`."""
+    return enqueue_deliveries([(node, inbox_url)], object_type, payload, coalesce_key)[0]
+
+
+def claim_due_deliveries(batch_size: int = 50) -> list[OutboxDelivery]:
+    """
+    Lock and lease up to `batch_size` due deliveries.
+    Rows stuck in SENDING whose lease has expired (worker died mid-send) are
+    picked up again. Nodes whose circuit is open and still cooling down are
+    left out.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=_setting("OUTBOX_LEASE_SECONDS", 120))
+    cooling_since = now - timedelta(seconds=_setting("CIRCUIT_COOLDOWN_SECONDS", 60))
+
+    with transaction.atomic():
+        due = list(
+            OutboxDelivery.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            .select_related("node")
+            .filter(
+                status__in=[OutboxStatus.PENDING, OutboxStatus.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .exclude(
+                node__circuit_state=CircuitState.OPEN,
+                node__circuit_opened_at__gt=cooling_since,
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        OutboxDelivery.objects.filter(pk__in=[d.pk for d in due]).update(
+            status=OutboxStatus.SENDING,
+            next_attempt_at=lease_until,
+            updated_at=now,
+        )
+
+    # One query and one bytes object per distinct payload, shared by the batch
+    payloads = OutboxPayload.objects.in_bulk({d.payload_id for d in due})
+    for payload in payloads.values():
+        payload.body = bytes(payload.body)
+    for delivery in due:
+        delivery.payload = payloads[delivery.payload_id]
+    return due
+
+
+def backoff_delay(attempts: int) -> float:
+    """
+    Seconds to wait before retry number `attempts`: the base delay doubled per
+    attempt, capped, with the upper half jittered so retries to a node that
+    just recovered do not arrive in lockstep.
+    """
+    delay = min(
+        _setting("OUTBOX_RETRY_MAX_SECONDS", 3600),
+        _setting("OUTBOX_RETRY_BASE_SECONDS", 30) * 2 ** max(0, attempts - 1),
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _record_failure(delivery: OutboxDelivery, error: str, status_code=None):
+    delivery.last_error = error
+    delivery.last_status_code = status_code
+    if delivery.attempts >= _setting("OUTBOX_MAX_ATTEMPTS", 5):
+        delivery.status = OutboxStatus.FAILED
+    else:
+        delivery.status = OutboxStatus.PENDING
+        delivery.next_attempt_at = timezone.now() + timedelta(
+            seconds=backoff_delay(delivery.attempts)
+        )
+    delivery.save(update_fields=[
+        "status", "attempts", "last_error", "last_status_code", "next_attempt_at",
+        "latency_ms", "updated_at",
+    ])
+
+
+def _send(delivery: OutboxDelivery):
+    # Runs on a fan-out worker thread: HTTP only, no database access
+    return federation_client.post(
+        delivery.node,
+        delivery.inbox_url,
+        data=delivery.payload.body,
+        headers={"Content-Type": "application/json; charset=utf-8"},
+        object_type=delivery.object_type,
+        timeout=_setting("OUTBOX_REQUEST_TIMEOUT", 10),
+    )
+
+
+def _record_result(delivery: OutboxDelivery, result: RecipientResult):
+    delivery.attempts += 1
+    delivery.latency_ms = round(result.elapsed * 1000, 1) if result.elapsed else None
+
+    if not result.ok:
+        error = result.error
+        if result.status_code is not None:
+            error = f"HTTP {result.status_code}: {error}"
+        _record_failure(delivery, error, result.status_code)
+        return
+
+    delivery.status = OutboxStatus.DELIVERED
+    delivery.last_status_code = result.status_code
+    delivery.last_error = ""
+    delivery.delivered_at = timezone.now()
+    delivery.save(update_fields=[
+        "status", "attempts", "last_error", "last_status_code", "delivered_at",
+        "latency_ms", "updated_at",
+    ])
+
+
+def _defer(deliveries: list[OutboxDelivery], until):
+    """Put deliveries back in the queue without counting an attempt."""
+    OutboxDelivery.objects.filter(pk__in=[d.pk for d in deliveries]).update(
+        status=OutboxStatus.PENDING,
+        next_attempt_at=until,
+        updated_at=timezone.now(),
+    )
+    for delivery in deliveries:
+        delivery.status = OutboxStatus.PENDING
+        delivery.next_attempt_at = until
+
+
+def _record_breaker_outcomes(summary: FanOutSummary):
+    outcomes: dict = {}
+    for result in summary:
+        delivery = result.key
+        failed = circuit_breaker.is_node_failure(result.status_code, result.elapsed)
+        outcomes.setdefault(delivery.node_id, (delivery.node, []))[1].append(
+            (failed, result.elapsed)
+        )
+    for node, node_outcomes in outcomes.values():
+        circuit_breaker.record_outcomes(node, node_outcomes)
+
+
+def deliver_batch(deliveries: list[OutboxDelivery]) -> FanOutSummary:
+    """
+    Send claimed deliveries concurrently and persist each outcome.
+    - Deliveries to inactive nodes are given up on without a request.
+    - Deliveries to a node with an open circuit are deferred until it may be
+      probed again; a half-open node gets one probe per batch.
+    """
+    nodes: dict = {}
+    skipped = []
+    sendable = []
+    deferred: dict = {}
+    probing = set()
+    for delivery in deliveries:
+        # One shared instance per node so breaker state stays consistent
+        node = nodes.setdefault(delivery.node_id, delivery.node)
+        delivery.node = node
+
+        if node.is_active and node.pk not in probing and circuit_breaker.allow_request(node):
+            if node.circuit_state == CircuitState.HALF_OPEN:
+                probing.add(node.pk)
+            sendable.append(delivery)
+        elif node.is_active:
+            if node.circuit_state == CircuitState.OPEN:
+                until = circuit_breaker.reopens_at(node)
+            else:
+                # Waiting on this batch's probe; reconsidered next batch
+                until = timezone.now()
+            deferred.setdefault(until, []).append(delivery)
+        else:
+            skipped.append(RecipientResult(
+                key=delivery,
+                url=delivery.inbox_url,
+                ok=False,
+                error="Remote node is inactive",
+            ))
+            # No point retrying: this attempt is recorded as the last one
+            delivery.attempts = _setting("OUTBOX_MAX_ATTEMPTS", 5) - 1
+
+    summary = fan_out(
+        sendable,
+        _send,
+        url=lambda delivery: delivery.inbox_url,
+        max_workers=_setting("FANOUT_MAX_WORKERS", 16),
+        per_host=_setting("FANOUT_PER_HOST", 4),
+    )
+    _record_breaker_outcomes(summary)
+    summary.results = skipped + summary.results
+
+    for result in summary:
+        _record_result(result.key, result)
+    for until, held in deferred.items():
+        _defer(held, until)
+        summary.deferred.extend(held)
+    return summary
+
+
+def process_outbox(batch_size: int = 50) -> FanOutSummary:
+    """Claim one batch of due deliveries and send them."""
+    return deliver_batch(claim_due_deliveries(batch_size))
+
+
+def outcome_counts(summary: FanOutSummary) -> dict:
+    """delivered / retrying / failed / deferred counts for a processed batch."""
+    counts = {"delivered": 0, "retrying": 0, "failed": 0, "deferred": len(summary.deferred)}
+    for result in summary:
+        if result.ok:
+            counts["delivered"] += 1
+        elif result.key.status == OutboxStatus.FAILED:
+            counts["failed"] += 1
+        else:
+            counts["retrying"] += 1
+    return counts
+
+
+def purge_finished(older_than_seconds: int, batch_size: int = 1000) -> tuple[int, int]:
+    """
+    Delete finished deliveries last updated more than `older_than_seconds`
+    ago, then payloads of that age left without deliveries.
+    Returns (deliveries deleted, payloads deleted).
+    """
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    deliveries = 0
+    while True:
+        ids = list(
+            OutboxDelivery.objects
+            .filter(status__in=[OutboxStatus.DELIVERED, OutboxStatus.SUPERSEDED], updated_at__lt=cutoff)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        deliveries += OutboxDelivery.objects.filter(pk__in=ids).delete()[0]
+
+    # The age check keeps a payload that prepare_payload() just created but
+    # whose deliveries are not inserted yet
+    payloads = 0
+    while True:
+        ids = list(
+            OutboxPayload.objects
+            .filter(created_at__lt=cutoff, deliveries__isnull=True)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        payloads += OutboxPayload.objects.filter(pk__in=ids, deliveries__isnull=True).delete()[0]
+    return deliveries, payloads
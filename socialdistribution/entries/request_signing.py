@@ -0,0 +1,189 @@
+"""
+HMAC request signatures between peer nodes.
+
+A signed request carries
+
+    Date: Tue, 07 Jun 2026 20:51:35 GMT
+    Digest: SHA-256=<base64 sha256 of the body>
+    Authorization: Signature keyId="<key id>",algorithm="hmac-sha256",
+        headers="(request-target) date digest",signature="<base64>"
+
+where the signature is an HMAC-SHA256, under the secret shared with that
+node, of
+
+    (request-target): post /api/authors/<id>/inbox/
+    date: <Date header>
+    digest: <Digest header>
+
+Each RemoteNode with a signing_key_id and signing_secret uses them in both
+directions: federation_client signs outbound requests with them (instead of
+Basic auth), and RemoteNodeSignatureAuthentication accepts inbound requests
+signed with them. Requests whose Date is more than SIGNATURE_MAX_SKEW_SECONDS
+away from now are refused, and so is a signature already seen within that
+window (tracked in the Django cache, so shared by every worker).
+
+Verification needs no query once the key table is cached; post_save /
+post_delete on RemoteNode clear it (see entries/signals.py).
+"""
+import base64
+import hashlib
+import hmac
+import re
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from requests.auth import AuthBase
+
+from .inbox_parser import spool_request_body
+from .models import RemoteNode
+
+ALGORITHM = "hmac-sha256"
+SIGNED_HEADERS = ("(request-target)", "date", "digest")
+
+_PARAM = re.compile(r'(\w+)="([^"]*)"')
+
+
+class SignatureError(Exception):
+    """A signed request that must be refused; the message says why."""
+
+
+def body_digest(body: bytes) -> str:
+    return "SHA-256=" + base64.b64encode(hashlib.sha256(body or b"").digest()).decode("ascii")
+
+
+def signing_string(method: str, path: str, date: str, digest: str) -> str:
+    return "\n".join([
+        f"(request-target): {method.lower()} {path}",
+        f"date: {date}",
+        f"digest: {digest}",
+    ])
+
+
+def compute_signature(secret: str, method: str, path: str, date: str, digest: str) -> str:
+    mac = hmac.new(secret.encode("utf-8"), signing_string(method, path, date, digest).encode("utf-8"), hashlib.sha256)
+    return base64.b64encode(mac.digest()).decode("ascii")
+
+
+def sign_headers(key_id: str, secret: str, method: str, path: str, body: bytes = b"", date: str | None = None) -> dict:
+    """Date, Digest and Authorization headers for one request."""
+    date = date or formatdate(usegmt=True)
+    digest = body_digest(body)
+    signature = compute_signature(secret, method, path, date, digest)
+    return {
+        "Date": date,
+        "Digest": digest,
+        "Authorization": (
+            f'Signature keyId="{key_id}",algorithm="{ALGORITHM}",'
+            f'headers="{" ".join(SIGNED_HEADERS)}",signature="{signature}"'
+        ),
+    }
+
+
+def parse_authorization(header: str) -> dict | None:
+    """Parameters of a `Signature ...` Authorization header, or None for other schemes."""
+    scheme, _, params = (header or "").partition(" ")
+    if scheme.lower() != "signature":
+        return None
+    return dict(_PARAM.findall(params))
+
+
+class HmacSignatureAuth(AuthBase):
+    """requests auth hook that signs every outgoing request."""
+
+    def __init__(self, key_id: str, secret: str):
+        self.key_id = key_id
+        self.secret = secret
+
+    def __call__(self, prepared):
+        body = prepared.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        elif not isinstance(body, bytes):
+            raise ValueError("Signed requests need an in-memory body")
+        prepared.headers.update(
+            sign_headers(self.key_id, self.secret, prepared.method, prepared.path_url, body)
+        )
+        return prepared
+
+
+class SigningKeyCache:
+    """keyId -> (secret, RemoteNode) for active nodes, refreshed every REMOTE_NODE_CREDENTIAL_TTL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = None
+        self._loaded_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._keys = None
+
+    def lookup(self, key_id: str):
+        ttl = getattr(settings, "REMOTE_NODE_CREDENTIAL_TTL", 300)
+        with self._lock:
+            keys = self._keys
+            fresh = keys is not None and time.monotonic() - self._loaded_at < ttl
+        if not fresh:
+            keys = {
+                node.signing_key_id: (node.signing_secret, node)
+                for node in RemoteNode.objects.filter(is_active=True).exclude(signing_key_id="").order_by("-pk")
+                if node.signing_secret
+            }
+            with self._lock:
+                self._keys, self._loaded_at = keys, time.monotonic()
+        return keys.get(key_id)
+
+
+signing_keys = SigningKeyCache()
+
+
+def _body_digest_spooled(django_request) -> str:
+    """Digest header value for the body, spooling it for the parser on the way."""
+    sha = hashlib.sha256()
+    spool_request_body(django_request, sha)
+    return "SHA-256=" + base64.b64encode(sha.digest()).decode("ascii")
+
+
+def verify_request(django_request, params: dict):
+    """The RemoteNode that signed `django_request`, or SignatureError."""
+    key_id = params.get("keyId", "")
+    signature = params.get("signature", "")
+    if not key_id or not signature:
+        raise SignatureError("Signature is missing keyId or signature")
+    if params.get("algorithm", ALGORITHM).lower() != ALGORITHM:
+        raise SignatureError("Unsupported signature algorithm")
+    signed = (params.get("headers") or "date").lower().split()
+    if any(header not in signed for header in SIGNED_HEADERS):
+        raise SignatureError("Signature must cover (request-target), date and digest")
+
+    found = signing_keys.lookup(key_id)
+    if found is None:
+        raise SignatureError("Unknown signing key")
+    secret, node = found
+
+    date = django_request.META.get("HTTP_DATE", "")
+    try:
+        sent_at = parsedate_to_datetime(date).timestamp()
+    except (TypeError, ValueError, IndexError):
+        raise SignatureError("Missing or invalid Date header")
+    window = getattr(settings, "SIGNATURE_MAX_SKEW_SECONDS", 300)
+    if abs(time.time() - sent_at) > window:
+        raise SignatureError("Date outside the allowed window")
+
+    claimed_digest = django_request.META.get("HTTP_DIGEST", "")
+    actual_digest = _body_digest_spooled(django_request)
+    if not hmac.compare_digest(claimed_digest.encode(), actual_digest.encode()):
+        raise SignatureError("Digest does not match the body")
+
+    path = django_request.get_full_path()
+    expected = compute_signature(secret, django_request.method, path, date, claimed_digest)
+    if not hmac.compare_digest(expected.encode(), signature.encode()):
+        raise SignatureError("Invalid signature")
+
+    # A valid signature is only good once per window
+    if not cache.add(f"signature-seen:{key_id}:{signature}", 1, timeout=2 * window):
+        raise SignatureError("Replayed request")
+    return node
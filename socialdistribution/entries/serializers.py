@@ -78,6 +78,20 @@ class EntrySerializer(serializers.ModelSerializer):
             mutable["content_type"] = mutable["contentType"]
         return super().to_internal_value(mutable)
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Images the inbox stored as a file are linked, not inlined as base64,
+        # and left out if the file has gone missing from storage
+        content_file = getattr(instance, "content_file", None)
+        if content_file and not data.get("content"):
+            if content_file.storage.exists(content_file.name):
+                request = self.context.get("request")
+                url = reverse("entries:entry_image", args=[instance.author_id, instance.id])
+                data["content"] = request.build_absolute_uri(url) if request else url
+            else:
+                data.pop("content", None)
+        return data
+
     def get_likes(self, obj):
         """
         Return a paginated likes structure for the entry.
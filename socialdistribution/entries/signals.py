@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authors.models import Author
+
+from .author_cache import author_cache
+from .models import RemoteNode
+from .node_credentials import node_credentials
+from .node_index import node_index
+from .request_signing import signing_keys
+
+
+@receiver(post_save, sender=RemoteNode)
+@receiver(post_delete, sender=RemoteNode)
+def rebuild_remote_node_index(sender, **kwargs):
+    """Any change to a node can move, add or remove a prefix in the index."""
+    node_index.invalidate()
+
+
+@receiver(post_save, sender=RemoteNode)
+@receiver(post_delete, sender=RemoteNode)
+def invalidate_node_credentials(sender, **kwargs):
+    """New credentials or a deactivated node must take effect immediately."""
+    node_credentials.invalidate()
+    signing_keys.invalidate()
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_resolution(sender, instance, **kwargs):
+    """A changed or deleted author must not be served from the inbox cache."""
+    author_cache.invalidate_pk(instance.pk)
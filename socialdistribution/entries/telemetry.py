@@ -0,0 +1,198 @@
+"""
+Federation telemetry.
+
+Every request made through federation_client is timed into an in-process
+histogram keyed by (node, object type), with status-code and error counters
+next to it. The outbox worker also stores each attempt's latency on the
+delivery row, so delivery percentiles and backlog can be reported from the
+database no matter which process did the sending.
+
+federation_stats() combines both. It backs the staff-only
+/api/federation/stats/ endpoint and the `federation_stats` command.
+"""
+import bisect
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from socialdistribution.throttling import bucket_levels
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Quantiles are interpolated within a bucket."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def quantile(self, q: float):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if not bucket_count:
+                continue
+            if seen + bucket_count >= rank:
+                lower = BUCKET_BOUNDS_MS[index - 1] if index else 0.0
+                upper = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                fraction = (rank - seen) / bucket_count
+                return round(min(lower + (upper - lower) * fraction, self.max_ms), 1)
+            seen += bucket_count
+        return round(self.max_ms, 1)
+
+    def snapshot(self) -> dict:
+        data = {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+        }
+        for name, q in QUANTILES:
+            data[f"{name}_ms"] = self.quantile(q)
+        return data
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict = {}
+        self._statuses: dict = {}
+        self._errors: dict = {}
+
+    def record(self, node_name: str, object_type: str, elapsed: float, status_code=None, error=None):
+        key = (node_name, object_type)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.observe(elapsed * 1000)
+            if status_code is not None:
+                self._statuses.setdefault(key, Counter())[str(status_code)] += 1
+            if error is not None:
+                self._errors.setdefault(key, Counter())[error] += 1
+
+    def snapshot(self) -> dict:
+        """{node_name: {object_type: {latency..., statuses, errors}}}"""
+        with self._lock:
+            nodes: dict = {}
+            for (node_name, object_type), histogram in self._histograms.items():
+                key = (node_name, object_type)
+                nodes.setdefault(node_name, {})[object_type] = {
+                    **histogram.snapshot(),
+                    "statuses": dict(self._statuses.get(key, {})),
+                    "errors": dict(self._errors.get(key, {})),
+                }
+            return nodes
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._statuses.clear()
+            self._errors.clear()
+
+
+_registry = _Registry()
+
+
+def record_request(node, object_type: str, elapsed: float, status_code=None, error=None):
+    """Record one outbound request. `error` is an exception class name."""
+    _registry.record(node.name, object_type, elapsed, status_code, error)
+
+
+def process_snapshot() -> dict:
+    return _registry.snapshot()
+
+
+def reset():
+    _registry.reset()
+
+
+def _percentiles(values: list[float]) -> dict:
+    values = sorted(values)
+    data = {}
+    for name, q in QUANTILES:
+        if values:
+            index = min(len(values) - 1, max(0, int(round(q * len(values))) - 1))
+            data[f"{name}_ms"] = round(values[index], 1)
+        else:
+            data[f"{name}_ms"] = None
+    return data
+
+
+def federation_stats(window_seconds: int | None = None) -> list[dict]:
+    """
+    Per-RemoteNode report: delivery latency percentiles and success ratio over
+    the last `window_seconds` (from the outbox), current backlog, circuit
+    state, this process's request histograms and the node's throttle buckets.
+    """
+    from .models import OutboxDelivery, OutboxStatus, RemoteNode
+
+    if window_seconds is None:
+        window_seconds = getattr(settings, "FEDERATION_STATS_WINDOW_SECONDS", 3600)
+    since = timezone.now() - timedelta(seconds=window_seconds)
+
+    nodes = RemoteNode.objects.annotate(
+        backlog=Count(
+            "outbox_deliveries",
+            filter=Q(outbox_deliveries__status__in=[OutboxStatus.PENDING, OutboxStatus.SENDING]),
+        ),
+    ).order_by("name")
+
+    latencies: dict = {}
+    outcomes: dict = {}
+    recent = (
+        OutboxDelivery.objects
+        .filter(updated_at__gte=since, attempts__gt=0)
+        .values_list("node_id", "status", "latency_ms")
+    )
+    for node_id, delivery_status, latency_ms in recent.iterator():
+        counts = outcomes.setdefault(node_id, Counter())
+        counts["attempted"] += 1
+        if delivery_status == OutboxStatus.DELIVERED:
+            counts["delivered"] += 1
+        elif delivery_status == OutboxStatus.FAILED:
+            counts["failed"] += 1
+        if latency_ms is not None:
+            latencies.setdefault(node_id, []).append(latency_ms)
+
+    in_process = process_snapshot()
+    report = []
+    for node in nodes:
+        counts = outcomes.get(node.pk, Counter())
+        report.append({
+            "node": node.name,
+            "base_url": node.base_url,
+            "is_active": node.is_active,
+            "circuit_state": node.circuit_state,
+            "backlog": node.backlog,
+            "deliveries": {
+                "window_seconds": window_seconds,
+                "attempted": counts["attempted"],
+                "delivered": counts["delivered"],
+                "failed": counts["failed"],
+                "success_ratio": (
+                    round(counts["delivered"] / counts["attempted"], 3) if counts["attempted"] else None
+                ),
+                **_percentiles(latencies.get(node.pk, [])),
+            },
+            "requests": in_process.get(node.name, {}),
+            "throttle": bucket_levels(node),
+        })
+    return report
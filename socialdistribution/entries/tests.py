@@ -1,14 +1,56 @@
 import uuid
 import base64
-from django.test import TestCase, Client, RequestFactory
+import json
+from datetime import timedelta
+from io import StringIO
+import threading
+import time
+import requests
+from django.test import TestCase, SimpleTestCase, Client, RequestFactory, override_settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from unittest.mock import patch
-from .models import Entry, Comment, RemoteNode, Visibility
+from unittest import skipUnless
+from unittest.mock import patch, MagicMock
+from .models import Entry, Comment, RemoteNode, Visibility, OutboxDelivery, OutboxPayload, OutboxStatus, CircuitState
+from authors import follow_graph
 from authors.models import FollowRequest, FollowRequestStatus
 from rest_framework.test import APIClient
 from rest_framework import status
-from .api_views import send_entry_to_remote_followers
+from rest_framework.response import Response
+from .api_views import send_entry_to_remote_followers, InboxView, _resolve_remote_author_from_data
+from .author_cache import author_cache
+from .outbox import enqueue_delivery, process_outbox, outcome_counts, backoff_delay, purge_finished
+from .circuit_breaker import is_node_failure
+from .fanout import fan_out
+from .federation_client import NodeSessionPool
+from .node_index import node_index, find_node
+from . import telemetry
+from .inbox_queue import process_inbox
+from .object_urls import COMMENT, ENTRY, classify_object_url
+from django.core.cache import cache
+from socialdistribution import throttling
+from socialdistribution.log import SampleFilter, truncated
+import logging
+import shutil
+import tempfile
+from .inbox_parser import SPOOLED_CONTENT_KEY
+from . import inbox_parser
+from io import BytesIO
+from .serializers import EntrySerializer
+from .inbox_recorder import restore, sanitize
+from .inbox_replay import ClientSender, bypass_guards, load_recording, replay
+from .node_credentials import node_credentials
+from .request_signing import body_digest, compute_signature, parse_authorization, sign_headers, signing_keys
+from email.utils import formatdate
+from socialdistribution.authentication import NodeUser, RemoteNodeBasicAuthentication
+from django.contrib.auth.models import AnonymousUser
+from rest_framework import exceptions as drf_exceptions
+from rest_framework.request import Request
+from .models import InboxItem, InboxItemStatus, ProcessedInboxObject
 User = get_user_model()
 
 class EntryVisibilityTests(TestCase):
@@ -388,6 +430,7 @@ class EntryAPITests(TestCase):
         self.assertEqual(response.data['contentType'], data['contentType'])
 
 
+@override_settings(OUTBOX_COALESCE_WINDOW_SECONDS=0)
 class RemoteEntryFederationTests(TestCase):
     def setUp(self):
         self.factory = RequestFactory()
@@ -429,22 +472,32 @@ class RemoteEntryFederationTests(TestCase):
             status=FollowRequestStatus.APPROVED,
         )
 
-    @patch("entries.api_views.requests.post")
+    def _mock_response(self, mock_post, status_code=201):
+        mock_post.return_value.status_code = status_code
+        mock_post.return_value.ok = 200 <= status_code < 300
+        mock_post.return_value.text = ""
+
+    @patch("entries.outbox.federation_client.post")
     def test_public_entry_sent_to_remote_followers(self, mock_post):
+        self._mock_response(mock_post)
         self._approve_remote_follower()
         entry = self._create_entry(Visibility.PUBLIC)
 
         send_entry_to_remote_followers(entry, self.request)
+        mock_post.assert_not_called()  # only queued inside the request
+        process_outbox()
 
         self.assertTrue(mock_post.called)
         inbox_url = f"https://remote.example.com/api/authors/{self.remote_author.id}/inbox/"
-        called_url = mock_post.call_args.args[0]
+        self.assertEqual(mock_post.call_args.args[0], self.remote_node)
+        called_url = mock_post.call_args.args[1]
         self.assertEqual(called_url, inbox_url)
-        payload = mock_post.call_args.kwargs.get("json", {})
+        payload = json.loads(mock_post.call_args.kwargs["data"])
         self.assertEqual(payload.get("visibility"), Visibility.PUBLIC)
 
-    @patch("entries.api_views.requests.post")
+    @patch("entries.outbox.federation_client.post")
     def test_friends_entry_sent_to_remote_mutual_friends(self, mock_post):
+        self._mock_response(mock_post)
         self._approve_remote_follower()
         FollowRequest.objects.create(
             follower=self.author,
@@ -454,19 +507,241 @@ class RemoteEntryFederationTests(TestCase):
         entry = self._create_entry(Visibility.FRIENDS)
 
         send_entry_to_remote_followers(entry, self.request)
+        process_outbox()
 
         mock_post.assert_called_once()
-        payload = mock_post.call_args.kwargs.get("json", {})
+        payload = json.loads(mock_post.call_args.kwargs["data"])
         self.assertEqual(payload.get("visibility"), Visibility.FRIENDS)
 
-    @patch("entries.api_views.requests.post")
+    @patch("entries.outbox.federation_client.post")
+    def test_entry_payload_encoded_once_for_all_followers(self, mock_post):
+        self._mock_response(mock_post)
+        self._approve_remote_follower()
+        second_follower = User.objects.create_user(
+            username="remote_author_2",
+            password="pw",
+            display_name="Remote Author 2",
+        )
+        second_follower.host = "https://remote.example.com"
+        second_follower.save(update_fields=["host"])
+        FollowRequest.objects.create(
+            follower=second_follower,
+            followee=self.author,
+            status=FollowRequestStatus.APPROVED,
+        )
+        entry = self._create_entry(Visibility.PUBLIC)
+
+        send_entry_to_remote_followers(entry, self.request)
+
+        self.assertEqual(OutboxDelivery.objects.count(), 2)
+        self.assertEqual(OutboxPayload.objects.count(), 1)
+
+        process_outbox()
+
+        self.assertEqual(mock_post.call_count, 2)
+        first, second = [call.kwargs["data"] for call in mock_post.call_args_list]
+        self.assertIsInstance(first, bytes)
+        self.assertIs(first, second)
+        self.assertEqual(json.loads(first)["title"], entry.title)
+
+    @override_settings(OUTBOX_COALESCE_WINDOW_SECONDS=60)
+    @patch("entries.outbox.federation_client.post")
+    def test_rapid_edits_coalesce_to_latest_version(self, mock_post):
+        self._mock_response(mock_post)
+        self._approve_remote_follower()
+        entry = self._create_entry(Visibility.PUBLIC)
+
+        for title in ["first", "second", "third"]:
+            entry.title = title
+            entry.save()
+            send_entry_to_remote_followers(entry, self.request)
+
+        # Still inside the window: nothing goes out yet
+        self.assertEqual(len(process_outbox()), 0)
+        self.assertEqual(
+            OutboxDelivery.objects.filter(status=OutboxStatus.SUPERSEDED).count(), 2
+        )
+        pending = OutboxDelivery.objects.get(status=OutboxStatus.PENDING)
+        self.assertGreater(pending.next_attempt_at, timezone.now())
+
+        OutboxDelivery.objects.filter(pk=pending.pk).update(next_attempt_at=timezone.now())
+        process_outbox()
+
+        mock_post.assert_called_once()
+        self.assertEqual(json.loads(mock_post.call_args.kwargs["data"])["title"], "third")
+
+    @patch("entries.outbox.federation_client.post")
+    def test_delete_supersedes_pending_edit(self, mock_post):
+        self._approve_remote_follower()
+        entry = self._create_entry(Visibility.PUBLIC)
+        send_entry_to_remote_followers(entry, self.request)
+        # Simulate a delivery that already went out; it must stay untouched
+        OutboxDelivery.objects.update(status=OutboxStatus.DELIVERED)
+        send_entry_to_remote_followers(entry, self.request)
+
+        entry.visibility = "DELETED"
+        entry.save()
+        send_entry_to_remote_followers(entry, self.request)
+
+        statuses = list(
+            OutboxDelivery.objects.order_by("created_at").values_list("status", flat=True)
+        )
+        self.assertEqual(
+            statuses,
+            [OutboxStatus.DELIVERED, OutboxStatus.SUPERSEDED, OutboxStatus.PENDING],
+        )
+
+    @patch("entries.outbox.federation_client.post")
     def test_friends_entry_not_sent_without_mutual_follow(self, mock_post):
         self._approve_remote_follower()
         entry = self._create_entry(Visibility.FRIENDS)
 
         send_entry_to_remote_followers(entry, self.request)
+        process_outbox()
+
+        mock_post.assert_not_called()
+        self.assertFalse(OutboxDelivery.objects.exists())
+
+    def test_friends_entry_ignores_a_stale_cached_follow_graph(self):
+        self._approve_remote_follower()
+        back = FollowRequest.objects.create(
+            follower=self.author,
+            followee=self.remote_author,
+            status=FollowRequestStatus.APPROVED,
+        )
+        self.assertIn(self.remote_author.id, follow_graph.for_author(self.author).friends)
+        # Unfollowed through another worker: this process's cache never hears of it
+        with patch("authors.follow_graph.bump"):
+            back.delete()
+
+        send_entry_to_remote_followers(self._create_entry(Visibility.FRIENDS), self.request)
+
+        self.assertFalse(OutboxDelivery.objects.exists())
+
+
+class OutboxDeliveryTests(TestCase):
+    def setUp(self):
+        self.node = RemoteNode.objects.create(
+            name="Outbox Node",
+            base_url="https://outbox.example.com/api",
+            username="outboxuser",
+            password="outboxpass",
+        )
+        self.inbox_url = f"https://outbox.example.com/api/authors/{uuid.uuid4()}/inbox/"
+
+    def _enqueue(self):
+        return enqueue_delivery(self.node, self.inbox_url, "like", {"type": "like"})
+
+    @patch("entries.outbox.federation_client.post")
+    def test_successful_delivery_is_marked_delivered(self, mock_post):
+        mock_post.return_value.status_code = 201
+        mock_post.return_value.ok = True
+        delivery = self._enqueue()
+
+        summary = process_outbox()
+
+        self.assertEqual(outcome_counts(summary)["delivered"], 1)
+        self.assertEqual(summary.results[0].key, delivery)
+        self.assertEqual(summary.results[0].status_code, 201)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, OutboxStatus.DELIVERED)
+        self.assertEqual(delivery.attempts, 1)
+        self.assertEqual(delivery.last_status_code, 201)
+        self.assertIsNotNone(delivery.delivered_at)
+
+    @patch("entries.outbox.federation_client.post")
+    def test_failed_delivery_is_rescheduled_with_error(self, mock_post):
+        mock_post.side_effect = requests.ConnectionError("connection refused")
+        delivery = self._enqueue()
+
+        summary = process_outbox()
+
+        self.assertEqual(outcome_counts(summary)["retrying"], 1)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, OutboxStatus.PENDING)
+        self.assertEqual(delivery.attempts, 1)
+        self.assertIn("connection refused", delivery.last_error)
+        self.assertGreater(delivery.next_attempt_at, timezone.now())
+
+        # Not due yet, so the next drain leaves it alone
+        self.assertEqual(len(process_outbox()), 0)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    @patch("entries.outbox.federation_client.post")
+    def test_delivery_fails_after_max_attempts(self, mock_post):
+        mock_post.return_value.status_code = 500
+        mock_post.return_value.ok = False
+        mock_post.return_value.text = "boom"
+        delivery = self._enqueue()
+
+        process_outbox()
+
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, OutboxStatus.FAILED)
+        self.assertEqual(delivery.last_status_code, 500)
+
+    @patch("entries.outbox.federation_client.post")
+    def test_inactive_node_is_given_up_without_request(self, mock_post):
+        self.node.is_active = False
+        self.node.save()
+        delivery = self._enqueue()
+
+        summary = process_outbox()
 
         mock_post.assert_not_called()
+        self.assertEqual(outcome_counts(summary)["failed"], 1)
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, OutboxStatus.FAILED)
+        self.assertEqual(delivery.last_error, "Remote node is inactive")
+
+    @patch("entries.outbox.federation_client.post")
+    def test_expired_lease_is_reclaimed(self, mock_post):
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.ok = True
+        delivery = self._enqueue()
+        OutboxDelivery.objects.filter(pk=delivery.pk).update(
+            status=OutboxStatus.SENDING,
+            next_attempt_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        process_outbox()
+
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, OutboxStatus.DELIVERED)
+
+    @patch("entries.outbox.federation_client.post")
+    def test_deliver_outbox_command_drains_queue(self, mock_post):
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.ok = True
+        self._enqueue()
+        self._enqueue()
+
+        out = StringIO()
+        call_command("deliver_outbox", "--once", stdout=out)
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertIn("delivered=2", out.getvalue())
+        self.assertFalse(
+            OutboxDelivery.objects.exclude(status=OutboxStatus.DELIVERED).exists()
+        )
+
+    def test_purge_removes_old_finished_deliveries_and_orphan_payloads(self):
+        old = timezone.now() - timedelta(days=30)
+        delivered = self._enqueue()
+        failed = enqueue_delivery(self.node, self.inbox_url, "comment", {"type": "comment"})
+        recent = enqueue_delivery(self.node, self.inbox_url, "entry", {"type": "entry"})
+        OutboxDelivery.objects.filter(pk=delivered.pk).update(status=OutboxStatus.DELIVERED, updated_at=old)
+        OutboxDelivery.objects.filter(pk=failed.pk).update(status=OutboxStatus.FAILED, updated_at=old)
+        OutboxDelivery.objects.filter(pk=recent.pk).update(status=OutboxStatus.DELIVERED)
+        OutboxPayload.objects.update(created_at=old)
+
+        deliveries, payloads = purge_finished(7 * 24 * 3600)
+
+        self.assertEqual((deliveries, payloads), (1, 1))
+        self.assertFalse(OutboxDelivery.objects.filter(pk=delivered.pk).exists())
+        self.assertTrue(OutboxDelivery.objects.filter(pk=failed.pk).exists())
+        self.assertTrue(OutboxDelivery.objects.filter(pk=recent.pk).exists())
+        self.assertEqual(OutboxPayload.objects.count(), 2)
 
 # This group of test cases were generated by Copilot Chat Agent in VSCode
 class InboxFederationTests(TestCase):
@@ -582,6 +857,802 @@ class InboxFederationTests(TestCase):
     #     self.assertEqual(comments.first().content, "Remote says hi")
 
 
+@override_settings(CIRCUIT_FAILURE_THRESHOLD=2, CIRCUIT_COOLDOWN_SECONDS=60)
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.node = RemoteNode.objects.create(
+            name="Flaky Node",
+            base_url="https://flaky.example.com/api",
+            username="flaky",
+            password="flakypass",
+        )
+
+    def _enqueue(self, count=1):
+        return [
+            enqueue_delivery(
+                self.node,
+                f"https://flaky.example.com/api/authors/{uuid.uuid4()}/inbox/",
+                "like",
+                {"type": "like", "n": i},
+            )
+            for i in range(count)
+        ]
+
+    def _open_circuit(self, opened_ago):
+        RemoteNode.objects.filter(pk=self.node.pk).update(
+            circuit_state=CircuitState.OPEN,
+            consecutive_failures=2,
+            circuit_opened_at=timezone.now() - timedelta(seconds=opened_ago),
+        )
+
+    @patch("entries.outbox.federation_client.post")
+    def test_consecutive_failures_open_circuit(self, mock_post):
+        mock_post.side_effect = requests.ConnectionError("down")
+        self._enqueue(2)
+
+        process_outbox()
+
+        self.node.refresh_from_db()
+        self.assertEqual(self.node.circuit_state, CircuitState.OPEN)
+        self.assertEqual(self.node.consecutive_failures, 2)
+        self.assertIsNotNone(self.node.circuit_opened_at)
+        self.assertIsNotNone(self.node.avg_latency_ms)
+
+    @patch("entries.outbox.federation_client.post")
+    def test_open_circuit_defers_without_attempt(self, mock_post):
+        self._open_circuit(opened_ago=5)
+        delivery, = self._enqueue()
+
+        self.assertEqual(len(process_outbox()), 0)
+
+        mock_post.assert_not_called()
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, OutboxStatus.PENDING)
+        self.assertEqual(delivery.attempts, 0)
+
+    @patch("entries.outbox.federation_client.post")
+    def test_half_open_sends_single_probe_then_closes(self, mock_post):
+        mock_post.return_value.status_code = 202
+        mock_post.return_value.ok = True
+        self._open_circuit(opened_ago=120)
+        self._enqueue(3)
+
+        summary = process_outbox()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(len(summary.deferred), 2)
+        self.node.refresh_from_db()
+        self.assertEqual(self.node.circuit_state, CircuitState.CLOSED)
+        self.assertEqual(self.node.consecutive_failures, 0)
+
+        process_outbox()
+        self.assertEqual(mock_post.call_count, 3)
+
+    @patch("entries.outbox.federation_client.post")
+    def test_failed_probe_reopens_circuit(self, mock_post):
+        mock_post.return_value.status_code = 503
+        mock_post.return_value.ok = False
+        mock_post.return_value.text = "unavailable"
+        self._open_circuit(opened_ago=120)
+        self._enqueue(2)
+
+        process_outbox()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.node.refresh_from_db()
+        self.assertEqual(self.node.circuit_state, CircuitState.OPEN)
+        self.assertGreater(self.node.circuit_opened_at, timezone.now() - timedelta(seconds=5))
+
+    def test_only_node_health_outcomes_count_as_failures(self):
+        self.assertTrue(is_node_failure(None))
+        self.assertTrue(is_node_failure(502))
+        self.assertTrue(is_node_failure(429))
+        self.assertTrue(is_node_failure(200, elapsed=30))
+        self.assertFalse(is_node_failure(404))
+        self.assertFalse(is_node_failure(201, elapsed=0.1))
+
+    @override_settings(OUTBOX_RETRY_BASE_SECONDS=10, OUTBOX_RETRY_MAX_SECONDS=100)
+    def test_backoff_grows_exponentially_and_is_capped(self):
+        with patch("entries.outbox.random.uniform", side_effect=lambda low, high: high):
+            self.assertEqual(backoff_delay(1), 10)
+            self.assertEqual(backoff_delay(2), 20)
+            self.assertEqual(backoff_delay(3), 40)
+            self.assertEqual(backoff_delay(10), 100)
+        with patch("entries.outbox.random.uniform", side_effect=lambda low, high: low):
+            self.assertEqual(backoff_delay(3), 20)
+
+
+@override_settings(INBOX_ASYNC=True)
+class AsyncInboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(
+            username="async_recipient",
+            password="pw",
+            display_name="Async Recipient",
+        )
+        self.entry = Entry.objects.create(
+            author=self.recipient,
+            title="Async Target",
+            description="",
+            content="target",
+            content_type="text/plain",
+            visibility=Visibility.PUBLIC,
+        )
+        self.remote_node = RemoteNode.objects.create(
+            name="Async Node",
+            base_url="https://async.example.com/api",
+            username="asyncuser",
+            password="asyncpass",
+        )
+        self.inbox_url = f"/api/authors/{self.recipient.id}/inbox/"
+        token = base64.b64encode(b"asyncuser:asyncpass").decode()
+        self.auth = {"HTTP_AUTHORIZATION": f"Basic {token}"}
+
+    def _like(self, target_url):
+        return {
+            "type": "like",
+            "author": {
+                "type": "author",
+                "id": f"https://async.example.com/api/authors/{uuid.uuid4()}/",
+                "displayName": "Async Liker",
+                "host": "https://async.example.com",
+            },
+            "object": target_url,
+        }
+
+    def test_inbox_queues_item_and_returns_202(self):
+        response = self.client.post(
+            self.inbox_url,
+            self._like(f"http://testserver/api/entries/{self.entry.id}/"),
+            format="json",
+            **self.auth,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        item = InboxItem.objects.get(id=response.data["id"])
+        self.assertEqual(item.status, InboxItemStatus.PENDING)
+        self.assertEqual(item.node, self.remote_node)
+        self.assertEqual(item.object_type, "like")
+        self.assertFalse(self.entry.liked_by.exists())
+
+    def test_invalid_envelope_is_rejected_without_queueing(self):
+        response = self.client.post(
+            self.inbox_url, {"type": "poke", "author": {}}, format="json", **self.auth
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(InboxItem.objects.exists())
+
+    def test_worker_applies_items_and_tracks_status(self):
+        self.client.post(
+            self.inbox_url,
+            self._like(f"http://testserver/api/entries/{self.entry.id}/"),
+            format="json",
+            **self.auth,
+        )
+        self.client.post(
+            self.inbox_url,
+            self._like(f"http://testserver/api/entries/{uuid.uuid4()}/"),
+            format="json",
+            **self.auth,
+        )
+
+        counts = process_inbox()
+
+        self.assertEqual(counts, {"done": 1, "retrying": 0, "failed": 1})
+        self.assertEqual(self.entry.liked_by.count(), 1)
+        failed = InboxItem.objects.get(status=InboxItemStatus.FAILED)
+        self.assertEqual(failed.result_status_code, 404)
+        self.assertEqual(failed.result_detail, "Object not found")
+        self.assertEqual(process_inbox(), {"done": 0, "retrying": 0, "failed": 0})
+
+    @override_settings(INBOX_MAX_ATTEMPTS=2)
+    def test_handler_errors_are_retried_then_failed(self):
+        self.client.post(
+            self.inbox_url,
+            self._like(f"http://testserver/api/entries/{self.entry.id}/"),
+            format="json",
+            **self.auth,
+        )
+
+        with patch("entries.api_views.InboxView._handle_like", side_effect=RuntimeError("boom")):
+            self.assertEqual(process_inbox()["retrying"], 1)
+            InboxItem.objects.update(available_at=timezone.now())
+            self.assertEqual(process_inbox()["failed"], 1)
+
+        item = InboxItem.objects.get()
+        self.assertEqual(item.attempts, 2)
+        self.assertEqual(item.result_status_code, 500)
+
+    def test_process_inbox_command(self):
+        self.client.post(
+            self.inbox_url,
+            self._like(f"http://testserver/api/entries/{self.entry.id}/"),
+            format="json",
+            **self.auth,
+        )
+
+        out = StringIO()
+        call_command("process_inbox", "--once", stdout=out)
+
+        self.assertIn("done=1", out.getvalue())
+        self.assertTrue(self.entry.liked_by.exists())
+
+
+class BatchInboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(
+            username="batch_recipient",
+            password="pw",
+            display_name="Batch Recipient",
+        )
+        self.entries = [
+            Entry.objects.create(
+                author=self.recipient,
+                title=f"Batch Target {i}",
+                description="",
+                content="target",
+                content_type="text/plain",
+                visibility=Visibility.PUBLIC,
+            )
+            for i in range(2)
+        ]
+        self.remote_node = RemoteNode.objects.create(
+            name="Batch Node",
+            base_url="https://batch.example.com/api",
+            username="batchuser",
+            password="batchpass",
+        )
+        self.inbox_url = f"/api/authors/{self.recipient.id}/inbox/"
+        token = base64.b64encode(b"batchuser:batchpass").decode()
+        self.auth = {"HTTP_AUTHORIZATION": f"Basic {token}"}
+
+    def _author(self):
+        return {
+            "type": "author",
+            "id": f"https://batch.example.com/api/authors/{uuid.uuid4()}/",
+            "displayName": "Batch Liker",
+            "host": "https://batch.example.com",
+        }
+
+    def _like(self, entry_id, author=None):
+        return {
+            "type": "like",
+            "author": author or self._author(),
+            "object": f"http://testserver/api/entries/{entry_id}/",
+        }
+
+    def _post(self, items):
+        return self.client.post(self.inbox_url, items, format="json", **self.auth)
+
+    def test_batch_returns_per_item_results(self):
+        items = [
+            self._like(self.entries[0].id),
+            self._like(self.entries[1].id),
+            self._like(uuid.uuid4()),
+            {"type": "poke"},
+        ]
+
+        response = self._post(items)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(r["index"], r["status"]) for r in response.data["results"]],
+            [(0, 200), (1, 200), (2, 404), (3, 400)],
+        )
+        self.assertEqual(response.data["results"][2]["detail"], "Object not found")
+        self.assertEqual(self.entries[0].liked_by.count(), 1)
+        self.assertEqual(self.entries[1].liked_by.count(), 1)
+
+    def test_batch_resolves_authors_and_targets_in_bulk(self):
+        authors = [self._author() for _ in range(5)]
+        # First request creates the remote author stubs
+        self._post([self._like(self.entries[0].id, author) for author in authors])
+
+        items = [self._like(self.entries[1].id, author) for author in authors]
+        with CaptureQueriesContext(connection) as queries:
+            response = self._post(items)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry_selects = [
+            q["sql"] for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "entries_entry"' in q["sql"]
+        ]
+        self.assertEqual(len(entry_selects), 1)
+        self.assertEqual(self.entries[1].liked_by.count(), 5)
+
+    def test_failing_item_is_rolled_back_alone(self):
+        follow = {"type": "follow", "actor": self._author(), "object": {}}
+        original = InboxView._handle_follow
+
+        def follow_then_fail(view, recipient, data):
+            original(view, recipient, data)
+            raise RuntimeError("boom")
+
+        with patch.object(InboxView, "_handle_follow", follow_then_fail):
+            response = self._post([self._like(self.entries[0].id), follow])
+
+        self.assertEqual([r["status"] for r in response.data["results"]], [200, 500])
+        self.assertEqual(self.entries[0].liked_by.count(), 1)
+        self.assertFalse(FollowRequest.objects.filter(followee=self.recipient).exists())
+
+    def test_author_created_by_a_rolled_back_item_is_not_reused(self):
+        author = self._author()
+        entry = {
+            "type": "entry",
+            "id": f"https://batch.example.com/api/authors/x/entries/{uuid.uuid4()}/",
+            "title": None,
+            "content": "body",
+            "contentType": "text/plain",
+            "visibility": "PUBLIC",
+            "author": author,
+        }
+
+        response = self._post([entry, self._like(self.entries[0].id, author)])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][1]["status"], 200)
+        self.assertEqual(self.entries[0].liked_by.count(), 1)
+
+    @override_settings(INBOX_BATCH_MAX_ITEMS=2)
+    def test_batch_limit_is_enforced_and_advertised(self):
+        response = self._post([self._like(self.entries[0].id)] * 3)
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(response["X-Inbox-Batch-Max-Items"], "2")
+        self.assertEqual(self._post([])["X-Inbox-Batch-Max-Items"], "2")
+
+    @override_settings(INBOX_ASYNC=True)
+    def test_async_batch_queues_valid_items(self):
+        response = self._post([self._like(self.entries[0].id), {"type": "poke"}])
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual([r["status"] for r in response.data["results"]], [202, 400])
+        self.assertEqual(InboxItem.objects.count(), 1)
+
+
+class AuthorResolutionCacheTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        self.author_uuid = uuid.uuid4()
+        self.author_data = {
+            "type": "author",
+            "id": f"https://cached.example.com/api/authors/{self.author_uuid}/",
+            "displayName": "Cached Author",
+            "host": "https://cached.example.com/api/",
+        }
+
+    def test_repeat_sender_resolves_without_queries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = _resolve_remote_author_from_data(self.author_data)
+
+        with self.assertNumQueries(0):
+            second = _resolve_remote_author_from_data(self.author_data)
+
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(second.host, "https://cached.example.com")
+
+    def test_author_save_invalidates_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            author = _resolve_remote_author_from_data(self.author_data)
+        self.assertEqual(len(author_cache), 1)
+
+        author.display_name = "Renamed"
+        author.save()
+
+        self.assertEqual(len(author_cache), 0)
+        with self.assertNumQueries(1):
+            _resolve_remote_author_from_data(self.author_data)
+
+    def test_author_created_in_a_rolled_back_transaction_is_not_cached(self):
+        class Abort(Exception):
+            pass
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    _resolve_remote_author_from_data(self.author_data)
+                    raise Abort()
+            except Abort:
+                pass
+
+        self.assertFalse(User.objects.filter(pk=self.author_uuid).exists())
+        self.assertIsNone(author_cache.get(self.author_data["id"]))
+
+    def test_cached_author_without_host_is_backfilled(self):
+        author = User.objects.create_user(username="hostless", password="pw")
+        author_cache.put(f"https://cached.example.com/api/authors/{author.id}", author.pk, None)
+        data = dict(self.author_data, id=f"https://cached.example.com/api/authors/{author.id}/")
+
+        resolved = _resolve_remote_author_from_data(data)
+
+        self.assertEqual(resolved.pk, author.pk)
+        author.refresh_from_db()
+        self.assertEqual(author.host, "https://cached.example.com")
+
+    @override_settings(REMOTE_AUTHOR_CACHE_TTL=0)
+    def test_entries_expire_after_ttl(self):
+        _resolve_remote_author_from_data(self.author_data)
+
+        with self.assertNumQueries(1):
+            _resolve_remote_author_from_data(self.author_data)
+
+    @override_settings(REMOTE_AUTHOR_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        author_cache.put("https://a.example.com/authors/1", 1, None)
+        author_cache.put("https://a.example.com/authors/2", 2, None)
+        author_cache.get("https://a.example.com/authors/1")
+        author_cache.put("https://a.example.com/authors/3", 3, None)
+
+        self.assertIsNotNone(author_cache.get("https://a.example.com/authors/1"))
+        self.assertIsNone(author_cache.get("https://a.example.com/authors/2"))
+        self.assertIsNotNone(author_cache.get("https://a.example.com/authors/3/"))
+
+
+class InboxLedgerTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(username="ledger_recipient", password="pw")
+        self.entry = Entry.objects.create(
+            author=self.recipient,
+            title="Ledger Target",
+            description="",
+            content="target",
+            content_type="text/plain",
+            visibility=Visibility.PUBLIC,
+        )
+        self.node = RemoteNode.objects.create(
+            name="Ledger Node",
+            base_url="https://ledger.example.com/api",
+            username="ledgeruser",
+            password="ledgerpass",
+        )
+        self.other_node = RemoteNode.objects.create(
+            name="Other Ledger Node",
+            base_url="https://other-ledger.example.com/api",
+            username="otheruser",
+            password="otherpass",
+        )
+        self.inbox_url = f"/api/authors/{self.recipient.id}/inbox/"
+        self.remote_author = {
+            "type": "author",
+            "id": f"https://ledger.example.com/api/authors/{uuid.uuid4()}/",
+            "displayName": "Ledger Author",
+            "host": "https://ledger.example.com",
+        }
+
+    def _post(self, payload, username="ledgeruser", password="ledgerpass"):
+        token = base64.b64encode(f"{username}:{password}".encode()).decode()
+        return self.client.post(
+            self.inbox_url, payload, format="json", HTTP_AUTHORIZATION=f"Basic {token}"
+        )
+
+    def _like(self, summary="likes your entry"):
+        return {
+            "type": "like",
+            "summary": summary,
+            "author": self.remote_author,
+            "object": f"http://testserver/api/entries/{self.entry.id}/",
+        }
+
+    def _entry(self, title):
+        return {
+            "type": "entry",
+            "id": "https://ledger.example.com/api/authors/x/entries/6f1c2a4e-1d1b-4c55-9a55-3c1e1e1e1e1e/",
+            "title": title,
+            "content": "remote body",
+            "contentType": "text/plain",
+            "visibility": "PUBLIC",
+            "author": self.remote_author,
+        }
+
+    def test_like_replay_short_circuits_with_original_status(self):
+        first = self._post(self._like())
+
+        with patch.object(InboxView, "_handle_like") as handler:
+            replay = self._post(self._like(summary="different wording"))
+
+        handler.assert_not_called()
+        self.assertEqual(replay.status_code, first.status_code)
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(ProcessedInboxObject.objects.count(), 1)
+
+    def test_same_object_from_another_node_is_processed(self):
+        self._post(self._like())
+
+        with patch.object(InboxView, "_handle_like", return_value=Response({"detail": "ok"})) as handler:
+            self._post(self._like(), username="otheruser", password="otherpass")
+
+        handler.assert_called_once()
+
+    def test_entry_edits_and_reverts_are_applied(self):
+        self.assertEqual(self._post(self._entry("v1")).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._post(self._entry("v1")).status_code, status.HTTP_201_CREATED)
+        self._post(self._entry("v2"))
+        self._post(self._entry("v1"))
+
+        remote_entry = Entry.objects.get(id="6f1c2a4e-1d1b-4c55-9a55-3c1e1e1e1e1e")
+        self.assertEqual(remote_entry.title, "v1")
+        self.assertEqual(ProcessedInboxObject.objects.count(), 1)
+
+    def test_failures_and_follows_are_not_recorded(self):
+        missing_like = dict(self._like(), object=f"http://testserver/api/entries/{uuid.uuid4()}/")
+        self.assertEqual(self._post(missing_like).status_code, status.HTTP_404_NOT_FOUND)
+        self._post({"type": "follow", "actor": self.remote_author, "object": {}})
+
+        self.assertFalse(ProcessedInboxObject.objects.exists())
+
+    def test_compact_command_expires_old_rows(self):
+        self._post(self._like())
+        ProcessedInboxObject.objects.update(processed_at=timezone.now() - timedelta(days=30))
+        self._post(self._entry("fresh"))
+
+        out = StringIO()
+        call_command("compact_inbox_ledger", "--older-than", str(24 * 3600), stdout=out)
+
+        self.assertIn("Deleted 1 inbox ledger rows", out.getvalue())
+        self.assertEqual(ProcessedInboxObject.objects.get().object_type, "entry")
+
+
+class FanOutTests(SimpleTestCase):
+    def _response(self, status_code=201):
+        response = MagicMock(status_code=status_code, text="")
+        response.ok = 200 <= status_code < 300
+        return response
+
+    def test_results_follow_input_order_and_capture_errors(self):
+        urls = [f"https://node-{i % 3}.example.com/inbox/{i}" for i in range(9)]
+
+        def send(url):
+            if url.endswith("/4"):
+                raise requests.ConnectionError("refused")
+            if url.endswith("/5"):
+                return self._response(503)
+            return self._response()
+
+        summary = fan_out(urls, send, url=lambda url: url, max_workers=4, per_host=2)
+
+        self.assertEqual([r.key for r in summary], urls)
+        self.assertEqual(len(summary.delivered), 7)
+        self.assertEqual(
+            {r.url: (r.status_code, r.error) for r in summary.failed},
+            {urls[4]: (None, "refused"), urls[5]: (503, "")},
+        )
+        self.assertEqual(summary.by_host()["node-1.example.com"], {"delivered": 2, "failed": 1})
+
+    def test_global_and_per_host_caps_are_respected(self):
+        lock = threading.Lock()
+        in_flight = {"total": 0, "max_total": 0}
+        per_host = {}
+
+        def send(url):
+            host = url.split("/")[2]
+            with lock:
+                in_flight["total"] += 1
+                in_flight["max_total"] = max(in_flight["max_total"], in_flight["total"])
+                current, peak = per_host.get(host, (0, 0))
+                per_host[host] = (current + 1, max(peak, current + 1))
+            time.sleep(0.02)
+            with lock:
+                in_flight["total"] -= 1
+                current, peak = per_host[host]
+                per_host[host] = (current - 1, peak)
+            return self._response()
+
+        urls = [f"https://busy.example.com/inbox/{i}" for i in range(12)]
+        urls += [f"https://quiet.example.com/inbox/{i}" for i in range(4)]
+
+        summary = fan_out(urls, send, url=lambda url: url, max_workers=5, per_host=2)
+
+        self.assertEqual(len(summary.delivered), 16)
+        self.assertLessEqual(in_flight["max_total"], 5)
+        self.assertEqual(per_host["busy.example.com"][1], 2)
+        self.assertLessEqual(per_host["quiet.example.com"][1], 2)
+
+
+class FederationClientTests(TestCase):
+    def setUp(self):
+        self.pool = NodeSessionPool()
+        self.node = RemoteNode.objects.create(
+            name="Pooled Node",
+            base_url="https://pooled.example.com/api",
+            username="pooleduser",
+            password="pooledpass",
+        )
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_one_session_per_node_with_auth_set_once(self):
+        first = self.pool.session_for(self.node)
+        second = self.pool.session_for(self.node)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.auth.username, "pooleduser")
+        self.assertEqual(first.auth.password, "pooledpass")
+
+    @override_settings(FEDERATION_POOL_MAXSIZE=3)
+    def test_connection_pool_is_bounded(self):
+        adapter = self.pool.session_for(self.node).get_adapter("https://pooled.example.com/")
+
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertTrue(adapter._pool_block)
+
+    def test_credential_change_rebuilds_session(self):
+        first = self.pool.session_for(self.node)
+        self.node.password = "rotated"
+        self.node.save()
+
+        second = self.pool.session_for(self.node)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.auth.password, "rotated")
+
+    @patch("requests.Session.request")
+    def test_stats_count_requests_and_errors(self, mock_request):
+        mock_request.side_effect = [MagicMock(status_code=200), requests.Timeout("slow")]
+
+        self.pool.request(self.node, "GET", "https://pooled.example.com/api/authors/")
+        with self.assertRaises(requests.Timeout):
+            self.pool.request(self.node, "GET", "https://pooled.example.com/api/authors/")
+
+        stats = self.pool.stats()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["node"], "Pooled Node")
+        self.assertEqual(stats[0]["requests"], 2)
+        self.assertEqual(stats[0]["errors"], 1)
+
+
+class RemoteNodeIndexTests(TestCase):
+    def setUp(self):
+        self.team = RemoteNode.objects.create(
+            name="Team Node",
+            base_url="https://shared.example.com/team1/api",
+            username="team",
+            password="teampass",
+        )
+        self.root = RemoteNode.objects.create(
+            name="Root Node",
+            base_url="https://Shared.example.com:443/",
+            username="root",
+            password="rootpass",
+        )
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(
+            find_node("https://shared.example.com/team1/api/authors/abc/"), self.team
+        )
+        self.assertEqual(
+            find_node("https://shared.example.com/team10/api/authors/abc/"), self.root
+        )
+        self.assertEqual(find_node("https://shared.example.com"), self.root)
+
+    def test_unknown_host_and_scheme_do_not_match(self):
+        self.assertIsNone(find_node("https://other.example.com/api/authors/1/"))
+        self.assertIsNone(find_node("http://shared.example.com/api/authors/1/"))
+        self.assertIsNone(find_node("not a url"))
+
+    def test_lookup_does_not_query_once_built(self):
+        node_index.rebuild()
+        with self.assertNumQueries(0):
+            for _ in range(50):
+                find_node("https://shared.example.com/team1/api/authors/abc/inbox")
+
+    def test_signals_rebuild_index(self):
+        find_node("https://shared.example.com/")
+
+        self.team.is_active = False
+        self.team.save()
+        self.assertEqual(
+            find_node("https://shared.example.com/team1/api/authors/abc/"), self.root
+        )
+
+        self.root.delete()
+        self.assertIsNone(find_node("https://shared.example.com/team1/api/authors/abc/"))
+
+
+class FederationTelemetryTests(TestCase):
+    def setUp(self):
+        telemetry.reset()
+        self.node = RemoteNode.objects.create(
+            name="Metrics Node",
+            base_url="https://metrics.example.com/api",
+            username="metrics",
+            password="metricspass",
+        )
+        self.client = APIClient()
+
+    def tearDown(self):
+        telemetry.reset()
+
+    def test_histogram_quantiles(self):
+        histogram = telemetry.LatencyHistogram()
+        for elapsed_ms in [3] * 90 + [400] * 9 + [2000]:
+            histogram.observe(elapsed_ms)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        self.assertLessEqual(snapshot["p50_ms"], 5)
+        self.assertTrue(250 <= snapshot["p95_ms"] <= 500)
+        self.assertTrue(500 <= snapshot["p99_ms"] <= 2000)
+        self.assertEqual(snapshot["max_ms"], 2000)
+
+    @patch("requests.Session.request")
+    def test_client_requests_are_recorded_by_object_type(self, mock_request):
+        mock_request.side_effect = [MagicMock(status_code=202), requests.Timeout("slow")]
+        pool = NodeSessionPool()
+        self.addCleanup(pool.close)
+
+        pool.request(self.node, "POST", "https://metrics.example.com/api/authors/1/inbox/", object_type="like")
+        with self.assertRaises(requests.Timeout):
+            pool.request(self.node, "GET", "https://metrics.example.com/api/authors/")
+
+        snapshot = telemetry.process_snapshot()["Metrics Node"]
+        self.assertEqual(snapshot["like"]["count"], 1)
+        self.assertEqual(snapshot["like"]["statuses"], {"202": 1})
+        self.assertEqual(snapshot["get"]["errors"], {"Timeout": 1})
+
+    def _delivery(self, delivery_status, latency_ms, attempts=1):
+        delivery = enqueue_delivery(
+            self.node,
+            f"https://metrics.example.com/api/authors/{uuid.uuid4()}/inbox/",
+            "like",
+            {"type": "like", "latency": latency_ms},
+        )
+        OutboxDelivery.objects.filter(pk=delivery.pk).update(
+            status=delivery_status, latency_ms=latency_ms, attempts=attempts,
+        )
+
+    def test_stats_endpoint_reports_ratio_percentiles_and_backlog(self):
+        for latency_ms in (100, 200, 300):
+            self._delivery(OutboxStatus.DELIVERED, latency_ms)
+        self._delivery(OutboxStatus.FAILED, 5000)
+        self._delivery(OutboxStatus.PENDING, None, attempts=0)
+
+        staff = User.objects.create_user(username="staff", password="pw", is_staff=True)
+        self.client.force_authenticate(user=staff)
+        response = self.client.get("/api/federation/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        node, = response.data["nodes"]
+        self.assertEqual(node["node"], "Metrics Node")
+        self.assertEqual(node["backlog"], 1)
+        self.assertEqual(node["deliveries"]["attempted"], 4)
+        self.assertEqual(node["deliveries"]["success_ratio"], 0.75)
+        self.assertEqual(node["deliveries"]["p50_ms"], 200)
+        self.assertEqual(node["deliveries"]["p99_ms"], 5000)
+
+    def test_stats_endpoint_is_staff_only(self):
+        user = User.objects.create_user(username="regular", password="pw")
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get("/api/federation/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stats_endpoint_refuses_node_credentials(self):
+        node_credentials.invalidate()
+        self.addCleanup(node_credentials.invalidate)
+        auth = "Basic " + base64.b64encode(b"metrics:metricspass").decode()
+
+        response = self.client.get("/api/federation/stats/", HTTP_AUTHORIZATION=auth)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_federation_stats_command(self):
+        self._delivery(OutboxStatus.DELIVERED, 120)
+
+        out = StringIO()
+        call_command("federation_stats", stdout=out)
+
+        self.assertIn("Metrics Node [CLOSED] backlog=0 attempted=1 success=100.0%", out.getvalue())
+
+
 class EntryEditResendTests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -663,6 +1734,70 @@ class EntryDeleteFederationTests(TestCase):
         self.entry.refresh_from_db()
         self.assertEqual(self.entry.visibility, "DELETED")
 
+class CommentContentHashTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        self.client = APIClient()
+        self.author = User.objects.create_user(username="hash_author", password="pw")
+        self.entry = Entry.objects.create(
+            author=self.author,
+            title="Hashed",
+            description="",
+            content="body",
+            content_type="text/plain",
+            visibility=Visibility.PUBLIC,
+        )
+        RemoteNode.objects.create(
+            name="Hash Node",
+            base_url="https://hash.example.com/api",
+            username="hashuser",
+            password="hashpass",
+        )
+        token = base64.b64encode(b"hashuser:hashpass").decode()
+        self.auth = {"HTTP_AUTHORIZATION": f"Basic {token}"}
+
+    def test_hash_maintained_on_save(self):
+        comment = Comment.objects.create(entry=self.entry, author=self.author, content="hello")
+        self.assertEqual(comment.content_hash, Comment.compute_content_hash("hello", "text/plain"))
+
+        comment.content = "edited"
+        comment.save(update_fields=["content"])
+
+        comment.refresh_from_db()
+        self.assertEqual(comment.content_hash, Comment.compute_content_hash("edited", "text/plain"))
+
+    def test_inbox_ignores_duplicate_comment(self):
+        commenter = {
+            "type": "author",
+            "id": f"https://hash.example.com/api/authors/{uuid.uuid4()}/",
+            "displayName": "Repeat Commenter",
+            "host": "https://hash.example.com",
+        }
+
+        def comment_payload():
+            return {
+                "type": "comment",
+                "id": f"https://hash.example.com/api/comments/{uuid.uuid4()}/",
+                "author": commenter,
+                "comment": "same words",
+                "contentType": "text/markdown",
+                "entry": f"http://testserver/api/entries/{self.entry.id}/",
+            }
+
+        inbox_url = f"/api/authors/{self.author.id}/inbox/"
+        first = self.client.post(inbox_url, comment_payload(), format="json", **self.auth)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.post(inbox_url, comment_payload(), format="json", **self.auth)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data["detail"], "Duplicate comment ignored")
+        self.assertEqual(self.entry.comments.count(), 1)
+        dedup_sql = [q["sql"] for q in queries.captured_queries if "content_hash" in q["sql"]]
+        self.assertEqual(len(dedup_sql), 1)
+        self.assertNotIn("same words", dedup_sql[0])
+
+
 class CommentAPITests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -932,3 +2067,775 @@ class EntryLikesAPITests(TestCase):
         self.assertEqual(response.data.get("type"), "likes")
         liker_ids = {item.get("author", {}).get("id") for item in response.data.get("items", [])}
         self.assertIn(str(self.friend.id), liker_ids)
+
+
+class ObjectUrlClassificationTests(SimpleTestCase):
+    def test_recognized_shapes(self):
+        entry_id, comment_id, author_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        cases = [
+            (f"https://node.example.com/api/entries/{entry_id}/", (ENTRY, str(entry_id))),
+            (f"https://node.example.com/api/authors/{author_id}/entries/{entry_id}", (ENTRY, str(entry_id))),
+            (f"https://node.example.com/entries/{entry_id}/", (ENTRY, str(entry_id))),
+            (f"https://node.example.com/authors/{author_id}/posts/{entry_id}", (ENTRY, str(entry_id))),
+            (f"https://node.example.com/api/comments/{comment_id}/", (COMMENT, str(comment_id))),
+            (
+                f"https://node.example.com/api/entries/{entry_id}/comments/{comment_id}",
+                (COMMENT, str(comment_id)),
+            ),
+            (
+                f"https://node.example.com/api/authors/{author_id}/commented/{comment_id}/",
+                (COMMENT, str(comment_id)),
+            ),
+        ]
+        for url, expected in cases:
+            with self.subTest(url=url):
+                self.assertEqual(classify_object_url(url), expected)
+
+    def test_unknown_shapes(self):
+        for url in (
+            None,
+            "",
+            "not a url",
+            f"https://node.example.com/api/authors/{uuid.uuid4()}/",
+            "https://node.example.com/api/entries/not-a-uuid/",
+            f"https://node.example.com/api/entries/{uuid.uuid4()}/likes/",
+        ):
+            with self.subTest(url=url):
+                self.assertIsNone(classify_object_url(url))
+
+
+class InboxLikeRoutingTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(username="routing_recipient", password="pw")
+        self.entry = Entry.objects.create(
+            author=self.recipient,
+            title="Routing Target",
+            description="",
+            content="target",
+            content_type="text/plain",
+            visibility=Visibility.PUBLIC,
+        )
+        self.comment = Comment.objects.create(
+            entry=self.entry,
+            author=self.recipient,
+            content="nice",
+            content_type="text/plain",
+        )
+        RemoteNode.objects.create(
+            name="Routing Node",
+            base_url="https://routing.example.com/api",
+            username="routinguser",
+            password="routingpass",
+        )
+        self.inbox_url = f"/api/authors/{self.recipient.id}/inbox/"
+        self.auth = "Basic " + base64.b64encode(b"routinguser:routingpass").decode()
+        self.remote_author = {
+            "type": "author",
+            "id": f"https://routing.example.com/api/authors/{uuid.uuid4()}/",
+            "displayName": "Routing Author",
+            "host": "https://routing.example.com",
+        }
+
+    def _like(self, object_url):
+        payload = {"type": "like", "author": self.remote_author, "object": object_url}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.inbox_url, payload, format="json", HTTP_AUTHORIZATION=self.auth
+            )
+        return response, [query["sql"] for query in queries.captured_queries]
+
+    def test_comment_like_skips_entry_lookup(self):
+        response, queries = self._like(
+            f"http://testserver/api/entries/{self.entry.id}/comments/{self.comment.id}"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.comment.liked_by.count(), 1)
+        entry_table = Entry._meta.db_table
+        self.assertFalse(
+            [sql for sql in queries if f'FROM "{entry_table}"' in sql],
+            "a comment like should not look the URL up as an entry",
+        )
+
+    def test_entry_like_routes_to_entry(self):
+        response, _ = self._like(f"http://testserver/api/authors/{self.recipient.id}/entries/{self.entry.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.entry.liked_by.count(), 1)
+        self.assertEqual(self.comment.liked_by.count(), 0)
+
+    def test_unknown_shape_is_rejected_without_lookup(self):
+        response, queries = self._like(f"http://testserver/api/authors/{self.recipient.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for table in (Entry._meta.db_table, Comment._meta.db_table):
+            self.assertFalse([sql for sql in queries if f'FROM "{table}"' in sql])
+
+
+@override_settings(NODE_THROTTLE_DEFAULTS={"inbox": {"rate": 60, "burst": 2}, "read": {"rate": 60, "burst": 3}})
+class NodeThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(username="throttle_recipient", password="pw")
+        self.node = RemoteNode.objects.create(
+            name="Throttle Node",
+            base_url="https://throttle.example.com/api",
+            username="throttleuser",
+            password="throttlepass",
+        )
+        self.auth = "Basic " + base64.b64encode(b"throttleuser:throttlepass").decode()
+        self.inbox_url = f"/api/authors/{self.recipient.id}/inbox/"
+
+    def _post_inbox(self):
+        return self.client.post(
+            self.inbox_url, {"type": "unknown"}, format="json", HTTP_AUTHORIZATION=self.auth
+        )
+
+    def test_bucket_refills_over_time(self):
+        self.assertEqual(throttling.take_token("inbox", self.node, now=1000.0), 0)
+        self.assertEqual(throttling.take_token("inbox", self.node, now=1000.0), 0)
+        self.assertAlmostEqual(throttling.take_token("inbox", self.node, now=1000.0), 1.0)
+        self.assertAlmostEqual(throttling.take_token("inbox", self.node, now=1000.5), 0.5)
+        self.assertEqual(throttling.take_token("inbox", self.node, now=1001.0), 0)
+
+    def test_inbox_overflow_gets_429_with_retry_after(self):
+        self.assertNotEqual(self._post_inbox().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertNotEqual(self._post_inbox().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self._post_inbox()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_node_overrides_and_zero_rate(self):
+        self.node.inbox_burst = 5
+        self.node.save()
+        for _ in range(5):
+            self.assertEqual(throttling.take_token("inbox", self.node), 0)
+        self.assertGreater(throttling.take_token("inbox", self.node), 0)
+
+        self.node.inbox_rate_per_minute = 0
+        self.node.save()
+        self.assertEqual(self._post_inbox().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_local_users_and_other_scopes_are_separate(self):
+        self._post_inbox()
+        self._post_inbox()
+        self.assertEqual(self._post_inbox().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        read = self.client.get(f"/api/authors/{self.recipient.id}/", HTTP_AUTHORIZATION=self.auth)
+        self.assertEqual(read.status_code, status.HTTP_200_OK)
+
+        local = APIClient()
+        local.force_authenticate(user=self.recipient)
+        for _ in range(5):
+            self.assertEqual(local.get(f"/api/authors/{self.recipient.id}/").status_code, status.HTTP_200_OK)
+
+    def test_levels_are_reported_in_federation_stats(self):
+        self._post_inbox()
+        report = {node["node"]: node for node in telemetry.federation_stats()}
+
+        levels = report["Throttle Node"]["throttle"]
+        self.assertLess(levels["inbox"]["tokens"], 2)
+        self.assertEqual(levels["inbox"]["burst"], 2)
+        self.assertEqual(levels["read"]["tokens"], 3)
+
+
+class LoggingHelperTests(SimpleTestCase):
+    def test_truncated_is_lazy_and_bounded(self):
+        payload = {"type": "entry", "content": "x" * 5000}
+        wrapped = truncated(payload, limit=100)
+
+        self.assertIs(wrapped.value, payload)
+        rendered = str(wrapped)
+        self.assertTrue(rendered.startswith('{"type": "entry"'))
+        self.assertTrue(rendered.endswith("chars)"))
+        self.assertLess(len(rendered), 150)
+        self.assertEqual(str(truncated("short", limit=100)), "short")
+
+    def test_sample_filter_keeps_warnings(self):
+        sample = SampleFilter(rate=0)
+        debug = logging.LogRecord("entries.inbox", logging.DEBUG, __file__, 1, "msg", (), None)
+        warning = logging.LogRecord("entries.inbox", logging.WARNING, __file__, 1, "msg", (), None)
+
+        self.assertFalse(sample.filter(debug))
+        self.assertTrue(sample.filter(warning))
+        self.assertTrue(SampleFilter(rate=1).filter(debug))
+
+
+class NodeAuthenticationLoggingTests(TestCase):
+    def setUp(self):
+        RemoteNode.objects.create(
+            name="Logging Node",
+            base_url="https://logging.example.com/api",
+            username="loguser",
+            password="log-secret",
+        )
+
+    def test_rejected_credentials_never_log_passwords(self):
+        token = base64.b64encode(b"loguser:wrong-secret").decode()
+        with self.assertLogs("socialdistribution.authentication", level="DEBUG") as logs:
+            response = APIClient().get("/api/authors/", HTTP_AUTHORIZATION=f"Basic {token}")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        output = "\n".join(logs.output)
+        self.assertIn("loguser", output)
+        self.assertNotIn("wrong-secret", output)
+        self.assertNotIn("log-secret", output)
+
+
+@override_settings(INBOX_STREAM_THRESHOLD=1024, INBOX_MAX_BODY_SIZE=64 * 1024)
+class LargeInboxEntryTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(username="large_recipient", password="pw")
+        RemoteNode.objects.create(
+            name="Large Node",
+            base_url="https://large.example.com/api",
+            username="largeuser",
+            password="largepass",
+        )
+        self.auth = "Basic " + base64.b64encode(b"largeuser:largepass").decode()
+        self.inbox_url = f"/api/authors/{self.recipient.id}/inbox/"
+        self.entry_id = uuid.uuid4()
+        self.image = bytes(range(256)) * 40
+
+    def _entry(self, content, content_type="image/png;base64", **extra):
+        return {
+            "type": "entry",
+            "id": f"https://large.example.com/api/authors/x/entries/{self.entry_id}/",
+            "title": "Big picture",
+            "visibility": "PUBLIC",
+            "author": {
+                "type": "author",
+                "id": f"https://large.example.com/api/authors/{uuid.uuid4()}/",
+                "displayName": "Large Author",
+                "host": "https://large.example.com",
+            },
+            "content": content,
+            "contentType": content_type,
+            **extra,
+        }
+
+    def _post(self, body: bytes):
+        return self.client.generic(
+            "POST", self.inbox_url, body, content_type="application/json", HTTP_AUTHORIZATION=self.auth
+        )
+
+    def test_image_content_is_stored_as_a_file(self):
+        encoded = base64.b64encode(self.image).decode()
+        # Escaped slashes, as some JSON encoders write them
+        body = json.dumps(self._entry(f"data:image/png;base64,{encoded}")).replace("/", "\\/")
+
+        response = self._post(body.encode())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entry = Entry.objects.get(id=self.entry_id)
+        self.assertEqual(entry.content, "")
+        self.assertTrue(entry.content_file.name.startswith("entry_content/"))
+        self.assertEqual(entry.image_bytes(), self.image)
+
+        image = self.client.get(f"/api/authors/{entry.author_id}/entries/{entry.id}/image")
+        self.assertEqual(b"".join(image.streaming_content), self.image)
+
+        request = APIClient().get("/").wsgi_request
+        serialized = EntrySerializer(entry, context={"request": Request(request)}).data
+        self.assertEqual(
+            serialized["content"],
+            request.build_absolute_uri(reverse("entries:entry_image", args=[entry.author_id, entry.id])),
+        )
+
+    def test_missing_image_file_does_not_break_the_entry_list(self):
+        encoded = base64.b64encode(self.image).decode()
+        self._post(json.dumps(self._entry(f"data:image/png;base64,{encoded}")).encode())
+        entry = Entry.objects.get(id=self.entry_id)
+        entry.content_file.storage.delete(entry.content_file.name)
+
+        listed = self.client.get(reverse("api:entries-list"))
+
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertIn(str(entry.id), listed.content.decode())
+        image = self.client.get(f"/api/authors/{entry.author_id}/entries/{entry.id}/image")
+        self.assertEqual(image.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_large_text_content_is_kept_inline(self):
+        text = "caf\u00e9 \"quoted\"\n" * 200
+        response = self._post(json.dumps(self._entry(text, content_type="text/plain")).encode())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entry = Entry.objects.get(id=self.entry_id)
+        self.assertEqual(entry.content, text)
+        self.assertFalse(entry.content_file)
+
+    def test_oversized_body_is_refused(self):
+        encoded = base64.b64encode(bytes(64 * 1024)).decode()
+
+        response = self._post(json.dumps(self._entry(encoded)).encode())
+
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(Entry.objects.filter(id=self.entry_id).exists())
+
+    def test_reserved_key_is_not_accepted_from_peers(self):
+        payload = self._entry("x" * 2048, content_type="text/plain", **{SPOOLED_CONTENT_KEY: "entry_content/other.png"})
+
+        response = self._post(json.dumps(payload).encode())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Entry.objects.get(id=self.entry_id).content_file)
+
+    def test_content_is_found_across_chunks_after_escapes_and_nested_keys(self):
+        payload = self._entry("VALUE", content_type="text/plain", description='a\\"b\\' * 50)
+        payload["author"]["content"] = "nested"
+        body = json.dumps({"con\"tent": "no", **payload}).encode()
+
+        with patch("entries.inbox_parser.CHUNK_SIZE", 7):
+            offset = inbox_parser._find_content_value(BytesIO(body))
+
+        self.assertEqual(body[offset:offset + 5], b"VALUE")
+
+    def test_spooled_image_is_linked_through_the_image_view(self):
+        encoded = base64.b64encode(self.image).decode()
+        self._post(json.dumps(self._entry(f"data:image/png;base64,{encoded}")).encode())
+        entry = Entry.objects.get(id=self.entry_id)
+        self.client.force_login(self.recipient)
+
+        response = self.client.get(reverse("entries:view_entry", args=[entry.id]))
+
+        self.assertContains(response, reverse("entries:entry_image", args=[entry.author_id, entry.id]))
+        self.assertNotContains(response, entry.content_file.url)
+
+    def test_invalid_base64_is_rejected(self):
+        response = self._post(json.dumps(self._entry("not base64!" * 200)).encode())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class InboxRecorderTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        self.addCleanup(author_cache.clear)
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir, ignore_errors=True)
+        self.recording = f"{workdir}/inbox.ndjson"
+        recording = override_settings(INBOX_RECORD_PATH=self.recording)
+        recording.enable()
+        self.addCleanup(recording.disable)
+
+        self.client = APIClient()
+        self.recipient = User.objects.create_user(username="recorded_recipient", password="pw")
+        self.entry = Entry.objects.create(
+            author=self.recipient,
+            title="Recorded",
+            description="",
+            content="target",
+            content_type="text/plain",
+            visibility=Visibility.PUBLIC,
+        )
+        RemoteNode.objects.create(
+            name="Recorded Node",
+            base_url="https://recorded.example.com/api",
+            username="recorduser",
+            password="recordpass",
+        )
+        self.auth = "Basic " + base64.b64encode(b"recorduser:recordpass").decode()
+        self.remote_author = {
+            "type": "author",
+            "id": f"https://recorded.example.com/api/authors/{uuid.uuid4()}/",
+            "displayName": "Private Name",
+            "github": "https://github.com/private",
+            "host": "https://recorded.example.com",
+        }
+
+    def _post(self, payload):
+        return self.client.post(
+            f"/api/authors/{self.recipient.id}/inbox/", payload, format="json", HTTP_AUTHORIZATION=self.auth
+        )
+
+    def _record_traffic(self):
+        self._post({
+            "type": "like",
+            "author": self.remote_author,
+            "object": f"http://testserver/api/entries/{self.entry.id}/",
+        })
+        self._post({
+            "type": "comment",
+            "id": f"https://recorded.example.com/api/comments/{uuid.uuid4()}",
+            "author": self.remote_author,
+            "comment": "a private remark",
+            "contentType": "text/plain",
+            "entry": f"http://testserver/api/entries/{self.entry.id}/",
+        })
+
+    def test_requests_are_recorded_sanitized(self):
+        self._record_traffic()
+
+        records = load_recording(self.recording)
+        self.assertEqual([record["items"][0]["type"] for record in records], ["like", "comment"])
+        self.assertEqual(records[0]["node"], "Recorded Node")
+        self.assertEqual(records[0]["items"][0]["author"], self.remote_author["id"])
+        self.assertEqual(records[1]["body"]["comment"], {"$redacted": len("a private remark")})
+
+        raw = open(self.recording).read()
+        for secret in ("Private Name", "github.com/private", "a private remark", "recordpass"):
+            self.assertNotIn(secret, raw)
+
+    def test_sanitize_round_trips_lengths(self):
+        payload = {"type": "entry", "content": "x" * 12, "author": self.remote_author}
+
+        restored = restore(sanitize(payload))
+
+        self.assertEqual(restored["content"], "A" * 12)
+        self.assertNotIn("displayName", restored["author"])
+
+    def test_replay_reports_per_type(self):
+        self._record_traffic()
+        records = load_recording(self.recording)
+
+        report = replay(records, ClientSender("recorduser", "recordpass"))
+
+        self.assertEqual(report["requests"], 2)
+        self.assertEqual(set(report["types"]), {"like", "comment"})
+        like = report["types"]["like"]
+        self.assertEqual(like["count"], 1)
+        self.assertIsNotNone(like["p50_ms"])
+        self.assertGreater(like["mean_queries"], 0)
+
+    def test_replay_of_applied_traffic_reaches_handlers_only_when_fresh(self):
+        self._record_traffic()
+        records = load_recording(self.recording)
+        original = InboxView._handle_like
+
+        with patch.object(InboxView, "_handle_like", autospec=True, side_effect=original) as handle_like:
+            replay(records, ClientSender("recorduser", "recordpass"))
+            # The ledger already holds the recorded like
+            self.assertEqual(handle_like.call_count, 0)
+
+            with bypass_guards():
+                report = replay(records, ClientSender("recorduser", "recordpass"))
+
+        self.assertEqual(handle_like.call_count, 1)
+        self.assertEqual(report["types"]["like"]["statuses"], {"200": 1})
+
+    def test_replay_command(self):
+        self._record_traffic()
+        out = StringIO()
+
+        call_command(
+            "replay_inbox", self.recording,
+            node="Recorded Node", recipient=str(self.recipient.id), stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("requests=2", output)
+        self.assertIn("like: count=1", output)
+
+    def test_fresh_replay_is_not_throttled(self):
+        self._record_traffic()
+        out = StringIO()
+
+        with override_settings(NODE_THROTTLE_DEFAULTS={"inbox": {"rate": 0.001, "burst": 1}}):
+            throttling.reset(RemoteNode.objects.get(name="Recorded Node"))
+            call_command(
+                "replay_inbox", self.recording,
+                node="Recorded Node", fresh=True, host="testserver", stdout=out,
+            )
+
+        self.assertNotIn("429", out.getvalue())
+
+
+class NodeCredentialCacheTests(TestCase):
+    def setUp(self):
+        node_credentials.invalidate()
+        self.addCleanup(node_credentials.invalidate)
+        self.node = RemoteNode.objects.create(
+            name="Hashed Node",
+            base_url="https://hashed.example.com/api",
+            username="hasheduser",
+            password="hashedpass",
+        )
+        self.auth = RemoteNodeBasicAuthentication()
+
+    def test_password_is_stored_hashed(self):
+        self.node.refresh_from_db()
+        self.assertEqual(self.node.password_hash, RemoteNode.hash_secret("hashedpass"))
+        self.assertNotIn("hashedpass", self.node.password_hash)
+
+    def test_warm_authentication_runs_no_queries(self):
+        user, _ = self.auth.authenticate_credentials("hasheduser", "hashedpass")
+        self.assertEqual(user.node.pk, self.node.pk)
+
+        with self.assertNumQueries(0):
+            user, _ = self.auth.authenticate_credentials("hasheduser", "hashedpass")
+        self.assertEqual(user.node.pk, self.node.pk)
+
+        with self.assertNumQueries(0), self.assertRaises(drf_exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials("hasheduser", "wrongpass")
+
+    def test_saving_a_node_invalidates_the_cache(self):
+        self.auth.authenticate_credentials("hasheduser", "hashedpass")
+
+        self.node.password = "rotated"
+        self.node.save()
+
+        with self.assertRaises(drf_exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials("hasheduser", "hashedpass")
+        user, _ = self.auth.authenticate_credentials("hasheduser", "rotated")
+        self.assertEqual(user.node.pk, self.node.pk)
+
+        self.node.is_active = False
+        self.node.save(update_fields=["is_active"])
+        with self.assertRaises(drf_exceptions.AuthenticationFailed):
+            self.auth.authenticate_credentials("hasheduser", "rotated")
+
+    def test_unknown_usernames_are_not_cached(self):
+        for index in range(3):
+            with self.assertRaises(drf_exceptions.AuthenticationFailed):
+                self.auth.authenticate_credentials(f"stranger{index}", "pw")
+
+        self.assertEqual(node_credentials._entries, {})
+
+    def test_hash_from_an_old_secret_key_is_rederived(self):
+        with self.settings(SECRET_KEY="previous-secret-key-" + "x" * 40):
+            stale = RemoteNode.hash_secret("hashedpass")
+        RemoteNode.objects.filter(pk=self.node.pk).update(password_hash=stale)
+
+        user, _ = self.auth.authenticate_credentials("hasheduser", "hashedpass")
+
+        self.assertEqual(user.node.pk, self.node.pk)
+        self.node.refresh_from_db()
+        self.assertEqual(self.node.password_hash, RemoteNode.hash_secret("hashedpass"))
+
+    def test_shared_username_matches_the_right_node(self):
+        other = RemoteNode.objects.create(
+            name="Hashed Twin",
+            base_url="https://twin.example.com/api",
+            username="hasheduser",
+            password="twinpass",
+        )
+
+        user, _ = self.auth.authenticate_credentials("hasheduser", "twinpass")
+
+        self.assertEqual(user.node.pk, other.pk)
+
+
+class SignedNodeRequestTests(TestCase):
+    def setUp(self):
+        author_cache.clear()
+        signing_keys.invalidate()
+        cache.clear()
+        self.addCleanup(author_cache.clear)
+        self.addCleanup(signing_keys.invalidate)
+        self.addCleanup(cache.clear)
+
+        self.client = Client()
+        self.recipient = User.objects.create_user(username="signed_recipient", password="pw")
+        self.entry = Entry.objects.create(
+            author=self.recipient,
+            title="Signed",
+            description="",
+            content="target",
+            content_type="text/plain",
+            visibility=Visibility.PUBLIC,
+        )
+        self.node = RemoteNode.objects.create(
+            name="Signing Node",
+            base_url="https://signing.example.com/api",
+            username="signinguser",
+            password="signingpass",
+            signing_key_id="signing-node",
+            signing_secret="shared-secret",
+        )
+        self.path = f"/api/authors/{self.recipient.id}/inbox/"
+        self.body = json.dumps({
+            "type": "like",
+            "author": {
+                "type": "author",
+                "id": f"https://signing.example.com/api/authors/{uuid.uuid4()}/",
+                "displayName": "Signer",
+                "host": "https://signing.example.com",
+            },
+            "object": f"http://testserver/api/entries/{self.entry.id}/",
+        }).encode()
+
+    def _post(self, headers, body=None):
+        return self.client.post(
+            self.path,
+            self.body if body is None else body,
+            content_type="application/json",
+            HTTP_DATE=headers["Date"],
+            HTTP_DIGEST=headers["Digest"],
+            HTTP_AUTHORIZATION=headers["Authorization"],
+        )
+
+    def _sign(self, secret="shared-secret", **kwargs):
+        return sign_headers("signing-node", secret, "POST", self.path, self.body, **kwargs)
+
+    def test_signed_inbox_request_is_accepted(self):
+        response = self._post(self._sign())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.entry.likes_count, 1)
+
+    def test_signed_body_is_spooled_once(self):
+        original = inbox_parser._spool
+
+        with patch("entries.inbox_parser._spool", side_effect=original) as spool:
+            response = self._post(self._sign())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(spool.call_count, 1)
+
+    def test_wrong_secret_is_rejected(self):
+        response = self._post(self._sign(secret="not-the-secret"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Basic", response["WWW-Authenticate"])
+
+    def test_tampered_body_is_rejected(self):
+        tampered = self.body.replace(b"Signer", b"Forger")
+
+        response = self._post(self._sign(), body=tampered)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stale_date_is_rejected(self):
+        response = self._post(self._sign(date=formatdate(time.time() - 3600, usegmt=True)))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_replayed_signature_is_rejected(self):
+        headers = self._sign()
+
+        self.assertEqual(self._post(headers).status_code, status.HTTP_200_OK)
+        self.assertEqual(self._post(headers).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_removing_the_key_revokes_it(self):
+        self._post(self._sign())
+
+        self.node.signing_key_id = ""
+        self.node.save()
+
+        self.assertEqual(self._post(self._sign()).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_outbound_session_signs_requests(self):
+        session = NodeSessionPool().session_for(self.node)
+        prepared = session.prepare_request(requests.Request("POST", f"https://signing.example.com{self.path}", data=self.body))
+
+        params = parse_authorization(prepared.headers["Authorization"])
+        self.assertEqual(params["keyId"], "signing-node")
+        self.assertEqual(prepared.headers["Digest"], body_digest(self.body))
+        self.assertEqual(
+            params["signature"],
+            compute_signature("shared-secret", "POST", self.path, prepared.headers["Date"], prepared.headers["Digest"]),
+        )
+
+
+class VisibleToQuerySetTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="vis_author", password="pw")
+        self.friend = User.objects.create_user(username="vis_friend", password="pw")
+        self.follower = User.objects.create_user(username="vis_follower", password="pw")
+        self.stranger = User.objects.create_user(username="vis_stranger", password="pw")
+        for follower, followee in [
+            (self.friend, self.author),
+            (self.author, self.friend),
+            (self.follower, self.author),
+        ]:
+            FollowRequest.objects.create(follower=follower, followee=followee, status=FollowRequestStatus.APPROVED)
+
+        self.entries = {
+            visibility: Entry.objects.create(
+                author=self.author,
+                title=visibility,
+                content="body",
+                visibility=visibility,
+            )
+            for visibility in (Visibility.PUBLIC, Visibility.UNLISTED, Visibility.FRIENDS, Visibility.DELETED)
+        }
+        node = RemoteNode.objects.create(name="Visibility Node", base_url="https://vis.example.com/api")
+        self.viewers = {
+            "anonymous": AnonymousUser(),
+            "node": NodeUser(node),
+            "author": self.author,
+            "friend": self.friend,
+            "follower": self.follower,
+            "stranger": self.stranger,
+        }
+
+    def _titles(self, queryset):
+        return {entry.title for entry in queryset}
+
+    def test_matches_can_view_for_every_viewer(self):
+        for name, viewer in self.viewers.items():
+            with self.subTest(viewer=name):
+                expected = {title for title, entry in self.entries.items() if entry.can_view(viewer)}
+                self.assertEqual(self._titles(Entry.objects.visible_to(viewer)), expected)
+
+    def test_listed_shows_unlisted_only_to_author_and_followers(self):
+        listed = {
+            name: self._titles(Entry.objects.visible_to(viewer, listed=True))
+            for name, viewer in self.viewers.items()
+        }
+
+        self.assertEqual(listed["anonymous"], {Visibility.PUBLIC})
+        self.assertEqual(listed["node"], {Visibility.PUBLIC})
+        self.assertEqual(listed["stranger"], {Visibility.PUBLIC})
+        self.assertEqual(listed["follower"], {Visibility.PUBLIC, Visibility.UNLISTED})
+        self.assertEqual(listed["friend"], {Visibility.PUBLIC, Visibility.UNLISTED, Visibility.FRIENDS})
+        self.assertEqual(listed["author"], {Visibility.PUBLIC, Visibility.UNLISTED, Visibility.FRIENDS})
+
+    def test_filter_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(Entry.objects.visible_to(self.friend, listed=True))
+
+    def test_public_entries_api_lists_only_public_entries_for_friends(self):
+        self.client.force_login(self.friend)
+
+        response = self.client.get(reverse("api:entries-list"))
+
+        self.assertEqual([entry["title"] for entry in response.json()["src"]], [Visibility.PUBLIC])
+
+
+class ExplainHotQueriesCommandTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        author = User.objects.create_user(username="explained", password="pw")
+        Entry.objects.create(author=author, title="t", content="c", visibility=Visibility.PUBLIC)
+        out = StringIO()
+
+        call_command("explain_hot_queries", "--author", "explained", "--strict", stdout=out)
+
+        output = out.getvalue()
+        for name in ("stream: public", "stream: own", "stream: following", "stream: friends",
+                     "public list", "followers", "following", "comments"):
+            self.assertIn(f"== {name} ==", output)
+        self.assertIn("No full table scans", output)
+
+    @skipUnless(connection.vendor == "sqlite", "INDEXED BY is SQLite syntax")
+    def test_live_indexes_skip_both_deleted_spellings(self):
+        author = User.objects.create_user(username="live_index", password="pw")
+        for visibility in (Visibility.PUBLIC, Visibility.DELETED, "DELETED"):
+            Entry.objects.create(author=author, title=visibility, content="c", visibility=visibility)
+
+        with connection.cursor() as cursor:
+            # SQLite refuses INDEXED BY when the WHERE clause does not imply the index condition
+            cursor.execute(
+                f"SELECT title FROM {Entry._meta.db_table} INDEXED BY entry_author_live_pub_idx"
+                " WHERE author_id = %s AND NOT (visibility IN ('DELTED', 'DELETED'))",
+                [author.pk.hex],
+            )
+            titles = [row[0] for row in cursor.fetchall()]
+
+        self.assertEqual(titles, [Visibility.PUBLIC])
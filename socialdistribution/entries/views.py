@@ -5,7 +5,7 @@ from django.views.decorators.http import require_POST
 from django.contrib import messages
 from django.views.generic import ListView, DetailView
 from django.core.exceptions import PermissionDenied
-from django.http import Http404, JsonResponse, HttpResponse
+from django.http import FileResponse, Http404, JsonResponse, HttpResponse
 from django.core.files.storage import default_storage
 from .models import Entry, Visibility, Comment
 from .forms import EntryForm, CommentForm
@@ -226,9 +226,18 @@ def entry_image(request, author_id, entry_id):
     if not entry.content_type.startswith("image/"):
         raise Http404("This entry is not an image.")
 
+    mime_type = entry.content_type.split(";")[0]  # e.g. "image/png"
+
+    # Large remote images are kept as a file rather than base64
+    if entry.content_file:
+        try:
+            return FileResponse(entry.content_file.open("rb"), content_type=mime_type)
+        except FileNotFoundError:
+            # Local media does not survive a redeploy on ephemeral hosts
+            raise Http404("Image file is missing.")
+
     # Decode the stored base64 image data
     image_data = base64.b64decode(entry.content)
-    mime_type = entry.content_type.split(";")[0]  # e.g. "image/png"
 
     return HttpResponse(image_data, content_type=mime_type)
 
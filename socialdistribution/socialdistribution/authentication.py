@@ -1,14 +1,20 @@
+import hmac
+import logging
+
 from rest_framework import authentication
 from rest_framework import exceptions
-from entries.models import RemoteNode
+from entries.node_credentials import node_credentials
+from entries.request_signing import SignatureError, parse_authorization, verify_request
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 class RemoteNodeBasicAuthentication(authentication.BasicAuthentication):
     """
     Custom HTTP Basic Authentication for remote nodes.
     Validates credentials against:
-    1. Per-node credentials in RemoteNode database
+    1. Per-node credentials in RemoteNode database (hashed; see entries/node_credentials.py)
     2. Universal node credentials from settings (fallback)
     """
 
@@ -17,45 +23,52 @@ class RemoteNodeBasicAuthentication(authentication.BasicAuthentication):
         Authenticate the userid and password against RemoteNode entries
         OR universal credentials.
         """
-        print(f"[AUTH] Incoming auth attempt:")
-        print(f"[AUTH] Received userid: {userid}")
-        print(f"[AUTH] Received password: {password}")
-
-        # First, try to match against per-node credentials in database
-        try:
-            node = RemoteNode.objects.get(
-                username=userid,
-                password=password,
-                is_active=True
-            )
-            print(f"[AUTH] Match found in RemoteNode DB: {node.base_url}")
+        # First, try per-node credentials (hashed, cached per username)
+        node = node_credentials.verify(userid, password)
+        if node is not None:
+            logger.debug("Authenticated remote node %s", node.base_url)
             return (NodeUser(node), None)
-        except RemoteNode.DoesNotExist:
-            print(f"[AUTH] No match in RemoteNode DB, trying universal credentials...")
 
         # Second, try universal credentials from settings
         universal_user = getattr(settings, 'OUR_NODE_USERNAME', None)
         universal_pass = getattr(settings, 'OUR_NODE_PASSWORD', None)
-        
-        if universal_user and universal_pass:
-            print(f"[AUTH] Universal credentials: {universal_user}:{universal_pass}")
-            if userid == universal_user and password == universal_pass:
-                print(f"[AUTH] Match found using universal credentials!")
-                return (NodeUser(None), None)
-            else:
-                print(f"[AUTH] Universal credentials did not match")
-        else:
-            print(f"[AUTH] No universal credentials configured in settings")
-
-        # Neither matched - log all options for debugging
-        print(f"[AUTH] Authentication FAILED")
-        print(f"[AUTH] Active RemoteNodes in database:")
-        for n in RemoteNode.objects.filter(is_active=True):
-            print(f"[AUTH]   - {n.base_url}: {n.username}:{n.password}")
-        
+
+        if (
+            universal_user and universal_pass
+            and hmac.compare_digest(userid.encode(), universal_user.encode())
+            and hmac.compare_digest(password.encode(), universal_pass.encode())
+        ):
+            logger.debug("Authenticated remote node with universal credentials")
+            return (NodeUser(None), None)
+
+        # Never log the password, only who tried
+        logger.warning("Rejected node credentials for username %r", userid)
         raise exceptions.AuthenticationFailed('Invalid node credentials')
 
 
+class RemoteNodeSignatureAuthentication(authentication.BaseAuthentication):
+    """
+    HMAC-signed requests from nodes that share a signing key with us
+    (see entries/request_signing.py). Requests without a `Signature`
+    Authorization header are left to the other authenticators.
+    """
+
+    def authenticate(self, request):
+        params = parse_authorization(request.META.get('HTTP_AUTHORIZATION', ''))
+        if params is None:
+            return None
+        try:
+            node = verify_request(request._request, params)
+        except SignatureError as exc:
+            logger.warning("Rejected signed request with keyId %r: %s", params.get('keyId'), exc)
+            raise exceptions.AuthenticationFailed(str(exc))
+        logger.debug("Authenticated signed request from remote node %s", node.base_url)
+        return (NodeUser(node), None)
+
+    def authenticate_header(self, request):
+        return 'Signature realm="api"'
+
+
 class NodeUser:
     """
     A simple user-like object to represent an authenticated remote node.
@@ -0,0 +1,56 @@
+"""
+Logging helpers shared by the API modules.
+
+Loggers are named after their module (`logging.getLogger(__name__)`) and
+configured in settings.LOGGING, so production can run at WARNING and pay
+nothing for the debug lines on the request path: pass arguments to the
+logger instead of pre-formatting with f-strings, and wrap payloads in
+`truncated()` so they are only serialized, and then cut short, when a
+record is actually emitted.
+"""
+import json
+import logging
+import random
+
+from django.conf import settings
+
+
+class truncated:
+    """
+    Lazy, length-limited rendering of a payload for log messages.
+    Nothing is serialized unless the record is formatted.
+    """
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit=None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        limit = self.limit or getattr(settings, "LOG_PAYLOAD_MAX_CHARS", 500)
+        if isinstance(self.value, (dict, list)):
+            try:
+                text = json.dumps(self.value, default=str)
+            except (TypeError, ValueError):
+                text = repr(self.value)
+        else:
+            text = str(self.value)
+        if len(text) <= limit:
+            return text
+        return f"{text[:limit]}... ({len(text)} chars)"
+
+
+class SampleFilter(logging.Filter):
+    """
+    Let through a `rate` fraction of records below WARNING; warnings and
+    errors always pass. Used for high-volume loggers such as the inbox.
+    """
+
+    def __init__(self, rate=1.0, name=""):
+        super().__init__(name)
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        return random.random() < self.rate
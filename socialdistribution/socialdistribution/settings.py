@@ -53,6 +53,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # No-op unless INBOX_RECORD_PATH is set
+    'entries.inbox_recorder.InboxRecorderMiddleware',
 ]
 
 ROOT_URLCONF = 'socialdistribution.urls'
@@ -92,6 +94,22 @@ else:
         }
     }
 
+# Shared cache: throttle buckets must be visible to every worker, so use Redis
+# when REDIS_URL is set. The local-memory fallback is per process.
+if os.environ.get("REDIS_URL") is not None:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -131,6 +149,7 @@ LOGIN_URL = 'authors:login'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'socialdistribution.authentication.RemoteNodeBasicAuthentication', # Checks for the remote nodes first
+        'socialdistribution.authentication.RemoteNodeSignatureAuthentication', # Nodes with a shared signing key
         'rest_framework.authentication.SessionAuthentication',         # Then checks for local user sessions
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -139,6 +158,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'socialdistribution.pagination.CustomPageNumberPagination',
     'PAGE_SIZE': 10,
 
+    # Per-RemoteNode token buckets; local users are not throttled
+    'DEFAULT_THROTTLE_CLASSES': [
+        'socialdistribution.throttling.RemoteNodeRateThrottle',
+    ],
+
     # OpenAPI generator
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
@@ -170,8 +194,112 @@ SPECTACULAR_SETTINGS = {
 # Cron
 CRONJOBS = [
     ('*/60 * * * *', 'django.core.management.call_command', ['sync_github']),
+    ('30 3 * * *', 'django.core.management.call_command', ['compact_inbox_ledger']),
 ]
 
+# Federation outbox, drained by `python manage.py deliver_outbox`
+OUTBOX_MAX_ATTEMPTS = 5              # give up (FAILED) after this many tries
+OUTBOX_RETRY_BASE_SECONDS = 30       # first retry delay, doubled per attempt (with jitter)
+OUTBOX_RETRY_MAX_SECONDS = 3600      # upper bound on the retry delay
+OUTBOX_LEASE_SECONDS = 120           # a SENDING row older than this is re-claimed
+OUTBOX_REQUEST_TIMEOUT = 10          # seconds per remote inbox POST
+OUTBOX_COALESCE_WINDOW_SECONDS = 15  # entry edits within this window go out once
+OUTBOX_RETENTION_SECONDS = 7 * 24 * 3600  # delivered/superseded rows and their payloads are purged after this
+OUTBOX_PURGE_INTERVAL_SECONDS = 3600  # how often an idle worker runs the purge
+
+# Asynchronous inbox: InboxView stores items and answers 202, `process_inbox` applies them
+INBOX_ASYNC = os.getenv("INBOX_ASYNC", "0") == "1"
+INBOX_MAX_ATTEMPTS = 5               # retries for items whose handler errored
+INBOX_RETRY_DELAY_SECONDS = 30       # multiplied by the attempt number
+INBOX_LEASE_SECONDS = 120            # a PROCESSING item older than this is re-claimed
+INBOX_BATCH_MAX_ITEMS = 100          # largest JSON array accepted by the inbox in one request
+INBOX_LEDGER_RETENTION_SECONDS = 7 * 24 * 3600  # replays older than this are processed again
+INBOX_LEDGER_ENABLED = True          # `replay_inbox --fresh` turns it off in its own process only
+INBOX_MAX_BODY_SIZE = 20 * 1024 * 1024  # larger inbox bodies are refused with 413
+INBOX_STREAM_THRESHOLD = 256 * 1024  # bodies this size or larger are spooled; image content goes to storage
+INBOX_RECORD_PATH = os.getenv("INBOX_RECORD_PATH", "")  # NDJSON recording of inbox traffic for `replay_inbox`
+
+# Remote author resolution cache for the inbox (entries/author_cache.py)
+REMOTE_AUTHOR_CACHE_SIZE = 1024      # authors kept per process (LRU)
+REMOTE_AUTHOR_CACHE_TTL = 300        # seconds before a cached author is looked up again
+
+# Keep-alive connections kept open per remote node (entries/federation_client.py)
+FEDERATION_POOL_MAXSIZE = 10
+
+# Concurrent delivery fan-out (entries/fanout.py); keep FANOUT_PER_HOST <= FEDERATION_POOL_MAXSIZE
+FANOUT_MAX_WORKERS = 16              # requests in flight across all nodes
+FANOUT_PER_HOST = 4                  # requests in flight to any single host
+
+# Window used by /api/federation/stats/ and the federation_stats command
+FEDERATION_STATS_WINDOW_SECONDS = 3600
+
+# Token buckets per RemoteNode (socialdistribution/throttling.py), overridable per node
+# in the admin. rate = tokens refilled per minute, burst = bucket size.
+NODE_THROTTLE_DEFAULTS = {
+    "inbox": {"rate": 120, "burst": 60},
+    "read": {"rate": 300, "burst": 100},
+}
+NODE_THROTTLE_ENABLED = True  # `replay_inbox --fresh` turns it off in its own process only
+
+# Logging. Production can set LOG_LEVEL=WARNING; debug lines are formatted lazily
+# and cost nothing when filtered out. Inbox request lines are sampled.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "WARNING")
+LOG_INBOX_SAMPLE_RATE = float(os.getenv("LOG_INBOX_SAMPLE_RATE", "1.0"))
+LOG_PAYLOAD_MAX_CHARS = 500          # longer payloads are cut in log lines
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "verbose": {
+            "format": "%(asctime)s %(levelname)s %(name)s: %(message)s",
+        },
+    },
+    "filters": {
+        "inbox_sample": {
+            "()": "socialdistribution.log.SampleFilter",
+            "rate": LOG_INBOX_SAMPLE_RATE,
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "verbose",
+        },
+    },
+    "loggers": {
+        "socialdistribution": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "authors": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "entries": {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False},
+        "entries.inbox": {"filters": ["inbox_sample"]},
+    },
+}
+
+# Per-node circuit breaker (entries/circuit_breaker.py)
+CIRCUIT_FAILURE_THRESHOLD = 5        # consecutive failures before the circuit opens
+CIRCUIT_COOLDOWN_SECONDS = 60        # how long an open circuit blocks requests
+CIRCUIT_SLOW_CALL_SECONDS = 5        # slower responses count as failures
+
+# In-memory RemoteNode prefix index (entries/node_index.py). Signals rebuild it in
+# the process that saved the node; other processes refresh after this many seconds.
+REMOTE_NODE_INDEX_TTL = 300
+
+# Inbound node credential cache (entries/node_credentials.py); same refresh rule as above
+REMOTE_NODE_CREDENTIAL_TTL = 300
+
+# Cached follow adjacency per author (authors/follow_graph.py), used for counts
+# and display only. FollowRequest changes invalidate it in the saving process;
+# other workers only see that through a shared cache, so without REDIS_URL
+# the sets are kept for seconds rather than an hour
+FOLLOW_GRAPH_CACHE_TTL = 3600 if os.environ.get("REDIS_URL") is not None else 30
+
+# Entries per stream page (authors/feed.py)
+STREAM_PAGE_SIZE = 20
+
+# Signed node requests (entries/request_signing.py): how far the Date header may
+# drift from our clock; a signature is also refused if seen again within it
+SIGNATURE_MAX_SKEW_SECONDS = 300
+
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 # Allowed hosts and CSRF trusted origins from environment dynamically
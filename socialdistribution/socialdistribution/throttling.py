@@ -0,0 +1,121 @@
+"""
+Per-RemoteNode token-bucket throttling.
+
+Every authenticated remote node gets one bucket per scope:
+
+    inbox   views that set `node_throttle_scope = "inbox"` (InboxView)
+    read    every other API request made with node credentials
+
+A bucket holds up to `burst` tokens and refills at `rate` tokens per minute.
+Each request spends one token; an empty bucket answers 429 with Retry-After
+set to the time until the next token. Rates come from the RemoteNode row
+(editable in the admin) and fall back to NODE_THROTTLE_DEFAULTS; a rate of 0
+turns the limit off for that node.
+
+Bucket state lives in the Django cache so every worker shares it (configure
+REDIS_URL in production; the local-memory fallback is per process). Reads and
+writes are not atomic, so concurrent workers can over-admit by at most one
+request each per refill — acceptable for backpressure, not for billing.
+
+Local users and anonymous requests are never throttled here.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+SCOPES = ("inbox", "read")
+
+_DEFAULTS = {
+    "inbox": {"rate": 120, "burst": 60},
+    "read": {"rate": 300, "burst": 100},
+}
+
+
+def _cache_key(scope: str, node) -> str:
+    return f"node-throttle:{scope}:{node.pk if node is not None else 'universal'}"
+
+
+def bucket_config(scope: str, node) -> tuple[int, int]:
+    """(rate per minute, burst) for `node` in `scope`, node overrides first."""
+    defaults = {**_DEFAULTS[scope], **getattr(settings, "NODE_THROTTLE_DEFAULTS", {}).get(scope, {})}
+    rate = getattr(node, f"{scope}_rate_per_minute", None)
+    burst = getattr(node, f"{scope}_burst", None)
+    rate = defaults["rate"] if rate is None else rate
+    burst = defaults["burst"] if burst is None else burst
+    return rate, max(burst, 1)
+
+
+def _refilled(scope: str, node, now: float) -> tuple[float, int, int]:
+    """Current token count with refill applied, plus the bucket config."""
+    rate, burst = bucket_config(scope, node)
+    state = cache.get(_cache_key(scope, node))
+    if state is None:
+        return float(burst), rate, burst
+    tokens, stamp = state
+    tokens = min(float(burst), tokens + max(0.0, now - stamp) * rate / 60.0)
+    return tokens, rate, burst
+
+
+def take_token(scope: str, node, now: float | None = None) -> float:
+    """
+    Spend one token from the node's bucket. Returns 0 when the request may
+    proceed, otherwise the seconds until a token will be available.
+    """
+    now = time.time() if now is None else now
+    tokens, rate, burst = _refilled(scope, node, now)
+    if rate <= 0:
+        return 0.0
+
+    if tokens < 1:
+        return (1 - tokens) * 60.0 / rate
+
+    tokens -= 1
+    # After a full refill the bucket is indistinguishable from a fresh one
+    timeout = math.ceil((burst - tokens) * 60.0 / rate) + 1
+    cache.set(_cache_key(scope, node), (tokens, now), timeout=timeout)
+    return 0.0
+
+
+def bucket_levels(node, now: float | None = None) -> dict:
+    """{scope: {tokens, burst, rate_per_minute}} without spending anything."""
+    now = time.time() if now is None else now
+    levels = {}
+    for scope in SCOPES:
+        tokens, rate, burst = _refilled(scope, node, now)
+        levels[scope] = {
+            "tokens": round(tokens, 2),
+            "burst": burst,
+            "rate_per_minute": rate,
+        }
+    return levels
+
+
+def reset(node):
+    cache.delete_many([_cache_key(scope, node) for scope in SCOPES])
+
+
+class RemoteNodeRateThrottle(BaseThrottle):
+    """DRF throttle applying the node's token bucket for the view's scope."""
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        if not getattr(settings, "NODE_THROTTLE_ENABLED", True):
+            return True
+        user = getattr(request, "user", None)
+        if user is None or not hasattr(user, "node"):
+            return True
+
+        scope = getattr(view, "node_throttle_scope", "read")
+        retry_after = take_token(scope, user.node)
+        if retry_after <= 0:
+            return True
+
+        self.retry_after = retry_after
+        return False
+
+    def wait(self):
+        # DRF formats Retry-After with %d; round up so clients never retry early
+        return math.ceil(self.retry_after) if self.retry_after else None